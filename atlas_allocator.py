@@ -0,0 +1,83 @@
+import math
+from core.uv_utils import grid_rect
+
+
+"""
+Sizes a module's square atlas tile from its footprint at a target texel density.
+:param envelope: {"width", "depth"} of the module in meters.
+:param texels_per_meter: Target lightmap texels per meter of footprint edge.
+:param granularity: (Optional) Tile sizes are rounded up to a multiple of this many pixels (default: 32).
+:param max_size: (Optional) Largest allowed tile size, usually the atlas size.
+:return: Tile width/height in pixels.
+"""
+def tile_size_for_envelope(envelope, texels_per_meter, granularity=32, max_size=None):
+    edge = math.sqrt(envelope["width"] * envelope["depth"]) * texels_per_meter
+    size = max(granularity, math.ceil(edge / granularity) * granularity)
+    return min(size, max_size) if max_size else size
+
+
+"""
+Packs square tiles into as few atlases as possible with a shelf allocator:
+tiles are placed tallest first, left to right along shelves that stack from the bottom of the atlas.
+:param sizes: {module: tile size in pixels}.
+:param atlas_size: Atlas width/height in pixels.
+:param padding: (Optional) Empty pixels kept between tiles (default: 0).
+:return: {module: {"atlas", "x", "y", "size"}}, in the order of the sizes dict.
+"""
+def shelf_pack(sizes, atlas_size, padding=0):
+    rects = {}
+    atlases = []  # per atlas: list of shelves [y, height, next free x]
+    for module in sorted(sizes, key=lambda module: -sizes[module]):
+        size = sizes[module]
+        if size > atlas_size:
+            raise ValueError(f"Tile of {module} ({size}px) does not fit a {atlas_size}px atlas")
+
+        placed = False
+        for atlas, shelves in enumerate(atlases):
+            for shelf in shelves:
+                if size <= shelf[1] and shelf[2] + size <= atlas_size:
+                    rects[module] = {"atlas": atlas, "x": shelf[2], "y": shelf[0], "size": size}
+                    shelf[2] += size + padding
+                    placed = True
+                    break
+            if placed:
+                break
+            top = shelves[-1][0] + shelves[-1][1] + padding
+            if top + size <= atlas_size:
+                shelves.append([top, size, size + padding])
+                rects[module] = {"atlas": atlas, "x": 0, "y": top, "size": size}
+                placed = True
+                break
+
+        if not placed:
+            atlases.append([[0, size, size + padding]])
+            rects[module] = {"atlas": len(atlases) - 1, "x": 0, "y": 0, "size": size}
+
+    return {module: rects[module] for module in sizes}
+
+
+"""
+Plans every module's atlas rect.
+:param config: The module config (sofa_modules_config.config).
+:param settings: The atlas settings (sofa_modules_config.atlas_settings):
+                 "grid" uses each module's hand-assigned index, "shelf" sizes tiles from the envelope and packs them.
+:return: {module: {"atlas", "x", "y", "size"}}
+"""
+def plan_atlas(config, settings):
+    atlas_size = settings["atlas_size"]
+    if settings["layout"] == "grid":
+        return {module: grid_rect(cfg["index"], atlas_size, settings["tile_size"]) for module, cfg in config.items()}
+
+    sizes = {
+        module: tile_size_for_envelope(cfg["envelope"], settings["texels_per_meter"], max_size=atlas_size)
+        for module, cfg in config.items()
+    }
+    return shelf_pack(sizes, atlas_size, settings["padding"])
+
+
+"""
+Returns a copy of the config where every module entry carries its planned "atlas_rect".
+"""
+def planned_config(config, settings):
+    layout = plan_atlas(config, settings)
+    return {module: dict(cfg, atlas_rect=layout[module]) for module, cfg in config.items()}
@@ -0,0 +1,74 @@
+# ✅ Standard Python Modules
+import os
+from contextlib import contextmanager
+
+# ✅ Blender Modules
+import bpy  # type: ignore
+
+# ✅ Custom Imports
+from mesh_utils import create_image_for_baking
+from mesh_utils import scale_and_translate_uv
+from mesh_utils import set_bake_result_material
+from mesh_utils import select_none
+from sofa_utils import read_image_pixels
+from sofa_utils import setup_bake
+from bake_tiles import bake_key
+from bake_tiles import save_tile_checkpoint
+from bake_tiles import tile_checkpoint_path
+from core.uv_utils import rect_transform
+
+
+@contextmanager
+def tile_local_uvs(objs, rect, atlas_size):
+    # ✅ Temporarily maps atlas-space lightmap UVs back to the 0..1 space of the module's own tile
+    uv_tile_scale, offset_u, offset_v = rect_transform(rect, atlas_size)
+    for obj in objs:
+        scale_and_translate_uv(obj, 1 / uv_tile_scale, -offset_u / uv_tile_scale, -offset_v / uv_tile_scale)
+    try:
+        yield
+    finally:
+        for obj in objs:
+            scale_and_translate_uv(obj, uv_tile_scale, offset_u, offset_v)
+
+
+def bake_tile(objs, module, bake_type, bake_cfg, tile_size, directory, key, resume=True):
+    checkpoint_path = tile_checkpoint_path(directory, module, bake_type, tile_size, key)
+    if resume and os.path.exists(checkpoint_path):
+        print(f"⏭ {module} {bake_type} tile already baked: {checkpoint_path}")
+        return checkpoint_path
+
+    image = create_image_for_baking(f"{module}_{bake_type}_tile", tile_size)
+    for obj in objs:
+        set_bake_result_material(obj, image)
+
+    select_none()
+    for obj in objs:
+        obj.select_set(True)
+    bpy.context.view_layer.objects.active = objs[0]
+    setup_bake(bake_cfg)
+
+    print(f"🔥 Baking {bake_type} tile of {module}... This may take some time.")
+    bpy.ops.object.bake(type=bake_type)
+    save_tile_checkpoint(checkpoint_path, read_image_pixels(image), tile_size)
+    bpy.data.images.remove(image)
+    print(f"💾 {bake_type} tile checkpoint saved: {checkpoint_path}")
+    return checkpoint_path
+
+
+"""
+Bakes every requested bake type of one module into its own tile-sized image and checkpoints each tile.
+Already checkpointed tiles are skipped, so a rerun resumes where a failed run stopped.
+:param objs: The module's objects, with atlas-space lightmap UVs (see pack_uv_into_tiles).
+:param module: The module name.
+:param cfg: The module's planned config entry, with its "atlas_rect" (see atlas_allocator.planned_config).
+:param bake_types: Cycles bake types to bake, e.g. ["AO", "COMBINED"].
+:param atlas_size: Atlas width/height in pixels.
+:param directory: The project directory.
+:param resume: (Optional) Skip tiles that already have a checkpoint (default: True).
+:return: The checkpoint path of every bake type.
+"""
+def bake_module_tiles(objs, module, cfg, bake_types, atlas_size, directory, resume=True):
+    key = bake_key(cfg, directory)
+    tile_size = cfg["atlas_rect"]["size"]
+    with tile_local_uvs(objs, cfg["atlas_rect"], atlas_size):
+        return [bake_tile(objs, module, bake_type, cfg["bake"], tile_size, directory, key, resume) for bake_type in bake_types]
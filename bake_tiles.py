@@ -0,0 +1,143 @@
+import json
+import os
+import numpy as np
+from build_cache import module_key
+from build_cache import value_hash
+from hdr_writer import stream_image
+
+
+BAKE_TILES_DIR = "sofa_bake_tiles"
+# ✅ Per-module tile baking; the atlas is composed from the tile checkpoints after all modules ran (see compose_atlases)
+BAKE_TILES = False
+BAKE_TYPES = ["AO", "COMBINED"]
+# ✅ Bake type → directory of its composed atlases
+ATLAS_OUTPUT_DIRS = {"AO": "sofa_ao", "COMBINED": "sofa_combined"}
+ATLAS_LAYOUT_NAME = "atlas_layout.json"
+
+
+"""
+Derives a short key from a module's input files and config, so checkpoints of older inputs are never resumed.
+:param cfg: The module's entry from sofa_modules_config.config.
+:param directory: The project directory that input paths are relative to.
+"""
+def bake_key(cfg, directory):
+    return value_hash(module_key(cfg, directory, None))[:12]
+
+
+"""
+Returns where the checkpoint of one module's baked tile is stored.
+:param directory: The project directory.
+:param module: The module name.
+:param bake_type: The Cycles bake type ("AO", "COMBINED", ...).
+:param tile_size: Tile width/height in pixels.
+:param key: The module's bake key (see bake_key).
+"""
+def tile_checkpoint_path(directory, module, bake_type, tile_size, key):
+    return os.path.join(directory, BAKE_TILES_DIR, f"{module}_{bake_type}_{tile_size}_{key}.npy")
+
+
+"""
+Writes a baked tile checkpoint atomically, so an interrupted run never leaves a truncated tile behind.
+:param path: The checkpoint path (see tile_checkpoint_path).
+:param pixels: Flat float32 RGBA pixels of the tile.
+:param tile_size: Tile width/height in pixels.
+"""
+def save_tile_checkpoint(path, pixels, tile_size):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = path + ".tmp.npy"
+    np.save(temp_path, np.asarray(pixels, dtype=np.float32).reshape(tile_size, tile_size, 4))
+    os.replace(temp_path, path)
+
+
+"""
+Copies a tile into an atlas buffer at a pixel position (y is counted from the bottom row, as in Blender images).
+:param atlas: float32 array of shape (atlas_size, atlas_size, 4), modified in place.
+:param tile: float32 array of shape (tile_size, tile_size, 4).
+:param x: Left pixel of the tile.
+:param y: Bottom pixel of the tile.
+"""
+def place_tile(atlas, tile, x, y):
+    tile_size = tile.shape[0]
+    atlas[y:y + tile_size, x:x + tile_size] = tile
+
+
+"""
+Composes one atlas of one bake type from checkpointed tiles.
+Tiles are memory-mapped, so only the atlas itself is held in memory.
+:param tiles: List of (x, y, checkpoint_path); missing checkpoints are left at the fill color.
+:param atlas_size: Atlas width/height in pixels.
+:param fill: (Optional) RGBA fill color of empty atlas space (default: white, like create_image_for_baking).
+:return: (atlas, missing); the float32 (atlas_size, atlas_size, 4) atlas and the checkpoint paths that were missing.
+"""
+def compose_atlas(tiles, atlas_size, fill=(1.0, 1.0, 1.0, 1.0)):
+    atlas = np.empty((atlas_size, atlas_size, 4), dtype=np.float32)
+    atlas[:] = fill
+    missing = []
+    for x, y, path in tiles:
+        if not os.path.exists(path):
+            missing.append(path)
+            continue
+        place_tile(atlas, np.load(path, mmap_mode="r"), x, y)
+    return atlas, missing
+
+
+"""
+Lists the tile checkpoints of every baked module for one atlas and bake type.
+:param config: The planned module config (see atlas_allocator.planned_config).
+:param directory: The project directory.
+:param bake_type: The Cycles bake type.
+:param atlas: The atlas number.
+:return: List of (x, y, checkpoint_path) for compose_atlas.
+"""
+def atlas_tiles(config, directory, bake_type, atlas):
+    tiles = []
+    for module, cfg in config.items():
+        rect = cfg["atlas_rect"]
+        if not cfg["bake"]["apply"] or rect["atlas"] != atlas:
+            continue
+        tiles.append((rect["x"], rect["y"], tile_checkpoint_path(directory, module, bake_type, rect["size"], bake_key(cfg, directory))))
+    return tiles
+
+
+"""
+Writes atlas_layout.json: the atlas size, the layout and every module's atlas rect.
+:param plan: The job plan (see job_plan.load_job_plan).
+:param directory: The project directory.
+:return: The path written.
+"""
+def write_atlas_layout(plan, directory):
+    layout_path = os.path.join(directory, ATLAS_LAYOUT_NAME)
+    with open(layout_path, "w") as layout_file:
+        json.dump({
+            "atlas_size": plan["atlas_settings"]["atlas_size"],
+            "layout": plan["atlas_settings"]["layout"],
+            "modules": {module: cfg["atlas_rect"] for module, cfg in plan["modules"].items()},
+        }, layout_file, indent=4)
+    return layout_path
+
+
+"""
+Composes every atlas of every bake type from the tile checkpoints and streams it to sofa_ao/ or sofa_combined/.
+Runs once after all modules, in whichever driver ran them (main.py or parallel_main.py); only NumPy is used.
+:param plan: The job plan (see job_plan.load_job_plan).
+:param directory: The project directory.
+:param bake_types: (Optional) The bake types to compose (default: BAKE_TYPES).
+:return: The paths of the composed atlases.
+"""
+def compose_atlases(plan, directory, bake_types=BAKE_TYPES):
+    config = plan["modules"]
+    atlas_size = plan["atlas_settings"]["atlas_size"]
+    atlas_numbers = sorted({cfg["atlas_rect"]["atlas"] for cfg in config.values()})
+    atlas_paths = []
+    for bake_type in bake_types:
+        if bake_type not in ATLAS_OUTPUT_DIRS:
+            continue
+        for atlas_number in atlas_numbers:
+            atlas, missing = compose_atlas(atlas_tiles(config, directory, bake_type, atlas_number), atlas_size)
+            for checkpoint_path in missing:
+                print(f"⚠ Missing bake tile: {checkpoint_path}")
+            atlas_path = os.path.join(directory, ATLAS_OUTPUT_DIRS[bake_type], f"ATLAS{atlas_number}_{bake_type}.hdr")
+            stream_image(lambda index, first_row, end_row: atlas[first_row:end_row].reshape(-1), atlas_size, atlas_size, atlas_size, atlas_path)
+            print(f"💾 Atlas composed and saved as HDR: {atlas_path}")
+            atlas_paths.append(atlas_path)
+    return atlas_paths
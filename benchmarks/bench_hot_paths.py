@@ -0,0 +1,179 @@
+# ✅ Standard Python Modules
+import argparse
+import datetime
+import json
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+
+# ✅ Ensure the Benchmarks Can Find the Pipeline Modules
+benchmarks_dir = os.path.dirname(os.path.abspath(__file__))
+project_dir = os.path.dirname(benchmarks_dir)
+for path in (project_dir, benchmarks_dir):
+    if path not in sys.path:
+        sys.path.append(path)
+
+# ✅ Real Blender when available, the lightweight stand-in otherwise
+try:
+    import bpy  # type: ignore
+    BACKEND = "blender"
+except ImportError:
+    import fake_bpy
+    bpy = fake_bpy.install()
+    BACKEND = "stub"
+
+from core.decimate import decimate_arrays
+from core.decimate import triangle_count
+from core.uv_utils import grid_rect
+from core.uv_utils import rect_transform
+from mesh_utils import build_mesh
+from mesh_utils import find_mesh_center
+from mesh_utils import merge_collection
+from mesh_utils import transform_objects_uv
+from profiling import peak_rss
+from sofa_utils import categorize_meshes_in_collection
+from sofa_utils import combine_images_to_rgb
+from sofa_utils import convert_image_to_grayscale
+from synthetic import lightmap_pixels
+from synthetic import sofa_arrays
+
+RESULTS_PATH = os.path.join(benchmarks_dir, "results.jsonl")
+
+# ✅ Usage:
+# python3 benchmarks/bench_hot_paths.py --image-size 2048 --vertices 200000
+# blender --background --python benchmarks/bench_hot_paths.py -- --image-size 8192 --vertices 1000000
+
+
+def create_image(name, size, seed):
+    image = bpy.data.images.new(name, width=size, height=size, alpha=True, float_buffer=True)
+    image.pixels.foreach_set(lightmap_pixels(size, seed))
+    return image
+
+
+def create_sofa_collection(total_vertices):
+    collection = bpy.data.collections.new(name="BENCH")
+    bpy.context.scene.collection.children.link(collection)
+    for name, arrays in sofa_arrays(total_vertices):
+        obj = bpy.data.objects.new(name, build_mesh(name, arrays))
+        collection.objects.link(obj)
+    return collection
+
+
+"""
+Times a hot path and measures the peak memory it allocates through Python (NumPy buffers included).
+Setup runs before every repeat and is not timed; the fastest repeat is reported.
+:param name: The benchmark name.
+:param setup: Callable returning the arguments of run.
+:param run: The hot path, called with the setup result.
+:param items: Work items per call (pixels or vertices), for throughput.
+:param unit: "pixels" or "vertices".
+:param repeat: Number of timed runs.
+"""
+def measure(name, setup, run, items, unit, repeat):
+    best_seconds, peak_memory = None, 0
+    for _ in range(repeat):
+        arguments = setup()
+        tracemalloc.start()
+        start = time.perf_counter()
+        run(*arguments)
+        seconds = time.perf_counter() - start
+        peak_memory = max(peak_memory, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        best_seconds = seconds if best_seconds is None else min(best_seconds, seconds)
+    return {
+        "name": name,
+        "seconds": best_seconds,
+        "throughput": items / best_seconds if best_seconds else None,
+        "unit": unit + "/s",
+        "peak_memory": peak_memory,
+    }
+
+
+def run_benchmarks(image_size, total_vertices, repeat):
+    pixels = image_size * image_size
+    images = [create_image(f"BENCH_{index}", image_size, index) for index in range(3)]
+    collection = create_sofa_collection(total_vertices)
+    objects = list(collection.objects)
+    vertices = sum(len(obj.data.vertices) for obj in objects)
+    part_arrays = [arrays for _, arrays in sofa_arrays(total_vertices)]
+
+    # ✅ The array path of pack_uv_into_rects (its island packing needs edit mode and is Blender's own code)
+    scale, offset_u, offset_v = rect_transform(grid_rect(0, 8192, 1600), 8192)
+
+    def reset_lightmap_uvs():
+        for obj, (_, arrays) in zip(objects, sofa_arrays(total_vertices)):
+            obj.data.uv_layers.active.data.foreach_set("uv", arrays["uv"]["lightmap"].ravel())
+        return (objects, [scale] * len(objects), [(offset_u, offset_v)] * len(objects))
+
+    return [
+        measure("combine_images_to_rgb", lambda: images, combine_images_to_rgb, pixels, "pixels", repeat),
+        measure("convert_image_to_grayscale", lambda: images[:1], convert_image_to_grayscale, pixels, "pixels", repeat),
+        measure("find_mesh_center", lambda: (), lambda: [find_mesh_center(obj) for obj in objects], vertices, "vertices", repeat),
+        measure("transform_objects_uv", reset_lightmap_uvs, transform_objects_uv, vertices, "vertices", repeat),
+        measure("merge_collection", lambda: (create_sofa_collection(total_vertices),), merge_collection, vertices, "vertices", repeat),
+        measure("decimate_arrays", lambda: (), lambda: [decimate_arrays(arrays, triangle_count(arrays) // 4) for arrays in part_arrays], vertices, "vertices", repeat),
+        measure("categorize_meshes_in_collection", lambda: (collection, "BENCH", {"legs": [], "seat": [], "backrest": [], "headrest": []}), categorize_meshes_in_collection, vertices, "vertices", repeat),
+    ]
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=project_dir, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def previous_run(backend, image_size, total_vertices):
+    if not os.path.exists(RESULTS_PATH):
+        return None
+    previous = None
+    with open(RESULTS_PATH) as results_file:
+        for line in results_file:
+            run = json.loads(line)
+            if (run["backend"], run["image_size"], run["vertices"]) == (backend, image_size, total_vertices):
+                previous = run
+    return previous
+
+
+def print_results(results, previous):
+    previous_throughput = {result["name"]: result["throughput"] for result in previous["results"]} if previous else {}
+    for result in results:
+        change = ""
+        if previous_throughput.get(result["name"]):
+            change = f" ({(result['throughput'] / previous_throughput[result['name']] - 1) * 100:+.1f}% vs {previous['commit']})"
+        print(f"⏱ {result['name']:<32} {result['seconds'] * 1000:10.2f} ms {result['throughput']:14.3e} {result['unit']:<10} peak {result['peak_memory'] / 2**20:8.1f} MiB{change}")
+
+
+def main():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else sys.argv[1:]
+    parser = argparse.ArgumentParser(description="Benchmark the pipeline's pixel and mesh hot paths.")
+    parser.add_argument("--image-size", type=int, default=1024, help="Synthetic image width/height (production atlas: 8192).")
+    parser.add_argument("--vertices", type=int, default=100000, help="Total vertices of the synthetic sofa.")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-record", action="store_true", help="Do not append the run to benchmarks/results.jsonl.")
+    args = parser.parse_args(argv)
+
+    print(f"🪑 Benchmarking on {BACKEND}: {args.image_size}² images, ~{args.vertices} vertices")
+    results = run_benchmarks(args.image_size, args.vertices, args.repeat)
+    print_results(results, previous_run(BACKEND, args.image_size, args.vertices))
+    print(f"📈 Peak RSS: {peak_rss() / 2**20:.1f} MiB")
+
+    if not args.no_record:
+        run = {
+            "commit": git_commit(),
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "backend": BACKEND,
+            "image_size": args.image_size,
+            "vertices": args.vertices,
+            "peak_rss": peak_rss(),
+            "results": results,
+        }
+        with open(RESULTS_PATH, "a") as results_file:
+            results_file.write(json.dumps(run) + "\n")
+        print(f"💾 Results appended to: {RESULTS_PATH}")
+
+
+if __name__ == "__main__":
+    main()
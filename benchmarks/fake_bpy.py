@@ -0,0 +1,290 @@
+import sys
+import types
+import numpy as np
+
+
+# ✅ Just enough of bpy/mathutils for the pipeline hot paths to run under plain CPython.
+# Data lives in NumPy arrays, so foreach_get/foreach_set cost roughly what a memcpy costs.
+
+
+class PropCollection:
+    def __init__(self, attributes, count=0):
+        self._attributes = {name: np.zeros((count, width), dtype=dtype) for name, (width, dtype) in attributes.items()}
+
+    def add(self, count):
+        for name, values in self._attributes.items():
+            self._attributes[name] = np.concatenate([values, np.zeros((count, values.shape[1]), dtype=values.dtype)])
+
+    def __len__(self):
+        return len(next(iter(self._attributes.values())))
+
+    def foreach_get(self, attribute, out):
+        out[...] = self._attributes[attribute].reshape(out.shape)
+
+    def foreach_set(self, attribute, values):
+        target = self._attributes[attribute]
+        target[...] = np.asarray(values).reshape(target.shape)
+
+
+class UVLayer:
+    def __init__(self, name, loop_count):
+        self.name = name
+        self.active_render = False
+        self.data = PropCollection({"uv": (2, np.float32)}, loop_count)
+
+
+class UVLayers:
+    def __init__(self, mesh):
+        self._mesh = mesh
+        self._layers = []
+        self.active = None
+
+    def new(self, name="UVMap"):
+        layer = UVLayer(name, len(self._mesh.loops))
+        if self.active is not None:
+            layer.data.foreach_set("uv", self.active.data._attributes["uv"])
+        self._layers.append(layer)
+        if self.active is None:
+            self.active = layer
+        return layer
+
+    def __getitem__(self, name):
+        return next(layer for layer in self._layers if layer.name == name)
+
+    def __contains__(self, name):
+        return any(layer.name == name for layer in self._layers)
+
+    def __iter__(self):
+        return iter(list(self._layers))
+
+    def __len__(self):
+        return len(self._layers)
+
+
+class Attribute:
+    def __init__(self, name, data_type, domain, count, width, dtype):
+        self.name = name
+        self.data_type = data_type
+        self.domain = domain
+        self.data = PropCollection({"value": (width, dtype), "vector": (width, dtype), "color": (width, dtype)}, count)
+
+
+class Attributes:
+    DOMAIN_ELEMENTS = {"POINT": "vertices", "EDGE": "edges", "CORNER": "loops", "FACE": "polygons"}
+    DATA_TYPES = {"FLOAT": (1, np.float32), "INT": (1, np.int32), "BOOLEAN": (1, bool), "FLOAT_VECTOR": (3, np.float32), "FLOAT_COLOR": (4, np.float32)}
+
+    def __init__(self, mesh):
+        self._mesh = mesh
+        self._attributes = []
+
+    def new(self, name, data_type, domain):
+        count = len(getattr(self._mesh, self.DOMAIN_ELEMENTS[domain]))
+        attribute = Attribute(name, data_type, domain, count, *self.DATA_TYPES[data_type])
+        self._attributes.append(attribute)
+        return attribute
+
+    def get(self, name):
+        return next((attribute for attribute in self._attributes if attribute.name == name), None)
+
+    def __iter__(self):
+        return iter(list(self._attributes))
+
+
+class Mesh:
+    def __init__(self, name):
+        self.name = name
+        self.vertices = PropCollection({"co": (3, np.float32)})
+        self.edges = PropCollection({"vertices": (2, np.int32), "use_seam": (1, bool), "use_edge_sharp": (1, bool)})
+        self.loops = PropCollection({"vertex_index": (1, np.int32), "edge_index": (1, np.int32)})
+        self.polygons = PropCollection({
+            "loop_start": (1, np.int32),
+            "loop_total": (1, np.int32),
+            "material_index": (1, np.int32),
+            "use_smooth": (1, bool),
+        })
+        self.uv_layers = UVLayers(self)
+        self.attributes = Attributes(self)
+        self.shape_keys = None
+        self.materials = []
+        self.users = 0
+        self.has_custom_normals = False
+
+    def update(self, *args, **kwargs):
+        pass
+
+
+class Object:
+    def __init__(self, name, data):
+        self.name = name
+        self._data = None
+        self.data = data
+        self.type = "MESH"
+        self.matrix_world = np.eye(4)
+        self.users_collection = []
+        self.selected = False
+        self.vertex_groups = []
+        self.properties = {}
+
+    @property
+    def data(self):
+        return self._data
+
+    @data.setter
+    def data(self, data):
+        if self._data is not None:
+            self._data.users -= 1
+        self._data = data
+        data.users += 1
+
+    def __getitem__(self, key):
+        return self.properties[key]
+
+    def __setitem__(self, key, value):
+        self.properties[key] = value
+
+    def __delitem__(self, key):
+        del self.properties[key]
+
+    def __contains__(self, key):
+        return key in self.properties
+
+    def select_set(self, state):
+        self.selected = state
+
+
+class CollectionObjects:
+    def __init__(self, collection):
+        self._collection = collection
+        self._objects = []
+
+    def link(self, obj):
+        self._objects.append(obj)
+        obj.users_collection.append(self._collection)
+
+    def unlink(self, obj):
+        self._objects.remove(obj)
+        obj.users_collection.remove(self._collection)
+
+    def __iter__(self):
+        return iter(list(self._objects))
+
+    def __len__(self):
+        return len(self._objects)
+
+
+class Collection:
+    def __init__(self, name):
+        self.name = name
+        self.users_collection = []
+        self.objects = CollectionObjects(self)
+        self.children = CollectionObjects(self)
+
+
+class PixelArray:
+    def __init__(self, size):
+        self._values = np.zeros(size, dtype=np.float32)
+
+    def __len__(self):
+        return len(self._values)
+
+    # ✅ Like Blender, slicing copies the whole buffer into Python floats, whatever the slice size
+    def __getitem__(self, index):
+        return tuple(self._values.tolist()[index])
+
+    def __setitem__(self, index, values):
+        values_list = self._values.tolist()
+        values_list[index] = values
+        self._values[...] = values_list
+
+    def foreach_get(self, out):
+        out[...] = self._values
+
+    def foreach_set(self, values):
+        self._values[...] = values
+
+
+class Image:
+    def __init__(self, name, width, height):
+        self.name = name
+        self.size = (width, height)
+        self.channels = 4
+        self.pixels = PixelArray(width * height * 4)
+        self.generated_color = (0, 0, 0, 1)
+
+    def update(self):
+        pass
+
+
+class DataBlocks:
+    def __init__(self, factory):
+        self._factory = factory
+        self._blocks = []
+
+    def new(self, *args, **kwargs):
+        block = self._factory(*args, **kwargs)
+        self._blocks.append(block)
+        return block
+
+    def remove(self, block, do_unlink=False):
+        self._blocks.remove(block)
+        if do_unlink:
+            for collection in list(getattr(block, "users_collection", [])):
+                collection.objects.unlink(block)
+        if isinstance(block, Object):
+            block.data.users -= 1
+
+    def __iter__(self):
+        return iter(list(self._blocks))
+
+    def __len__(self):
+        return len(self._blocks)
+
+
+class Operators:
+    # ✅ Any bpy.ops.<group>.<operator>(...) is a no-op returning {"FINISHED"}
+    def __getattr__(self, name):
+        return Operators()
+
+    def __call__(self, *args, **kwargs):
+        return {"FINISHED"}
+
+
+class Vector(tuple):
+    def __new__(cls, values):
+        return super().__new__(cls, (float(value) for value in values))
+
+    x = property(lambda self: self[0])
+    y = property(lambda self: self[1])
+    z = property(lambda self: self[2])
+
+
+"""
+Registers the stand-in as the bpy and mathutils modules.
+:return: The fake bpy module.
+"""
+def install():
+    bpy = types.ModuleType("bpy")
+    bpy.data = types.SimpleNamespace(
+        meshes=DataBlocks(Mesh),
+        objects=DataBlocks(Object),
+        collections=DataBlocks(Collection),
+        images=DataBlocks(lambda name, width, height, alpha=True, float_buffer=False: Image(name, width, height)),
+        materials=DataBlocks(lambda name: types.SimpleNamespace(name=name)),
+    )
+    bpy.data.batch_remove = lambda blocks: [
+        getattr(bpy.data, "objects" if isinstance(block, Object) else "meshes").remove(block, do_unlink=True) for block in blocks
+    ]
+    scene_collection = Collection("Scene Collection")
+    bpy.context = types.SimpleNamespace(
+        scene=types.SimpleNamespace(collection=scene_collection),
+        view_layer=types.SimpleNamespace(objects=types.SimpleNamespace(active=None)),
+        selected_objects=[],
+    )
+    bpy.ops = Operators()
+
+    mathutils = types.ModuleType("mathutils")
+    mathutils.Vector = Vector
+
+    sys.modules["bpy"] = bpy
+    sys.modules["mathutils"] = mathutils
+    return bpy
@@ -0,0 +1,82 @@
+import math
+import numpy as np
+
+
+# ✅ Sofa-like test geometry: four legs on the floor, a seat, a backrest and a headrest,
+# each a subdivided quad grid at the height categorize_meshes_in_collection expects for its category
+SOFA_PARTS = [
+    ("leg", (-0.4, -0.3, 0.0), 0.05),
+    ("leg", (0.4, -0.3, 0.0), 0.05),
+    ("leg", (-0.4, 0.3, 0.0), 0.05),
+    ("leg", (0.4, 0.3, 0.0), 0.05),
+    ("seat", (0.0, 0.0, 0.25), 0.9),
+    ("backrest", (0.0, 0.35, 0.5), 0.9),
+    ("headrest", (0.0, 0.4, 0.7), 0.6),
+]
+
+
+"""
+Builds mesh arrays (see core/mesh_arrays.py) of a flat quad grid.
+:param subdivisions: Quads per grid edge.
+:param center: (x, y, z) of the grid center.
+:param size: Grid edge length in meters.
+"""
+def grid_arrays(subdivisions, center, size):
+    steps = subdivisions + 1
+    u, v = np.meshgrid(np.linspace(0.0, 1.0, steps), np.linspace(0.0, 1.0, steps))
+    co = np.stack([
+        center[0] + (u.ravel() - 0.5) * size,
+        center[1] + (v.ravel() - 0.5) * size,
+        np.full(steps * steps, center[2]),
+    ], axis=1).astype(np.float32)
+
+    corner = (np.arange(subdivisions)[:, None] * steps + np.arange(subdivisions)[None, :]).ravel()
+    quads = np.stack([corner, corner + 1, corner + steps + 1, corner + steps], axis=1).astype(np.int32)
+    horizontal = np.stack([corner, corner + 1], axis=1)
+    vertical = np.stack([corner, corner + steps], axis=1)
+    last_row = np.arange(subdivisions) + subdivisions * steps
+    last_col = np.arange(subdivisions) * steps + subdivisions
+    edges = np.concatenate([
+        horizontal, vertical,
+        np.stack([last_row, last_row + 1], axis=1),
+        np.stack([last_col, last_col + steps], axis=1),
+    ]).astype(np.int32)
+
+    loop_vertex = quads.ravel()
+    uv = np.stack([u.ravel(), v.ravel()], axis=1).astype(np.float32)[loop_vertex]
+    polygon_count = len(quads)
+    return {
+        "co": co,
+        "edges": edges,
+        "loop_vertex": loop_vertex,
+        "loop_start": (np.arange(polygon_count) * 4).astype(np.int32),
+        "loop_total": np.full(polygon_count, 4, dtype=np.int32),
+        "material_index": np.zeros(polygon_count, dtype=np.int32),
+        "use_smooth": np.zeros(polygon_count, dtype=bool),
+        "uv": {"UVMap": uv, "lightmap": uv.copy()},
+        "uv_active": "lightmap",
+        "uv_render": "lightmap",
+    }
+
+
+"""
+Builds the mesh arrays of every part of a synthetic sofa with roughly the requested total vertex count.
+:return: List of (part name, mesh arrays).
+"""
+def sofa_arrays(total_vertices):
+    subdivisions = max(1, int(math.sqrt(total_vertices / len(SOFA_PARTS))) - 1)
+    return [(f"{name}_{index}", grid_arrays(subdivisions, center, size)) for index, (name, center, size) in enumerate(SOFA_PARTS)]
+
+
+"""
+Builds a flat float32 RGBA buffer that looks like a baked lightmap (smooth gradients plus noise).
+"""
+def lightmap_pixels(size, seed=0):
+    rng = np.random.default_rng(seed)
+    ramp = np.linspace(0.0, 1.0, size, dtype=np.float32)
+    pixels = np.empty((size, size, 4), dtype=np.float32)
+    pixels[..., 0] = ramp[None, :]
+    pixels[..., 1] = ramp[:, None]
+    pixels[..., 2] = rng.random((size, size), dtype=np.float32)
+    pixels[..., 3] = 1.0
+    return pixels.ravel()
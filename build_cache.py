@@ -0,0 +1,155 @@
+import glob
+import hashlib
+import json
+import os
+
+
+MANIFEST_NAME = "build_manifest.json"
+OUTPUT_DIRS = ["sofa_fbx", "sofa_glb", "sofa_ao", "sofa_combined", "sofa_final"]
+CONFIG_KEYS = ["index", "lowpoly_filepath", "highpoly_filepath", "envelope", "transform", "decimate", "lods", "bake", "quality", "atlas_rect"]
+# ✅ Files that only describe modules, not how they are built (covered by the per-module config hash)
+CODE_VERSION_EXCLUDES = {"sofa_modules_config.py"}
+# ✅ Manifest entry of the outputs composed from every module (the baked atlases), next to the per-module entries
+COMPOSED_ENTRY = "_composed"
+
+
+"""
+Hashes a file's content with SHA-256, reading it in chunks.
+:param filepath: The file to hash.
+:return: The hex digest, or None when the file does not exist.
+"""
+def file_hash(filepath):
+    if not os.path.isfile(filepath):
+        return None
+    digest = hashlib.sha256()
+    with open(filepath, "rb") as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+"""
+Hashes a JSON-serializable value in a stable (key-sorted) form.
+"""
+def value_hash(value):
+    payload = json.dumps(value, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()
+
+
+"""
+Computes the pipeline code version as a hash of every Python source in the project directory.
+:param directory: The project directory.
+:param sources: (Optional) Only hash these sources, relative to the directory (default: every source).
+"""
+def code_version(directory, sources=None):
+    digest = hashlib.sha256()
+    if sources is None:
+        filepaths = glob.glob(os.path.join(directory, "*.py")) + glob.glob(os.path.join(directory, "core", "*.py"))
+    else:
+        filepaths = [os.path.join(directory, source) for source in sources]
+    for filepath in sorted(filepaths):
+        if os.path.basename(filepath) in CODE_VERSION_EXCLUDES:
+            continue
+        digest.update(os.path.relpath(filepath, directory).encode("utf-8"))
+        digest.update(str(file_hash(filepath)).encode("utf-8"))
+    return digest.hexdigest()
+
+
+"""
+Builds the cache key of a module from its input files, its config entry and the code version.
+:param cfg: The module's job plan entry (its "quality" already resolved, see job_plan.compile_job_plan).
+:param directory: The project directory that input paths are relative to.
+:param version: The pipeline code version (see code_version).
+"""
+def module_key(cfg, directory, version):
+    return {
+        "lowpoly": file_hash(os.path.join(directory, cfg["lowpoly_filepath"])),
+        "highpoly": file_hash(os.path.join(directory, cfg["highpoly_filepath"])),
+        "config": value_hash({key: cfg.get(key) for key in CONFIG_KEYS}),
+        "code": version,
+    }
+
+
+def load_manifest(directory):
+    manifest_path = os.path.join(directory, MANIFEST_NAME)
+    if not os.path.exists(manifest_path):
+        return {}
+    with open(manifest_path) as manifest_file:
+        return json.load(manifest_file)
+
+
+def save_manifest(manifest, directory):
+    manifest_path = os.path.join(directory, MANIFEST_NAME)
+    temp_path = manifest_path + ".tmp"
+    with open(temp_path, "w") as manifest_file:
+        json.dump(manifest, manifest_file, indent=4, sort_keys=True)
+    os.replace(temp_path, manifest_path)
+
+
+"""
+Checks whether a module can be skipped: same key as the last build and every recorded output unchanged on disk.
+:param manifest: The loaded build manifest.
+:param module: The module name.
+:param key: The module's current key (see module_key).
+:param directory: The project directory that output paths are relative to.
+"""
+def is_up_to_date(manifest, module, key, directory):
+    entry = manifest.get(module)
+    if entry is None or entry["key"] != key or key["lowpoly"] is None:
+        return False
+    return all(
+        file_hash(os.path.join(directory, output)) == output_hash
+        for output, output_hash in entry["outputs"].items()
+    )
+
+
+"""
+Records a finished module build in the manifest.
+:param manifest: The loaded build manifest (updated in place).
+:param module: The module name.
+:param key: The module's key used for the build.
+:param outputs: Paths of every file the build wrote.
+:param parts: The module's categorized parts, reused for sofa_parts.json when the module is skipped.
+:param directory: The project directory output paths are stored relative to.
+"""
+def record_module(manifest, module, key, outputs, parts, directory):
+    relative_outputs = [os.path.relpath(output, directory) for output in outputs]
+    manifest[module] = {
+        "key": key,
+        "outputs": {output: file_hash(os.path.join(directory, output)) for output in relative_outputs},
+        "parts": parts,
+    }
+
+
+"""
+Records the outputs composed from every module's results (see bake_tiles.compose_atlases) in the manifest.
+:param manifest: The loaded build manifest (updated in place).
+:param outputs: Paths of every composed file.
+:param directory: The project directory output paths are stored relative to.
+"""
+def record_composed(manifest, outputs, directory):
+    relative_outputs = [os.path.relpath(output, directory) for output in outputs]
+    manifest[COMPOSED_ENTRY] = {"outputs": {output: file_hash(os.path.join(directory, output)) for output in relative_outputs}}
+
+
+"""
+Finds output files that no current build accounts for: files not recorded for any module in the config
+(or as composed outputs), or recorded files whose content changed since they were written.
+:param manifest: The loaded build manifest.
+:param modules: The module names in the current config.
+:param directory: The project directory.
+:return: Sorted relative paths of stale outputs.
+"""
+def find_stale_outputs(manifest, modules, directory):
+    recorded = dict(manifest.get(COMPOSED_ENTRY, {}).get("outputs", {}))
+    for module in modules:
+        if module in manifest:
+            recorded.update(manifest[module]["outputs"])
+
+    stale = []
+    for output_dir in OUTPUT_DIRS:
+        for filepath in glob.glob(os.path.join(directory, output_dir, "*")):
+            output = os.path.relpath(filepath, directory)
+            if output not in recorded or recorded[output] != file_hash(filepath):
+                stale.append(output)
+    return sorted(stale)
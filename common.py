@@ -1,11 +1,13 @@
 import bpy  # type: ignore
 import json
+from profiling import profiled
 
 
 """
 Exports the currently selected object as an GLB file.
 :param filepath: The output file path for the GLB export.
 """
+@profiled
 def export_selected_glb(filepath):
     if not bpy.context.selected_objects:
         print("⚠ No object selected for export.")
@@ -29,6 +31,7 @@ def export_selected_glb(filepath):
 Exports the currently selected object as an FBX file.
 :param filepath: The output file path for the FBX export.
 """
+@profiled
 def export_selected_fbx(filepath):
     if not bpy.context.selected_objects:
         print("⚠ No object selected for export.")
@@ -50,6 +53,7 @@ def export_selected_fbx(filepath):
 Saves the current Blender scene as a .blend file.
 :param filepath: The full file path where the Blender file will be saved.
 """
+@profiled
 def save_scene(filepath):
     bpy.ops.wm.save_as_mainfile(filepath=filepath)
     print(f"💾 File saved at: {filepath}")
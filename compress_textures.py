@@ -0,0 +1,143 @@
+# ✅ Standard Python Modules
+import argparse
+import glob
+import json
+import os
+import shutil
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# ✅ Custom Imports
+from build_cache import file_hash
+
+directory = os.path.dirname(os.path.abspath(__file__))
+
+STATE_NAME = ".compress_state.json"
+REPORT_NAME = "compress_report.json"
+
+# ✅ toktx presets: ETC1S keeps diffuse maps small, UASTC keeps normal maps free of block artifacts
+ENCODER_PRESETS = {
+    "etc1s": ["--encode", "etc1s", "--clevel", "4", "--qlevel", "128", "--genmipmap", "--2d", "--assign_oetf", "srgb"],
+    "uastc": ["--encode", "uastc", "--uastc_quality", "2", "--genmipmap", "--2d", "--assign_oetf", "linear"],
+}
+
+
+"""
+Picks the encoder preset for a texture from its file name.
+:param filepath: The source PNG path.
+:return: "uastc" for normal maps, "etc1s" for everything else.
+"""
+def preset_for(filepath):
+    if "_normal" in os.path.basename(filepath):
+        return "uastc"
+    return "etc1s"
+
+
+"""
+Encodes one texture with toktx, or copies it unchanged when running with the stub encoder.
+:return: The encoder that produced the output ("toktx" or "stub").
+"""
+def encode(source, output, preset, use_stub, threads):
+    if use_stub:
+        shutil.copyfile(source, output)
+        return "stub"
+    command = ["toktx", "--threads", str(threads)] + ENCODER_PRESETS[preset] + [output, source]
+    subprocess.run(command, check=True, capture_output=True)
+    return "toktx"
+
+
+"""
+Checks whether a texture still matches the state recorded when it was last compressed.
+Size and mtime are compared first; the content hash is only computed when they changed, and a matching hash
+records the new mtime so the file is not hashed again on the next run.
+:param key: The state key (the source path relative to the project directory).
+:param source: The source path to stat and hash (absolute, so the check works from any working directory).
+"""
+def is_unchanged(state, key, source, output, preset, encoder):
+    entry = state.get(key)
+    if entry is None or entry["preset"] != preset or entry["encoder"] != encoder or not os.path.exists(output):
+        return False
+    stat = os.stat(source)
+    if entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+        return True
+    if entry["size"] == stat.st_size and entry["hash"] == file_hash(source):
+        entry["mtime_ns"] = stat.st_mtime_ns
+        return True
+    return False
+
+
+def compress_texture(source, output_dir, state, use_stub, threads, force):
+    source = os.path.abspath(source)
+    output = os.path.join(output_dir, os.path.basename(source)[:-len(".png")] + ".ktx2")
+    preset = preset_for(source)
+    result = {"source": os.path.relpath(source, directory), "output": os.path.relpath(output, directory), "preset": preset}
+
+    if not force and is_unchanged(state, result["source"], source, output, preset, "stub" if use_stub else "toktx"):
+        print(f"⏭ {source} is unchanged, skipped.")
+        return dict(result, status="skipped", encoder=None, input_size=os.path.getsize(source), output_size=os.path.getsize(output), seconds=0.0)
+
+    print(f"🔄 Compressing {source} → {output} ({preset})")
+    start = time.perf_counter()
+    try:
+        encoder = encode(source, output, preset, use_stub, threads)
+    except subprocess.CalledProcessError as error:
+        print(f"❌ toktx failed for {source}: {error.stderr.decode(errors='replace').strip()}")
+        return dict(result, status="failed", encoder="toktx", input_size=os.path.getsize(source), output_size=None, seconds=time.perf_counter() - start)
+
+    stat = os.stat(source)
+    state[result["source"]] = {"preset": preset, "encoder": encoder, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "hash": file_hash(source)}
+    return dict(result, status="compressed", encoder=encoder, input_size=stat.st_size, output_size=os.path.getsize(output), seconds=time.perf_counter() - start)
+
+
+"""
+Compresses every PNG in sofa_textures/*/ to KTX2 on a worker pool, skipping unchanged textures.
+:param source_glob: Glob of the source PNGs.
+:param output_dir: Directory for the .ktx2 files, the state file and the JSON report.
+:param workers: Number of textures encoded at the same time.
+:param use_stub: Copy textures instead of encoding them (for machines without toktx).
+:param force: Recompress even when a texture is unchanged.
+:return: The list of per-texture results, also written to compress_report.json.
+"""
+def compress_textures(source_glob, output_dir, workers, use_stub=False, force=False):
+    os.makedirs(output_dir, exist_ok=True)
+    state_path = os.path.join(output_dir, STATE_NAME)
+    state = {}
+    if os.path.exists(state_path):
+        with open(state_path) as state_file:
+            state = json.load(state_file)
+
+    sources = sorted(glob.glob(source_glob))
+    threads = max(1, (os.cpu_count() or 1) // max(1, min(workers, len(sources) or 1)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(lambda source: compress_texture(source, output_dir, state, use_stub, threads, force), sources))
+
+    with open(state_path, "w") as state_file:
+        json.dump(state, state_file, indent=4, sort_keys=True)
+    with open(os.path.join(output_dir, REPORT_NAME), "w") as report_file:
+        json.dump(results, report_file, indent=4)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compress sofa textures to KTX2.")
+    parser.add_argument("--source", default=os.path.join(directory, "sofa_textures", "*", "*.png"))
+    parser.add_argument("--output", default=os.path.join(directory, "ktx2_output"))
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--stub", action="store_true", help="Copy textures instead of encoding them.")
+    parser.add_argument("--force", action="store_true", help="Recompress unchanged textures.")
+    args = parser.parse_args()
+
+    use_stub = args.stub or shutil.which("toktx") is None
+    if use_stub and not args.stub:
+        print("⚠ toktx not found, using the stub encoder.")
+
+    results = compress_textures(args.source, args.output, args.workers, use_stub, args.force)
+    counts = {status: sum(result["status"] == status for result in results) for status in ("compressed", "skipped", "failed")}
+    print(f"✅ {counts['compressed']} compressed, {counts['skipped']} skipped, {counts['failed']} failed → {args.output}")
+    if counts["failed"]:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
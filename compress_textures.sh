@@ -2,15 +2,5 @@
 
 set -e  # Exit on first error
 
-mkdir -p ktx2_output
-
-for file in sofa_textures/*/*.png; do
-  if [[ -f "$file" ]]; then
-    base=$(basename "$file" .png)
-    echo "🔄 Compressing $file → ktx2_output/${base}_v2.ktx2"
-    toktx --encode etc1s --clevel 4 --qlevel 128 --genmipmap --2d --assign_oetf srgb \
-      "ktx2_output/${base}.ktx2" "$file"
-  fi
-done
-
-echo "✅ All textures compressed into ktx2_output/"
\ No newline at end of file
+# Parallel, skip-if-unchanged compression lives in compress_textures.py
+python3 "$(dirname "$0")/compress_textures.py" "$@"
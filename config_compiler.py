@@ -0,0 +1,91 @@
+import os
+
+# ✅ Size codes: D/W nn is nn × 12.5 cm, e.g. W09 = 112.5 cm (file names use "112_5")
+SIZE_STEP = 0.125
+
+
+def size_label(code):
+    return f"{code * SIZE_STEP * 100:g}".replace(".", "_")
+
+
+def module_name(series, family, depth, width, suffix=""):
+    return f"{series}_{family}_D{depth:02d}_W{width:02d}{suffix}"
+
+
+"""
+Expands one module family into config entries, one per (depth, width) of its size table.
+:param family: {"code", "model", "sizes", ...}: "model" is the FBX base name, with {width} and {depth} size labels
+               (e.g. "Ottoman_{width}x{depth}"); "sizes" maps each depth code to its width codes;
+               optional "suffix" is appended to module names; every other key overrides the defaults.
+:param series: The series prefix of module names (e.g. "S01").
+:param defaults: Entry values the family does not set ("transform", "decimate", "lods", "bake", "quality").
+:return: {module: entry} without "index", in size table order.
+"""
+def expand_family(family, series, defaults):
+    settings = dict(defaults, **{key: value for key, value in family.items() if key in defaults})
+    entries = {}
+    for depth, widths in family["sizes"].items():
+        for width in widths:
+            model = family["model"].format(width=size_label(width), depth=size_label(depth))
+            entries[module_name(series, family["code"], depth, width, family.get("suffix", ""))] = dict(
+                highpoly_filepath="SOFA_HP/HP_" + model + ".fbx",
+                lowpoly_filepath="SOFA_LP/LP_" + model + ".fbx",
+                envelope={"width": width * SIZE_STEP, "depth": depth * SIZE_STEP},
+                **settings,
+            )
+    return entries
+
+
+"""
+Compiles module families into the module config. Disabled families ("enabled": False) are skipped,
+and atlas indexes are assigned in declaration order, so they never need to be written by hand.
+:param families: A list of family dicts (see expand_family).
+:param series: The series prefix of module names.
+:param defaults: Entry values families do not set.
+:return: {module: entry} with "index", ready for atlas_allocator.planned_config.
+:raises ValueError: When two families produce the same module name.
+"""
+def compile_config(families, series, defaults):
+    config = {}
+    for family in families:
+        if not family.get("enabled", True):
+            continue
+        for module, entry in expand_family(family, series, defaults).items():
+            if module in config:
+                raise ValueError(f"Module {module} is produced by more than one family")
+            config[module] = dict(index=len(config), **entry)
+    return config
+
+
+def rects_overlap(a, b):
+    return (
+        a["atlas"] == b["atlas"]
+        and a["x"] < b["x"] + b["size"] and b["x"] < a["x"] + a["size"]
+        and a["y"] < b["y"] + b["size"] and b["y"] < a["y"] + a["size"]
+    )
+
+
+"""
+Checks a planned config before anything runs: input files and tile rects (indexes are assigned by compile_config).
+:param config: The planned config (every entry has its "atlas_rect").
+:param atlas_size: Atlas width/height in pixels.
+:param directory: (Optional) The project directory; input files are checked when given.
+:return: A list of error messages (empty when the config is valid).
+"""
+def validate_config(config, atlas_size, directory=None):
+    errors = []
+    for module, cfg in config.items():
+        if directory:
+            for key in ("highpoly_filepath", "lowpoly_filepath"):
+                if not os.path.isfile(os.path.join(directory, cfg[key])):
+                    errors.append(f"{module}: {key} not found: {cfg[key]}")
+        rect = cfg["atlas_rect"]
+        if rect["x"] < 0 or rect["y"] < 0 or rect["x"] + rect["size"] > atlas_size or rect["y"] + rect["size"] > atlas_size:
+            errors.append(f"{module}: tile {rect} does not fit the {atlas_size}px atlas")
+
+    modules = list(config)
+    for first in range(len(modules)):
+        for second in range(first + 1, len(modules)):
+            if rects_overlap(config[modules[first]]["atlas_rect"], config[modules[second]]["atlas_rect"]):
+                errors.append(f"{modules[first]} and {modules[second]}: atlas tiles overlap")
+    return errors
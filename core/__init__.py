@@ -0,0 +1,5 @@
+"""
+Pipeline computation that needs only NumPy: pixel bands, geometry and transforms, UV tiles, loose parts,
+mesh arrays and export naming. mesh_utils and sofa_utils are the Blender adapters: they read and write bpy data
+and delegate the math to this package, so everything here imports and runs under plain CPython.
+"""
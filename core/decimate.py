@@ -0,0 +1,288 @@
+import numpy as np
+
+
+# ✅ Quadric error decimation on mesh arrays (see mesh_arrays.py), in rounds of independent half-edge collapses:
+# every round picks, for each removable vertex v, the neighbour u with the lowest quadric error, keeps the collapses
+# whose 1-rings do not overlap (so they can all be applied at once) and applies them as array updates.
+# Vertices on boundaries, non-manifold edges, UV seams, material borders and flat/smooth borders are never removed,
+# so every removed vertex sits inside one UV chart and its corners can take over the UVs of the vertex it merges into.
+
+MAX_ROUNDS = 200
+# ✅ Share of the removable vertices (cheapest first) whose collapses compete in one round
+CANDIDATE_QUANTILE = 0.5
+# ✅ A collapse may turn a triangle's normal by at most acos(MIN_NORMAL_COSINE) (60°)
+MIN_NORMAL_COSINE = 0.5
+# ✅ Selection passes per round: each pass adds the collapses that no earlier winner blocks
+SELECTION_PASSES = 8
+
+
+"""
+Triangulates polygons as fans of loop indices.
+:return: (triangles, triangle_polygon); triangles is an int array of shape (T, 3) with loop indices.
+"""
+def triangulate(loop_start, loop_total):
+    counts = loop_total - 2
+    triangle_polygon = np.repeat(np.arange(len(loop_start)), counts)
+    first = np.repeat(loop_start, counts)
+    step = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    return np.stack([first, first + step + 1, first + step + 2], axis=1).astype(np.int64), triangle_polygon
+
+
+def cross(a, b):
+    return np.stack([
+        a[:, 1] * b[:, 2] - a[:, 2] * b[:, 1],
+        a[:, 2] * b[:, 0] - a[:, 0] * b[:, 2],
+        a[:, 0] * b[:, 1] - a[:, 1] * b[:, 0],
+    ], axis=1)
+
+
+def triangle_planes(points):
+    normals = cross(points[:, 1] - points[:, 0], points[:, 2] - points[:, 0])
+    double_areas = np.linalg.norm(normals, axis=1)
+    normals = normals / np.maximum(double_areas, 1e-20)[:, None]
+    return normals, -np.einsum("ij,ij->i", normals, points[:, 0]), double_areas * 0.5
+
+
+"""
+Sums area-weighted plane quadrics per vertex.
+:return: float64 array of shape (V, 4, 4).
+"""
+def vertex_quadrics(co, triangle_vertices):
+    normals, offsets, areas = triangle_planes(co[triangle_vertices])
+    planes = np.concatenate([normals, offsets[:, None]], axis=1)
+    triangle_quadrics = (planes[:, :, None] * planes[:, None, :] * areas[:, None, None]).reshape(-1, 16)
+    quadrics = np.zeros((len(co), 16))
+    for corner in range(3):
+        for component in range(16):
+            quadrics[:, component] += np.bincount(triangle_vertices[:, corner], weights=triangle_quadrics[:, component], minlength=len(co))
+    return quadrics.reshape(-1, 4, 4)
+
+
+"""
+Finds vertices that must not be removed: endpoints of boundary, non-manifold, UV seam, material and smooth-flag edges.
+:return: Boolean mask over vertices.
+"""
+def locked_vertices(vertex_count, triangles, loop_vertex, uv_layers, material_index, use_smooth):
+    corners_from = triangles.ravel()
+    corners_to = triangles[:, [1, 2, 0]].ravel()
+    edge_from, edge_to = loop_vertex[corners_from], loop_vertex[corners_to]
+    keys = np.minimum(edge_from, edge_to) * vertex_count + np.maximum(edge_from, edge_to)
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+    starts = np.flatnonzero(np.concatenate([[True], sorted_keys[1:] != sorted_keys[:-1]]))
+    counts = np.diff(np.append(starts, len(keys)))
+
+    feature = counts != 2
+    pairs = starts[counts == 2]
+    first, second = order[pairs], order[pairs + 1]
+    # ✅ Consistently oriented neighbours walk a shared edge in opposite directions: a→b and b→a
+    same_direction = edge_from[first] == edge_from[second]
+    triangle_first, triangle_second = first // 3, second // 3
+    differs = same_direction | (material_index[triangle_first] != material_index[triangle_second])
+    differs |= use_smooth[triangle_first] != use_smooth[triangle_second]
+    for uvs in uv_layers:
+        differs |= np.any(uvs[corners_from[first]] != uvs[corners_to[second]], axis=1)
+        differs |= np.any(uvs[corners_to[first]] != uvs[corners_from[second]], axis=1)
+    feature[np.flatnonzero(counts == 2)[differs]] = True
+
+    locked = np.zeros(vertex_count, dtype=bool)
+    feature_edges = order[starts[feature]]
+    locked[edge_from[feature_edges]] = True
+    locked[edge_to[feature_edges]] = True
+    return locked
+
+
+"""
+Expands CSR rows: for each key, all its entries.
+:return: (owner index per entry, entry values).
+"""
+def csr_rows(starts, values, keys):
+    counts = starts[keys + 1] - starts[keys]
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    return np.repeat(np.arange(len(keys)), counts), values[np.repeat(starts[keys], counts) + offsets]
+
+
+def csr(owners, values, size):
+    order = np.argsort(owners, kind="stable")
+    return np.concatenate([[0], np.cumsum(np.bincount(owners, minlength=size))]), values[order]
+
+
+"""
+Runs one round of independent collapses.
+:return: (triangles, collapsed vertex count) after the round.
+"""
+def collapse_round(co, quadrics, triangles, loop_vertex, locked, collapse_budget):
+    vertex_count = len(co)
+    triangle_vertices = loop_vertex[triangles]
+
+    # ✅ Candidate half-edges v→u, with one loop of u (its UV in v's chart) per pair
+    directed_from = triangle_vertices[:, [0, 0, 1, 1, 2, 2]].ravel()
+    directed_to = triangle_vertices[:, [1, 2, 0, 2, 0, 1]].ravel()
+    target_loop = triangles[:, [1, 2, 0, 2, 0, 1]].ravel()
+    free = ~locked[directed_from]
+    keys, first_index = np.unique(directed_from[free] * vertex_count + directed_to[free], return_index=True)
+    if len(keys) == 0:
+        return triangles, 0
+    v, u = keys // vertex_count, keys % vertex_count
+    loop_u = target_loop[free][first_index]
+
+    target = np.concatenate([co[u], np.ones((len(keys), 1))], axis=1)
+    cost = np.einsum("ni,nij,nj->n", target, quadrics[v] + quadrics[u], target)
+
+    # ✅ Only targets within the cheaper part of the vertices' best costs compete this round
+    # (lower keeps closer to a greedy order, higher needs fewer rounds)
+    lowest_cost = np.full(vertex_count, np.inf)
+    np.minimum.at(lowest_cost, v, cost)
+    cheap = cost <= np.quantile(lowest_cost[np.unique(v)], CANDIDATE_QUANTILE)
+    v, u, loop_u, cost = v[cheap], u[cheap], loop_u[cheap], cost[cheap]
+
+    # ✅ Link condition: u and v share exactly the two vertices opposite their edge
+    edge_keys = np.unique(np.minimum(directed_from, directed_to) * vertex_count + np.maximum(directed_from, directed_to))
+    edge_a, edge_b = edge_keys // vertex_count, edge_keys % vertex_count
+    neighbour_start, neighbours = csr(np.concatenate([edge_a, edge_b]), np.concatenate([edge_b, edge_a]), vertex_count)
+    pair_candidate, pair_neighbour = csr_rows(neighbour_start, neighbours, v)
+    pair_u = u[pair_candidate]
+    lookup = np.minimum(pair_u, pair_neighbour) * vertex_count + np.maximum(pair_u, pair_neighbour)
+    position = np.minimum(np.searchsorted(edge_keys, lookup), len(edge_keys) - 1)
+    shared = (edge_keys[position] == lookup) & (pair_neighbour != pair_u)
+    valid = np.bincount(pair_candidate[shared], minlength=len(v)) == 2
+
+    # ✅ No triangle of v's fan may flip or collapse when v moves onto u: moving corner k to q turns the normal
+    # into cross(p[k+1] - q, p[k+2] - p[k+1]), so per-corner points and opposite edges are computed once
+    points = co[triangle_vertices]
+    normals = cross(points[:, 1] - points[:, 0], points[:, 2] - points[:, 0])
+    following = points[:, [1, 2, 0]].reshape(-1, 3)
+    opposite = (points[:, [2, 0, 1]] - points[:, [1, 2, 0]]).reshape(-1, 3)
+    others = triangle_vertices[:, [1, 2, 2, 0, 0, 1]].reshape(-1, 2)
+    corner_start, corner_index = csr(triangle_vertices.ravel(), np.arange(3 * len(triangles)), vertex_count)
+    fan_candidate, fan_corner = csr_rows(corner_start, corner_index, v)
+    fan_u = u[fan_candidate]
+    keeps = (others[fan_corner, 0] != fan_u) & (others[fan_corner, 1] != fan_u)
+    fan_candidate, fan_corner, fan_u = fan_candidate[keeps], fan_corner[keeps], fan_u[keeps]
+    normal_before = normals[fan_corner // 3]
+    normal_after = cross(following[fan_corner] - co[fan_u], opposite[fan_corner])
+    alignment = np.einsum("ij,ij->i", normal_before, normal_after)
+    lengths = np.sqrt(np.einsum("ij,ij->i", normal_before, normal_before) * np.einsum("ij,ij->i", normal_after, normal_after))
+    flips = alignment <= MIN_NORMAL_COSINE * np.maximum(lengths, 1e-30)
+    valid &= np.bincount(fan_candidate[flips], minlength=len(v)) == 0
+
+    # ✅ Cheapest valid target per removable vertex
+    v, u, loop_u, cost = v[valid], u[valid], loop_u[valid], cost[valid]
+    order = np.lexsort((cost, v))
+    best = order[np.concatenate([[True], np.diff(v[order]) != 0])] if len(order) else order
+    v, u, loop_u, cost = v[best], u[best], loop_u[best], cost[best]
+    if len(v) == 0:
+        return triangles, 0
+
+    # ✅ Collapses compete in random order (a seeded shuffle, so results are reproducible).
+    # A collapse wins when it ranks first in every vertex of its region (v and its 1-ring); winners block the
+    # collapses whose regions they touch, and the rest compete again, so applied collapses never share triangles
+    rank = np.random.default_rng(len(triangles)).permutation(len(v))
+    pair_candidate, pair_neighbour = csr_rows(neighbour_start, neighbours, v)
+    region_vertex = np.concatenate([v, pair_neighbour])
+    region_candidate = np.concatenate([np.arange(len(v)), pair_candidate])
+    open_candidate = np.ones(len(v), dtype=bool)
+    winner = np.zeros(len(v), dtype=bool)
+    for _ in range(SELECTION_PASSES):
+        competing = open_candidate[region_candidate]
+        lowest = np.full(vertex_count, len(v), dtype=np.int64)
+        np.minimum.at(lowest, region_vertex[competing], rank[region_candidate[competing]])
+        beaten = np.bincount(region_candidate[lowest[region_vertex] != rank[region_candidate]], minlength=len(v)) > 0
+        wins = open_candidate & ~beaten
+        if not wins.any():
+            break
+        winner |= wins
+        touched = np.zeros(vertex_count, dtype=bool)
+        touched[region_vertex[wins[region_candidate]]] = True
+        open_candidate &= np.bincount(region_candidate[touched[region_vertex]], minlength=len(v)) == 0
+
+    # ✅ Apply the cheapest independent collapses within the budget
+    chosen = np.flatnonzero(winner)
+    chosen = chosen[np.argsort(cost[chosen], kind="stable")][:collapse_budget]
+    moved = np.zeros(vertex_count, dtype=bool)
+    moved[v[chosen]] = True
+    loop_target = np.zeros(vertex_count, dtype=np.int64)
+    loop_target[v[chosen]] = loop_u[chosen]
+    triangles = np.where(moved[triangle_vertices], loop_target[triangle_vertices], triangles)
+    quadrics[u[chosen]] += quadrics[v[chosen]]
+
+    triangle_vertices = loop_vertex[triangles]
+    degenerate = (
+        (triangle_vertices[:, 0] == triangle_vertices[:, 1])
+        | (triangle_vertices[:, 1] == triangle_vertices[:, 2])
+        | (triangle_vertices[:, 0] == triangle_vertices[:, 2])
+    )
+    return triangles[~degenerate], len(chosen)
+
+
+"""
+Builds triangle-only mesh arrays from surviving triangles (loop indices into the source arrays).
+"""
+def triangles_to_arrays(arrays, triangles, triangle_polygon):
+    used_vertices, loop_vertex = np.unique(arrays["loop_vertex"][triangles.ravel()], return_inverse=True)
+    loop_vertex = loop_vertex.reshape(-1, 3)
+    edge_pairs = np.sort(loop_vertex[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2), axis=1)
+    return {
+        "co": arrays["co"][used_vertices].astype(np.float32),
+        "edges": np.unique(edge_pairs, axis=0).astype(np.int32),
+        "loop_vertex": loop_vertex.ravel().astype(np.int32),
+        "loop_start": np.arange(0, 3 * len(triangles), 3, dtype=np.int32),
+        "loop_total": np.full(len(triangles), 3, dtype=np.int32),
+        "material_index": arrays["material_index"][triangle_polygon].astype(np.int32),
+        "use_smooth": arrays["use_smooth"][triangle_polygon].astype(bool),
+        "uv": {name: np.asarray(uvs)[triangles.ravel()].astype(np.float32) for name, uvs in arrays["uv"].items()},
+        "uv_active": arrays.get("uv_active"),
+        "uv_render": arrays.get("uv_render"),
+    }
+
+
+def triangle_count(arrays):
+    return int(np.sum(np.asarray(arrays["loop_total"]) - 2))
+
+
+"""
+Decimates mesh arrays to a triangle budget with quadric error metrics. Surviving vertices keep their
+original positions (half-edge collapses), and UVs are carried per corner.
+:param arrays: Mesh arrays of one part.
+:param target_triangles: The triangle budget; meshes already within it are returned unchanged.
+:return: Triangle-only mesh arrays (custom normals are dropped), or the input arrays when no collapse was needed.
+"""
+def decimate_arrays(arrays, target_triangles):
+    if triangle_count(arrays) <= target_triangles:
+        return arrays
+
+    co = np.asarray(arrays["co"], dtype=np.float64)
+    loop_vertex = np.asarray(arrays["loop_vertex"], dtype=np.int64)
+    triangles, triangle_polygon = triangulate(np.asarray(arrays["loop_start"]), np.asarray(arrays["loop_total"]))
+    polygon_of_loop = np.empty(len(loop_vertex), dtype=np.int64)
+    polygon_of_loop[triangles.ravel()] = np.repeat(triangle_polygon, 3)
+
+    locked = locked_vertices(
+        len(co), triangles, loop_vertex, [np.asarray(uvs) for uvs in arrays["uv"].values()],
+        np.asarray(arrays["material_index"])[triangle_polygon], np.asarray(arrays["use_smooth"])[triangle_polygon],
+    )
+    quadrics = vertex_quadrics(co, loop_vertex[triangles])
+
+    for _ in range(MAX_ROUNDS):
+        excess = len(triangles) - target_triangles
+        if excess <= 0:
+            break
+        triangles, collapsed = collapse_round(co, quadrics, triangles, loop_vertex, locked, (excess + 1) // 2)
+        if collapsed == 0:
+            break
+
+    # ✅ A triangle keeps the polygon attributes of its first corner's source polygon
+    return triangles_to_arrays(arrays, triangles, polygon_of_loop[triangles[:, 0]])
+
+
+"""
+Splits a module's triangle budget across its parts in proportion to their triangle counts.
+:param counts: Triangle count per part.
+:param budget: The module's triangle budget (None keeps every part whole).
+:return: A budget per part.
+"""
+def part_budgets(counts, budget):
+    counts = np.asarray(counts, dtype=np.int64)
+    if budget is None or counts.sum() <= budget:
+        return counts.tolist()
+    return np.maximum(1, np.floor(counts * (budget / counts.sum()))).astype(np.int64).tolist()
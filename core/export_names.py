@@ -0,0 +1,60 @@
+import os
+
+
+"""
+Strips Blender's duplicate suffix (".001") from an object name.
+"""
+def clean_export_name(name):
+    if "." in name:
+        return name.rsplit(".", 1)[0]
+    return name
+
+
+"""
+Legs are baked with the module but never exported.
+"""
+def is_exported(name):
+    return not clean_export_name(name).endswith("_LEG")
+
+
+"""
+Returns the output path of an exported file: <directory>/sofa_<format>/<name>.<extension>.
+"""
+def export_path(directory, format, name, extension=None):
+    return os.path.join(directory, "sofa_" + format + "/" + name + "." + (extension or format))
+
+
+"""
+Builds the <module>.json index written next to a per-module export.
+:param module: The module name.
+:param file_path: The exported file.
+:param names: Object names of the exported parts.
+:return: {"module", "file", "parts"}; parts maps each clean part name to the node names exported under it.
+"""
+def module_index(module, file_path, names):
+    # ✅ Parts sharing a clean name (X_SEAT, X_SEAT.001) are all listed
+    parts = {}
+    for name in names:
+        parts.setdefault(clean_export_name(name), []).append(name)
+    return {
+        "module": module,
+        "file": os.path.basename(file_path),
+        "parts": parts,
+    }
+
+
+"""
+Plans an export without touching Blender.
+:param names: Object names in the collection.
+:param directory: The project directory.
+:param formats: Output formats ("fbx", "glb").
+:param mode: "separate" (one file per part) or "module" (one file per module plus a JSON index).
+:param module: The module name, required for the "module" mode.
+:return: A list of (exported names, format, file path, index path or None) jobs, the formats of one part
+         (or module) next to each other.
+"""
+def plan_exports(names, directory, formats, mode="separate", module=None):
+    names = [name for name in names if is_exported(name)]
+    if mode == "module":
+        return [(names, fmt, export_path(directory, fmt, module), export_path(directory, fmt, module, "json")) for fmt in formats]
+    return [([name], fmt, export_path(directory, fmt, clean_export_name(name)), None) for name in names for fmt in formats]
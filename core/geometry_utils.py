@@ -0,0 +1,112 @@
+import numpy as np
+
+
+"""
+Applies a 4x4 affine matrix to an array of points.
+:param points: float array of shape (n, 3).
+:param matrix: 4x4 matrix (row-major, as returned by np.array(obj.matrix_world)).
+:param out: (Optional) Preallocated (n, 3) array to write into.
+:return: The transformed (n, 3) points.
+"""
+def transform_points(points, matrix, out=None):
+    matrix = np.asarray(matrix, dtype=np.float64)
+    if out is None:
+        out = np.empty((len(points), 3), dtype=np.float64)
+    np.matmul(points, matrix[:3, :3].T, out=out)
+    out += matrix[:3, 3]
+    return out
+
+
+"""
+Computes centroid, axis-aligned bounding box and vertex count for consecutive point segments in one pass.
+:param points: float array of shape (n, 3), all segments concatenated.
+:param counts: Number of points in each segment, in order.
+:return: A list with one {"center", "min", "max", "vertex_count"} dict per segment (None for empty segments).
+"""
+def segment_bounds(points, counts):
+    counts = np.asarray(counts, dtype=np.int64)
+    non_empty = counts > 0
+    starts = (np.cumsum(counts) - counts)[non_empty]
+
+    sums = np.add.reduceat(points, starts, axis=0) if len(starts) else np.empty((0, 3))
+    minimums = np.minimum.reduceat(points, starts, axis=0) if len(starts) else np.empty((0, 3))
+    maximums = np.maximum.reduceat(points, starts, axis=0) if len(starts) else np.empty((0, 3))
+    centers = sums / counts[non_empty, None]
+
+    bounds = [None] * len(counts)
+    for segment, index in enumerate(np.flatnonzero(non_empty)):
+        bounds[index] = {
+            "center": centers[segment],
+            "min": minimums[segment],
+            "max": maximums[segment],
+            "vertex_count": int(counts[index]),
+        }
+    return bounds
+
+
+"""
+Sums polygon areas with a triangle fan per polygon, for 3D positions or 2D UVs given per loop.
+:param loop_points: float array of shape (L, 2) or (L, 3) with one point per loop.
+:param loop_start: First loop index per polygon.
+:param loop_total: Loop count per polygon.
+:return: The total area.
+"""
+def fan_area(loop_points, loop_start, loop_total):
+    loop_points = np.asarray(loop_points, dtype=np.float64)
+    if loop_points.shape[1] == 2:
+        loop_points = np.concatenate([loop_points, np.zeros((len(loop_points), 1))], axis=1)
+
+    # ✅ Triangles (first, i, i + 1) for every loop i that is neither the first nor the last of its polygon
+    loop_polygon = np.repeat(np.arange(len(loop_start)), loop_total)
+    loop_in_polygon = np.arange(len(loop_points)) - np.repeat(loop_start, loop_total)
+    middle = (loop_in_polygon > 0) & (loop_in_polygon < np.repeat(loop_total, loop_total) - 1)
+    middle_loops = np.flatnonzero(middle)
+
+    first = loop_points[loop_start[loop_polygon[middle_loops]]]
+    edges_a = loop_points[middle_loops] - first
+    edges_b = loop_points[middle_loops + 1] - first
+    return 0.5 * np.linalg.norm(np.cross(edges_a, edges_b), axis=1).sum()
+
+
+"""
+Builds a 4x4 rotation matrix from Euler angles in Blender's default XYZ order (X applied first).
+:param rotation: (x, y, z) angles in radians.
+:return: The 4x4 float64 matrix.
+"""
+def euler_matrix(rotation):
+    x, y, z = rotation
+    cx, sx, cy, sy, cz, sz = np.cos(x), np.sin(x), np.cos(y), np.sin(y), np.cos(z), np.sin(z)
+    matrix = np.eye(4)
+    matrix[:3, :3] = [
+        [cy * cz, sx * sy * cz - cx * sz, cx * sy * cz + sx * sz],
+        [cy * sz, sx * sy * sz + cx * cz, cx * sy * sz - sx * cz],
+        [-sy, sx * cy, cx * cy],
+    ]
+    return matrix
+
+
+"""
+Composes location, Euler rotation and scale into one 4x4 matrix (scale, then rotation, then translation),
+matching how Blender builds matrix_world for an object without a parent.
+:return: The 4x4 float64 matrix.
+"""
+def compose_matrix(location, rotation, scale):
+    matrix = euler_matrix(rotation)
+    matrix[:3, :3] *= np.asarray(scale, dtype=np.float64)
+    matrix[:3, 3] = location
+    return matrix
+
+
+"""
+Adds a config transform ({"position", "rotation", "scale"} with x/y/z deltas) to an object's location, rotation and scale.
+:return: (location, rotation, scale) as float64 arrays of shape (3,).
+"""
+def compose_transform(location, rotation, scale, transform):
+    def delta(key):
+        return np.array([transform[key]["x"], transform[key]["y"], transform[key]["z"]], dtype=np.float64)
+
+    return (
+        np.asarray(location, dtype=np.float64) + delta("position"),
+        np.asarray(rotation, dtype=np.float64) + delta("rotation"),
+        np.asarray(scale, dtype=np.float64) + delta("scale"),
+    )
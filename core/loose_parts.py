@@ -0,0 +1,80 @@
+import numpy as np
+
+
+PART_KEYS = {
+    "LEG": "legs",
+    "SEAT": "seat",
+    "BACKREST": "backrest",
+    "HEADREST": "headrest",
+}
+
+
+"""
+Labels the connected components (loose parts) of a mesh with a vectorized union-find:
+every round hooks the larger root of each edge onto the smaller one, then compresses paths by pointer jumping.
+:param vertex_count: Number of vertices.
+:param edges: int array of shape (E, 2) with vertex indices.
+:return: (labels, part_count); labels is an int32 array with one part label (0..part_count-1) per vertex,
+         numbered in order of each part's lowest vertex index.
+"""
+def label_loose_parts(vertex_count, edges):
+    parent = np.arange(vertex_count, dtype=np.int64)
+    edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+    u, v = edges[:, 0], edges[:, 1]
+
+    while True:
+        root_u, root_v = parent[u], parent[v]
+        differs = root_u != root_v
+        if not differs.any():
+            break
+        low = np.minimum(root_u[differs], root_v[differs])
+        high = np.maximum(root_u[differs], root_v[differs])
+        np.minimum.at(parent, high, low)
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                break
+            parent = grandparent
+
+    roots, labels = np.unique(parent, return_inverse=True)
+    return labels.astype(np.int32), len(roots)
+
+
+"""
+Classifies a part by the height of its centroid, using the same bands as categorize_meshes_in_collection.
+:param z: Centroid height in meters.
+:return: "LEG", "SEAT", "BACKREST" or "HEADREST".
+"""
+def classify_height(z):
+    if (z < 0.01):
+        return "LEG"
+    elif (z > 0.1 and z < 0.4):
+        return "SEAT"
+    elif (z > 0.4 and z < 0.6):
+        return "BACKREST"
+    else:
+        return "HEADREST"
+
+
+"""
+Vectorized classify_height for an array of centroid heights.
+:return: An array of category names.
+"""
+def classify_heights(z):
+    z = np.asarray(z)
+    return np.select(
+        [z < 0.01, (z > 0.1) & (z < 0.4), (z > 0.4) & (z < 0.6)],
+        ["LEG", "SEAT", "BACKREST"],
+        "HEADREST",
+    )
+
+
+"""
+Splits a polygon mask per part: the part of a polygon is the part of its first vertex.
+:param labels: Part label per vertex (see label_loose_parts).
+:param loop_vertex: Vertex index per loop.
+:param loop_start: First loop index per polygon.
+:return: Part label per polygon.
+"""
+def polygon_labels(labels, loop_vertex, loop_start):
+    return labels[loop_vertex[loop_start]]
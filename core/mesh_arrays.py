@@ -0,0 +1,268 @@
+import hashlib
+import json
+import os
+import numpy as np
+
+
+# ✅ Mesh arrays are plain dicts of NumPy arrays, read from and written to bpy meshes by mesh_utils:
+# co (V, 3) float32, edges (E, 2) int32, loop_vertex (L,) int32,
+# loop_start / loop_total / material_index (P,) int32, use_smooth (P,) bool,
+# uv {layer name: (L, 2) float32}, uv_active / uv_render: layer names (or None),
+# optional loop_normal (L, 3) float32 custom split normals, use_seam / use_edge_sharp (E,) bool edge flags,
+# attributes {name: {"data_type", "domain", "values": (N,) or (N, width) array}} for generic mesh attributes
+
+EDGE_FLAGS = ["use_seam", "use_edge_sharp"]
+MESH_ARRAY_FIELDS = ["co", "edges", "loop_vertex", "loop_start", "loop_total", "material_index", "use_smooth", "loop_normal"] + EDGE_FLAGS
+# ✅ Attribute domain → the element kind holding one value each (the kinds of the concat_mesh_arrays part table)
+ATTRIBUTE_DOMAINS = {"POINT": "vertex", "EDGE": "edge", "CORNER": "loop", "FACE": "polygon"}
+
+
+"""
+Cuts a sub-mesh out of mesh arrays, keeping the selected polygons and vertices and remapping indices.
+:param arrays: Mesh arrays of the source mesh.
+:param poly_mask: Boolean mask over polygons to keep.
+:param vertex_mask: Boolean mask over vertices to keep (must contain every vertex of the kept polygons).
+:return: New mesh arrays; custom normals, edge flags and attributes are cut with the same masks.
+"""
+def subset_mesh_arrays(arrays, poly_mask, vertex_mask):
+    vertex_remap = np.cumsum(vertex_mask, dtype=np.int32) - 1
+    loop_mask = np.repeat(poly_mask, arrays["loop_total"])
+    edge_mask = vertex_mask[arrays["edges"][:, 0]] & vertex_mask[arrays["edges"][:, 1]]
+
+    masks = {"vertex": vertex_mask, "edge": edge_mask, "loop": loop_mask, "polygon": poly_mask}
+
+    loop_total = arrays["loop_total"][poly_mask]
+    subset = {
+        "co": arrays["co"][vertex_mask],
+        "edges": vertex_remap[arrays["edges"][edge_mask]],
+        "loop_vertex": vertex_remap[arrays["loop_vertex"][loop_mask]],
+        "loop_start": (np.cumsum(loop_total) - loop_total).astype(np.int32),
+        "loop_total": loop_total,
+        "material_index": arrays["material_index"][poly_mask],
+        "use_smooth": arrays["use_smooth"][poly_mask],
+        "uv": {name: uvs[loop_mask] for name, uvs in arrays["uv"].items()},
+        "uv_active": arrays.get("uv_active"),
+        "uv_render": arrays.get("uv_render"),
+        "attributes": {
+            name: dict(attribute, values=attribute["values"][masks[ATTRIBUTE_DOMAINS[attribute["domain"]]]])
+            for name, attribute in arrays.get("attributes", {}).items()
+        },
+    }
+    if arrays.get("loop_normal") is not None:
+        subset["loop_normal"] = arrays["loop_normal"][loop_mask]
+    for flag in EDGE_FLAGS:
+        if arrays.get(flag) is not None:
+            subset[flag] = arrays[flag][edge_mask]
+    return subset
+
+
+"""
+Hashes the topology and positions of mesh arrays, plus any extra parameters, into a stable cache key.
+:param arrays: Mesh arrays.
+:param extra: (Optional) JSON-like parameters that also affect the cached result.
+"""
+def mesh_arrays_hash(arrays, extra=None):
+    digest = hashlib.sha256()
+    for name in ("co", "loop_vertex", "loop_start", "loop_total"):
+        digest.update(np.ascontiguousarray(arrays[name]).tobytes())
+    digest.update(repr(extra).encode("utf-8"))
+    return digest.hexdigest()
+
+
+"""
+Saves mesh arrays as one .npy file per array plus a small JSON of UV layer and attribute names, so they can be memory-mapped back.
+:param directory: The target directory (created when missing).
+:param arrays: Mesh arrays.
+"""
+def save_mesh_arrays(directory, arrays):
+    os.makedirs(directory, exist_ok=True)
+    for field in MESH_ARRAY_FIELDS:
+        if arrays.get(field) is not None:
+            np.save(os.path.join(directory, field + ".npy"), np.ascontiguousarray(arrays[field]))
+    uv_names = list(arrays["uv"])
+    for index, name in enumerate(uv_names):
+        np.save(os.path.join(directory, f"uv{index}.npy"), np.ascontiguousarray(arrays["uv"][name]))
+    attributes = []
+    for index, (name, attribute) in enumerate(arrays.get("attributes", {}).items()):
+        np.save(os.path.join(directory, f"attribute{index}.npy"), np.ascontiguousarray(attribute["values"]))
+        attributes.append({"name": name, "data_type": attribute["data_type"], "domain": attribute["domain"]})
+    with open(os.path.join(directory, "mesh.json"), "w") as meta_file:
+        json.dump({"uv": uv_names, "uv_active": arrays.get("uv_active"), "uv_render": arrays.get("uv_render"), "attributes": attributes}, meta_file)
+
+
+"""
+Loads mesh arrays written by save_mesh_arrays.
+:param directory: The directory the arrays were saved to.
+:param mmap_mode: (Optional) np.load memory-map mode (default: "r", read-only pages loaded on demand; None reads into memory).
+:return: Mesh arrays.
+"""
+def load_mesh_arrays(directory, mmap_mode="r"):
+    with open(os.path.join(directory, "mesh.json")) as meta_file:
+        meta = json.load(meta_file)
+
+    def load(name):
+        return np.load(os.path.join(directory, name + ".npy"), mmap_mode=mmap_mode)
+
+    arrays = {field: load(field) for field in MESH_ARRAY_FIELDS if os.path.exists(os.path.join(directory, field + ".npy"))}
+    arrays["uv"] = {name: load(f"uv{index}") for index, name in enumerate(meta["uv"])}
+    arrays["uv_active"] = meta["uv_active"]
+    arrays["uv_render"] = meta["uv_render"]
+    arrays["attributes"] = {
+        entry["name"]: {"data_type": entry["data_type"], "domain": entry["domain"], "values": load(f"attribute{index}")}
+        for index, entry in enumerate(meta.get("attributes", []))
+    }
+    return arrays
+
+
+"""
+Concatenates the mesh arrays of several parts into one mesh, offsetting vertex and loop indices.
+UV layers and attributes are matched by name; a part without one gets zeros in it (attributes of one name
+must share data type and domain, see conflicting_attributes), and a part without edge flags gets them unset.
+Custom normals are kept only when every part has them, so callers fill the other parts with their computed corner normals.
+:param parts: A list of mesh arrays, all in the same space.
+:return: (merged arrays, part table); the table holds N + 1 start offsets per element type
+         ("vertex", "edge", "loop", "polygon"), so part i owns [table[kind][i], table[kind][i + 1]).
+"""
+def concat_mesh_arrays(parts):
+    def offsets(key):
+        return np.concatenate([[0], np.cumsum([len(part[key]) for part in parts])]).astype(np.int64)
+
+    table = {"vertex": offsets("co"), "edge": offsets("edges"), "loop": offsets("loop_vertex"), "polygon": offsets("loop_start")}
+
+    def concat(key, offset_kind=None, dtype=None):
+        arrays = [part[key] + (table[offset_kind][index] if offset_kind else 0) for index, part in enumerate(parts)]
+        return np.concatenate(arrays).astype(dtype or parts[0][key].dtype)
+
+    uv_names = list(dict.fromkeys(name for part in parts for name in part["uv"]))
+    merged = {
+        "co": concat("co", dtype=np.float32),
+        "edges": concat("edges", "vertex", np.int32),
+        "loop_vertex": concat("loop_vertex", "vertex", np.int32),
+        "loop_start": concat("loop_start", "loop", np.int32),
+        "loop_total": concat("loop_total", dtype=np.int32),
+        "material_index": concat("material_index", dtype=np.int32),
+        "use_smooth": concat("use_smooth", dtype=bool),
+        "uv": {
+            name: np.concatenate([
+                part["uv"].get(name, np.zeros((len(part["loop_vertex"]), 2), dtype=np.float32)) for part in parts
+            ]).astype(np.float32)
+            for name in uv_names
+        },
+        "uv_active": parts[0].get("uv_active"),
+        "uv_render": parts[0].get("uv_render"),
+    }
+    if all(part.get("loop_normal") is not None for part in parts):
+        merged["loop_normal"] = concat("loop_normal", dtype=np.float32)
+    for flag in EDGE_FLAGS:
+        if any(part.get(flag) is not None for part in parts):
+            merged[flag] = np.concatenate([
+                part[flag] if part.get(flag) is not None else np.zeros(len(part["edges"]), dtype=bool) for part in parts
+            ]).astype(bool)
+
+    attributes = {}
+    for part in parts:
+        for name, attribute in part.get("attributes", {}).items():
+            attributes.setdefault(name, attribute)
+    merged["attributes"] = {}
+    for name, first in attributes.items():
+        offset = table[ATTRIBUTE_DOMAINS[first["domain"]]]
+        values = first["values"]
+        merged["attributes"][name] = {
+            "data_type": first["data_type"],
+            "domain": first["domain"],
+            "values": np.concatenate([
+                part["attributes"][name]["values"] if name in part.get("attributes", {})
+                else np.zeros((offset[index + 1] - offset[index],) + values.shape[1:], dtype=values.dtype)
+                for index, part in enumerate(parts)
+            ]).astype(values.dtype),
+        }
+    return merged, {kind: offset.tolist() for kind, offset in table.items()}
+
+
+"""
+Finds attributes whose data type or domain differs between parts; such parts cannot be concatenated.
+:return: The sorted conflicting attribute names.
+"""
+def conflicting_attributes(parts):
+    layouts = {}
+    conflicts = set()
+    for part in parts:
+        for name, attribute in part.get("attributes", {}).items():
+            layout = (attribute["data_type"], attribute["domain"])
+            if layouts.setdefault(name, layout) != layout:
+                conflicts.add(name)
+    return sorted(conflicts)
+
+
+"""
+Checks that a part table from concat_mesh_arrays still describes the mesh arrays, i.e. that the topology
+was not changed since the merge.
+"""
+def part_table_matches(arrays, table):
+    counts = {"vertex": len(arrays["co"]), "edge": len(arrays["edges"]), "loop": len(arrays["loop_vertex"]), "polygon": len(arrays["loop_start"])}
+    return all(table[kind][-1] == count for kind, count in counts.items())
+
+
+"""
+Cuts part `index` back out of merged mesh arrays with plain slices, using the table from concat_mesh_arrays.
+:return: The part's mesh arrays, with indices rebased to the part.
+"""
+def slice_mesh_arrays(arrays, table, index):
+    def span(kind):
+        return slice(table[kind][index], table[kind][index + 1])
+
+    vertex_start, loop_start = table["vertex"][index], table["loop"][index]
+    part = {
+        "co": arrays["co"][span("vertex")],
+        "edges": arrays["edges"][span("edge")] - vertex_start,
+        "loop_vertex": arrays["loop_vertex"][span("loop")] - vertex_start,
+        "loop_start": arrays["loop_start"][span("polygon")] - loop_start,
+        "loop_total": arrays["loop_total"][span("polygon")],
+        "material_index": arrays["material_index"][span("polygon")],
+        "use_smooth": arrays["use_smooth"][span("polygon")],
+        "uv": {name: uvs[span("loop")] for name, uvs in arrays["uv"].items()},
+        "uv_active": arrays.get("uv_active"),
+        "uv_render": arrays.get("uv_render"),
+    }
+    if arrays.get("loop_normal") is not None:
+        part["loop_normal"] = arrays["loop_normal"][span("loop")]
+    for flag in EDGE_FLAGS:
+        if arrays.get(flag) is not None:
+            part[flag] = arrays[flag][span("edge")]
+    part["attributes"] = {
+        name: dict(attribute, values=attribute["values"][span(ATTRIBUTE_DOMAINS[attribute["domain"]])])
+        for name, attribute in arrays.get("attributes", {}).items()
+    }
+    return part
+
+
+"""
+Computes the edge of every loop: the edge from the loop's vertex to the next vertex of its polygon.
+Polygon edges missing from the edge list are appended, so the result is always complete.
+:param edges: int array of shape (E, 2) with vertex indices.
+:param loop_vertex: Vertex index per loop.
+:param loop_start: First loop index per polygon.
+:param loop_total: Loop count per polygon.
+:return: (edges, loop_edge); the (possibly extended) edge list and one edge index per loop.
+"""
+def loop_edges(edges, loop_vertex, loop_start, loop_total):
+    edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+    loop_vertex = np.asarray(loop_vertex, dtype=np.int64)
+    loop_total = np.asarray(loop_total, dtype=np.int64)
+    first = np.repeat(np.asarray(loop_start, dtype=np.int64), loop_total)
+    offset = np.arange(len(first)) - np.repeat(np.cumsum(loop_total) - loop_total, loop_total)
+    loops = first + offset
+    following = first + (offset + 1) % np.repeat(loop_total, loop_total)
+
+    vertex_count = int(max(edges.max(initial=-1), loop_vertex.max(initial=-1))) + 1
+    keys = np.minimum(loop_vertex[loops], loop_vertex[following]) * vertex_count + np.maximum(loop_vertex[loops], loop_vertex[following])
+    known = np.minimum(edges[:, 0], edges[:, 1]) * vertex_count + np.maximum(edges[:, 0], edges[:, 1])
+    missing = np.setdiff1d(keys, known)
+    if len(missing):
+        edges = np.concatenate([edges, np.stack([missing // vertex_count, missing % vertex_count], axis=1)])
+        known = np.concatenate([known, missing])
+
+    order = np.argsort(known, kind="stable")
+    loop_edge = np.empty(len(loop_vertex), dtype=np.int32)
+    loop_edge[loops] = order[np.searchsorted(known[order], keys)]
+    return edges.astype(np.int32), loop_edge
@@ -0,0 +1,130 @@
+import numpy as np
+
+
+LUMINANCE_WEIGHTS = np.array([0.2126, 0.7152, 0.0722], dtype=np.float32)
+
+
+"""
+Computes Rec. 709 luminance for a flat or shaped RGBA float buffer.
+:param pixels: A float array whose size is a multiple of 4 ([R, G, B, A, R, G, B, A, ...]).
+:return: A float32 array with one luminance value per pixel.
+"""
+def luminance(pixels):
+    rgba = np.asarray(pixels, dtype=np.float32).reshape(-1, 4)
+    return rgba[:, :3] @ LUMINANCE_WEIGHTS
+
+
+"""
+Packs the luminance of up to three RGBA buffers into the R, G and B channels of one RGBA buffer.
+Pure NumPy, so it can be tested and benchmarked without Blender.
+:param r_pixels: Flat RGBA float buffer whose luminance goes into R.
+:param g_pixels: Flat RGBA float buffer whose luminance goes into G.
+:param b_pixels: (Optional) Flat RGBA float buffer whose luminance goes into B (default: B is 0).
+:param out: (Optional) Preallocated float32 buffer of the same size to write into.
+:return: The packed flat RGBA float32 buffer (alpha is 1).
+"""
+def pack_luminance_channels(r_pixels, g_pixels, b_pixels=None, out=None):
+    size = np.size(r_pixels)
+    if out is None:
+        out = np.empty(size, dtype=np.float32)
+    rgba = out.reshape(-1, 4)
+
+    for channel, pixels in enumerate((r_pixels, g_pixels, b_pixels)):
+        if pixels is None:
+            rgba[:, channel] = 0.0
+        else:
+            source = np.asarray(pixels, dtype=np.float32).reshape(-1, 4)
+            np.matmul(source[:, :3], LUMINANCE_WEIGHTS, out=rgba[:, channel])
+    rgba[:, 3] = 1.0
+    return out
+
+
+DEFAULT_MEMORY_BUDGET = 256 * 1024 * 1024
+
+
+"""
+Computes how many image rows fit in one band under a memory budget.
+Every source band, the output band and one working copy are counted as float32 RGBA rows.
+:param width: Image width in pixels.
+:param source_count: Number of source images read per band.
+:param memory_budget: Peak bytes allowed for band buffers (default: DEFAULT_MEMORY_BUDGET).
+:return: Rows per band (at least 1).
+"""
+def rows_per_band(width, source_count=1, memory_budget=DEFAULT_MEMORY_BUDGET):
+    row_bytes = width * 4 * np.dtype(np.float32).itemsize
+    buffers = source_count + 2
+    return max(1, memory_budget // (row_bytes * buffers))
+
+
+"""
+Yields (first_row, end_row) ranges that cover an image in fixed-size bands.
+:param height: Image height in pixels.
+:param band_rows: Rows per band.
+"""
+def iter_bands(height, band_rows):
+    for first_row in range(0, height, band_rows):
+        yield first_row, min(first_row + band_rows, height)
+
+
+"""
+Band operation: replaces RGB with the luminance of the first band, keeps alpha.
+"""
+def grayscale_op(bands):
+    band = bands[0]
+    band[:, :3] = luminance(band)[:, None]
+    return band
+
+
+"""
+Band operation factory: writes the luminance of the first band into one channel and clears the other two.
+:param target_channel: "R", "G" or "B".
+"""
+def channel_op(target_channel="R"):
+    target_index = {"R": 0, "G": 1, "B": 2}[target_channel]
+
+    def op(bands):
+        band = bands[0]
+        gray = luminance(band)
+        band[:, :3] = 0.0
+        band[:, target_index] = gray
+        return band
+
+    return op
+
+
+"""
+Band operation: packs the luminance of up to three source bands into R, G and B.
+"""
+def pack_op(bands):
+    padded = list(bands) + [None] * (3 - len(bands))
+    return pack_luminance_channels(*padded[:3]).reshape(-1, 4)
+
+
+"""
+Chains band operations; every operation after the first receives the previous result as its only band.
+:param ops: Band operations, each taking a list of (pixels, 4) float32 arrays and returning one.
+"""
+def chain_ops(*ops):
+    def op(bands):
+        for band_op in ops:
+            bands = [band_op(bands)]
+        return bands[0]
+
+    return op
+
+
+"""
+Runs a band operation over whole images in one pass with bounded memory.
+:param read_band: Callable (source_index, first_row, end_row) -> flat float32 RGBA buffer.
+:param write_band: Callable (first_row, end_row, flat float32 RGBA buffer) -> None.
+:param width: Image width in pixels.
+:param height: Image height in pixels.
+:param op: Band operation (see chain_ops).
+:param source_count: Number of source images passed to the operation (default: 1).
+:param memory_budget: Peak bytes allowed for band buffers (default: DEFAULT_MEMORY_BUDGET).
+"""
+def stream_bands(read_band, write_band, width, height, op, source_count=1, memory_budget=DEFAULT_MEMORY_BUDGET):
+    band_rows = rows_per_band(width, source_count, memory_budget)
+    for first_row, end_row in iter_bands(height, band_rows):
+        bands = [read_band(index, first_row, end_row).reshape(-1, 4) for index in range(source_count)]
+        write_band(first_row, end_row, op(bands).reshape(-1))
@@ -0,0 +1,54 @@
+import numpy as np
+
+
+"""
+Computes where a tile of a fixed-grid atlas sits in UV space.
+:param tile_index: Tile index, counted row by row from the bottom-left tile.
+:param atlas_size: Atlas width/height in pixels.
+:param tile_size: Tile width/height in pixels.
+:return: (col, row, uv_tile_scale, offset_u, offset_v)
+"""
+def tile_transform(tile_index, atlas_size=4096, tile_size=512):
+    tiles_per_row = atlas_size // tile_size
+    uv_tile_scale = tile_size / atlas_size
+
+    row = tile_index // tiles_per_row
+    col = tile_index % tiles_per_row
+    offset_u = col * uv_tile_scale
+    offset_v = row * uv_tile_scale
+    return col, row, uv_tile_scale, offset_u, offset_v
+
+
+"""
+Applies per-object affine UV transforms to a concatenated (loops, 2) UV array in one vectorized step.
+:param uvs: float32 array of shape (loops, 2), modified in place.
+:param loop_counts: Number of loops that belong to each object, in order.
+:param scales: Uniform UV scale of each object.
+:param offsets: (offset_u, offset_v) of each object.
+:return: The transformed uvs array.
+"""
+def transform_uvs(uvs, loop_counts, scales, offsets):
+    loop_scales = np.repeat(np.asarray(scales, dtype=np.float32), loop_counts)
+    loop_offsets = np.repeat(np.asarray(offsets, dtype=np.float32).reshape(-1, 2), loop_counts, axis=0)
+    uvs *= loop_scales[:, None]
+    uvs += loop_offsets
+    return uvs
+
+
+"""
+Converts a fixed-grid tile index into an atlas rect.
+:return: {"atlas": 0, "x": left pixel, "y": bottom pixel, "size": tile_size}
+"""
+def grid_rect(tile_index, atlas_size=4096, tile_size=512):
+    col, row, _, _, _ = tile_transform(tile_index, atlas_size, tile_size)
+    return {"atlas": 0, "x": col * tile_size, "y": row * tile_size, "size": tile_size}
+
+
+"""
+Computes the UV transform that maps a module's 0..1 UVs into its atlas rect.
+:param rect: {"x", "y", "size"} in pixels, origin at the bottom-left of the atlas.
+:param atlas_size: Atlas width/height in pixels.
+:return: (uv_scale, offset_u, offset_v)
+"""
+def rect_transform(rect, atlas_size):
+    return rect["size"] / atlas_size, rect["x"] / atlas_size, rect["y"] / atlas_size
@@ -0,0 +1,132 @@
+"""
+LOD building: parts are decimated with NumPy (core.decimate) on a thread pool and rebuilt with the data API.
+LODs drop custom normals: the decimated meshes are shaded with Blender's computed normals (from their smooth flags).
+"""
+
+# ✅ Standard Python Modules
+import hashlib
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+
+# ✅ Blender Modules
+import bpy  # type: ignore
+
+# ✅ Custom Imports
+from mesh_utils import build_mesh
+from mesh_utils import create_collection
+from mesh_utils import read_mesh_arrays
+from core.decimate import decimate_arrays
+from core.decimate import part_budgets
+from core.decimate import triangle_count
+from core.mesh_arrays import load_mesh_arrays
+from core.mesh_arrays import mesh_arrays_hash
+from core.mesh_arrays import save_mesh_arrays
+from profiling import profiled
+
+DECIMATE_CACHE_DIR = "sofa_decimate_cache"
+DECIMATE_CACHE_VERSION = 1
+DECIMATE_WORKERS = 0  # 0 = one worker per core
+
+
+"""
+Builds the cache key of one decimated part: its geometry, UVs and polygon attributes (they decide which
+vertices can be removed) and the triangle budget.
+"""
+def decimate_cache_key(arrays, target_triangles):
+    digest = hashlib.sha256()
+    for name in ("material_index", "use_smooth"):
+        digest.update(arrays[name].tobytes())
+    for name, uvs in arrays["uv"].items():
+        digest.update(name.encode("utf-8") + uvs.tobytes())
+    return mesh_arrays_hash(arrays, [DECIMATE_CACHE_VERSION, target_triangles, digest.hexdigest()])
+
+
+def decimate_cache_path(directory, key):
+    return os.path.join(directory, DECIMATE_CACHE_DIR, key)
+
+
+"""
+Decimates one part and stores the result in its cache directory (staged, then renamed, so a half-written entry is never used).
+Runs in a worker; only NumPy is used here.
+"""
+def decimate_part(arrays, target_triangles, cache_path):
+    staging_path = cache_path + ".tmp"
+    shutil.rmtree(staging_path, ignore_errors=True)
+    save_mesh_arrays(staging_path, decimate_arrays(arrays, target_triangles))
+    shutil.rmtree(cache_path, ignore_errors=True)
+    os.replace(staging_path, cache_path)
+    return cache_path
+
+
+"""
+Creates the pool for decimating parts. Threads, not processes: forking the multi-threaded Blender process
+can deadlock the children, and spawned processes would re-run the Blender entry script.
+Expect little speedup from more workers: collapse_round runs many small NumPy calls that hold the GIL.
+"""
+def part_executor(workers):
+    return ThreadPoolExecutor(workers or os.cpu_count())
+
+
+"""
+Decimates parts in parallel, reusing cached results from sofa_decimate_cache/.
+:param part_arrays: Mesh arrays per part.
+:param targets: Triangle budget per part; parts already within budget are returned as they are.
+:param directory: The project directory.
+:param workers: (Optional) Worker count (default: DECIMATE_WORKERS).
+:return: Mesh arrays per part (memory-mapped from the cache when decimated).
+"""
+def decimate_parts(part_arrays, targets, directory, workers=DECIMATE_WORKERS):
+    results = list(part_arrays)
+    pending = {}
+    for index, (arrays, target) in enumerate(zip(part_arrays, targets)):
+        if triangle_count(arrays) <= target:
+            continue
+        cache_path = decimate_cache_path(directory, decimate_cache_key(arrays, target))
+        if os.path.exists(os.path.join(cache_path, "mesh.json")):
+            results[index] = load_mesh_arrays(cache_path)
+        else:
+            # ✅ Identical parts share one job, so no two workers write the same entry
+            pending.setdefault(cache_path, (arrays, target, []))[2].append(index)
+
+    if pending:
+        with part_executor(min(workers or os.cpu_count(), len(pending))) as executor:
+            futures = {cache_path: executor.submit(decimate_part, arrays, target, cache_path) for cache_path, (arrays, target, _) in pending.items()}
+            for cache_path, future in futures.items():
+                lod_arrays = load_mesh_arrays(future.result())
+                for index in pending[cache_path][2]:
+                    results[index] = lod_arrays
+    print(f"✅ Decimated {len(pending)} parts ({len(part_arrays) - len(pending)} cached or within budget)")
+    return results
+
+
+"""
+Inserts the LOD level before Blender's numeric suffix, so export names stay <part>_<level> (see clean_export_name).
+"""
+def lod_name(name, level):
+    base, dot, suffix = name.partition(".")
+    return base + "_" + level + dot + suffix
+
+
+"""
+Builds one LOD level of a module: every part is decimated with quadric error metrics to its share of the
+module's triangle budget (shares follow the parts' triangle counts) and rebuilt with the data API.
+:param objs: The module's parts.
+:param budget: The module's triangle budget for this level.
+:param level: The level name (e.g. "LOD1"), used for the collection, object and mesh names.
+:param directory: The project directory.
+:return: An OUTPUT_<level> collection holding the decimated parts (flush it when done).
+"""
+@profiled
+def build_lod_collection(objs, budget, level, directory):
+    part_arrays = [read_mesh_arrays(obj.data) for obj in objs]
+    targets = part_budgets([triangle_count(arrays) for arrays in part_arrays], budget)
+    lod_arrays = decimate_parts(part_arrays, targets, directory)
+    collection = create_collection("OUTPUT_" + level)
+    for obj, arrays in zip(objs, lod_arrays):
+        mesh_data = build_mesh(lod_name(obj.data.name, level), arrays, list(obj.data.materials))
+        lod = bpy.data.objects.new(lod_name(obj.name, level), mesh_data)
+        lod.matrix_world = obj.matrix_world.copy()
+        collection.objects.link(lod)
+    print(f"✅ {level}: {sum(triangle_count(arrays) for arrays in lod_arrays)} triangles in {len(objs)} parts (budget {budget})")
+    return collection
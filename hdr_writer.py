@@ -0,0 +1,174 @@
+import os
+import struct
+import numpy as np
+from core.pixel_utils import DEFAULT_MEMORY_BUDGET
+from core.pixel_utils import iter_bands
+from core.pixel_utils import rows_per_band
+
+
+EXR_MAGIC = 20000630
+EXR_HALF = 1
+EXR_CHANNELS = ["B", "G", "R"]  # OpenEXR stores channels in alphabetical order
+
+
+"""
+Encodes linear RGB floats as Radiance RGBE bytes.
+:param rgb: float array of shape (n, 3).
+:return: uint8 array of shape (n, 4).
+"""
+def rgbe_encode(rgb):
+    rgb = np.maximum(np.asarray(rgb, dtype=np.float32), 0.0)
+    brightest = rgb.max(axis=1)
+    mantissa, exponent = np.frexp(brightest)
+    scale = np.divide(mantissa * 256.0, brightest, out=np.zeros_like(brightest), where=brightest > 1e-32)
+
+    rgbe = np.zeros((len(rgb), 4), dtype=np.uint8)
+    visible = brightest > 1e-32
+    rgbe[:, :3] = np.minimum(rgb * scale[:, None], 255.0).astype(np.uint8)
+    rgbe[:, 3] = np.where(visible, exponent + 128, 0).astype(np.uint8)
+    return rgbe
+
+
+"""
+Downscales a band with a box (area) filter by an integer factor.
+:param band: float array of shape (rows, width, 4); rows and width must be multiples of factor.
+:param factor: The integer downscale factor (1 returns the band unchanged).
+:return: float32 array of shape (rows // factor, width // factor, 4).
+"""
+def box_downscale(band, factor):
+    if factor == 1:
+        return band
+    rows, width, channels = band.shape
+    blocks = band.reshape(rows // factor, factor, width // factor, factor, channels)
+    return blocks.mean(axis=(1, 3), dtype=np.float32)
+
+
+"""
+Opens a Radiance HDR file and writes its header; scanlines follow top to bottom, uncompressed.
+:return: The open binary file.
+"""
+def open_hdr(path, width, height):
+    file = open(path, "wb")
+    file.write(b"#?RADIANCE\nFORMAT=32-bit_rle_rgbe\n\n")
+    file.write(f"-Y {height} +X {width}\n".encode("ascii"))
+    return file
+
+
+"""
+Appends top-to-bottom scanlines to an open HDR file.
+:param rows: float array of shape (rows, width, 4), first row is the top scanline.
+"""
+def write_hdr_rows(file, rows, first_row):
+    file.write(rgbe_encode(rows[..., :3].reshape(-1, 3)).tobytes())
+
+
+def exr_attribute(name, attribute_type, value):
+    return name.encode("ascii") + b"\0" + attribute_type.encode("ascii") + b"\0" + struct.pack("<i", len(value)) + value
+
+
+"""
+Opens a half-float, uncompressed scanline OpenEXR file and writes its header and line offset table.
+Uncompressed scanlines have a fixed size, so every offset is known before any pixel is written.
+:return: The open binary file.
+"""
+def open_exr(path, width, height):
+    channels = b"".join(
+        name.encode("ascii") + b"\0" + struct.pack("<iB3xii", EXR_HALF, 0, 1, 1) for name in EXR_CHANNELS
+    ) + b"\0"
+    window = struct.pack("<iiii", 0, 0, width - 1, height - 1)
+    header = b"".join([
+        struct.pack("<ii", EXR_MAGIC, 2),
+        exr_attribute("channels", "chlist", channels),
+        exr_attribute("compression", "compression", b"\0"),
+        exr_attribute("dataWindow", "box2i", window),
+        exr_attribute("displayWindow", "box2i", window),
+        exr_attribute("lineOrder", "lineOrder", b"\0"),
+        exr_attribute("pixelAspectRatio", "float", struct.pack("<f", 1.0)),
+        exr_attribute("screenWindowCenter", "v2f", struct.pack("<ff", 0.0, 0.0)),
+        exr_attribute("screenWindowWidth", "float", struct.pack("<f", 1.0)),
+        b"\0",
+    ])
+
+    line_size = 8 + width * len(EXR_CHANNELS) * 2
+    first_line = len(header) + 8 * height
+    offsets = np.arange(height, dtype=np.uint64) * line_size + first_line
+
+    file = open(path, "wb")
+    file.write(header)
+    file.write(offsets.astype("<u8").tobytes())
+    return file
+
+
+"""
+Appends top-to-bottom scanlines to an open EXR file.
+:param rows: float array of shape (rows, width, 4), first row is the top scanline.
+:param first_row: The y coordinate of the first row (0 is the top).
+"""
+def write_exr_rows(file, rows, first_row):
+    count, width, _ = rows.shape
+    # (rows, width, RGBA) -> (rows, [B, G, R], width) half floats, one chunk per scanline
+    planes = np.ascontiguousarray(rows[..., 2::-1].transpose(0, 2, 1)).astype("<f2")
+    chunk_headers = np.empty((count, 2), dtype="<i4")
+    chunk_headers[:, 0] = np.arange(first_row, first_row + count)
+    chunk_headers[:, 1] = width * len(EXR_CHANNELS) * 2
+    chunks = np.concatenate([chunk_headers.view(np.uint8).reshape(count, 8), planes.view(np.uint8).reshape(count, -1)], axis=1)
+    file.write(chunks.tobytes())
+
+
+IMAGE_WRITERS = {
+    ".hdr": (open_hdr, write_hdr_rows),
+    ".exr": (open_exr, write_exr_rows),
+}
+
+
+"""
+Returns the output path of a mip level: level 0 is the path itself, level n gets a _mip<n> suffix.
+"""
+def mip_path(output_path, level):
+    if level == 0:
+        return output_path
+    base, extension = os.path.splitext(output_path)
+    return f"{base}_mip{level}{extension}"
+
+
+"""
+Streams an image into a Radiance HDR or half-float EXR file at a lower resolution, plus optional mip levels,
+in one pass over bounded row bands. Downscaling is a box (area) filter.
+:param read_band: Callable (source_index, first_row, end_row) -> flat float32 RGBA buffer (rows bottom to top).
+:param width: Source width in pixels.
+:param height: Source height in pixels.
+:param resolution: Output width/height of level 0; width and height must be integer multiples of it.
+:param output_path: Output file path; the extension (.hdr or .exr) picks the format.
+:param mip_levels: (Optional) Number of extra half-size levels written next to level 0 (default: 0).
+:param memory_budget: (Optional) Peak bytes allowed for band buffers (default: DEFAULT_MEMORY_BUDGET).
+:return: The paths of every written level.
+"""
+def stream_image(read_band, width, height, resolution, output_path, mip_levels=0, memory_budget=DEFAULT_MEMORY_BUDGET):
+    open_image, write_rows = IMAGE_WRITERS[os.path.splitext(output_path)[1].lower()]
+    factor = width // resolution
+    if width % resolution or height % factor or (height // factor) % (2 ** mip_levels) or resolution % (2 ** mip_levels):
+        raise ValueError(f"{width}x{height} cannot be box-filtered to {resolution} with {mip_levels} mip levels")
+
+    # ✅ Bands hold whole output rows of the smallest level, so each band downsamples independently
+    block_rows = factor * 2 ** mip_levels
+    band_rows = max(block_rows, rows_per_band(width, 1, memory_budget) // block_rows * block_rows)
+
+    level_sizes = [(resolution >> level, (height // factor) >> level) for level in range(mip_levels + 1)]
+    level_paths = [mip_path(output_path, level) for level in range(mip_levels + 1)]
+    files = [open_image(path, size[0], size[1]) for path, size in zip(level_paths, level_sizes)]
+    try:
+        # ✅ Blender stores rows bottom to top; files are written top to bottom
+        level_rows = [0] * len(files)
+        bands = list(iter_bands(height, band_rows))
+        for first_row, end_row in reversed(bands):
+            band = read_band(0, first_row, end_row).reshape(end_row - first_row, width, 4)[::-1]
+            level = box_downscale(band, factor)
+            for index, file in enumerate(files):
+                if index:
+                    level = box_downscale(level, 2)
+                write_rows(file, level, level_rows[index])
+                level_rows[index] += len(level)
+    finally:
+        for file in files:
+            file.close()
+    return level_paths
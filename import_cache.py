@@ -0,0 +1,148 @@
+# ✅ Standard Python Modules
+import json
+import os
+import shutil
+
+# ✅ Blender Modules
+import bpy  # type: ignore
+from mathutils import Matrix  # type: ignore
+
+# ✅ Custom Imports
+from mesh_utils import apply_transforms
+from mesh_utils import build_mesh
+from mesh_utils import mesh_arrays_loss_reason
+from mesh_utils import read_loop_normals
+from mesh_utils import read_mesh_arrays
+from core.mesh_arrays import load_mesh_arrays
+from core.mesh_arrays import save_mesh_arrays
+from build_cache import code_version
+from build_cache import file_hash
+from build_cache import value_hash
+from profiling import profiled
+
+IMPORT_CACHE_DIR = "sofa_import_cache"
+OBJECTS_INDEX = "objects.json"
+MATERIALS_LIBRARY = "materials.blend"
+# ✅ The sources that shape the cached geometry; edits elsewhere in the pipeline keep the cache
+IMPORT_CACHE_SOURCES = ["import_cache.py", "mesh_utils.py", "core/mesh_arrays.py", "core/geometry_utils.py"]
+
+
+"""
+Builds the cache key of an imported FBX: the file contents, the config transform applied after import,
+the version of the sources that shape the cached geometry (IMPORT_CACHE_SOURCES) and the Blender version
+(the importer's output can change between releases).
+"""
+def import_cache_key(fbx_path, transform, directory):
+    return value_hash([file_hash(fbx_path), transform, code_version(directory, IMPORT_CACHE_SOURCES), bpy.app.version_string])
+
+
+def import_cache_path(directory, key):
+    return os.path.join(directory, IMPORT_CACHE_DIR, key)
+
+
+"""
+Stores the imported, already-transformed objects: one directory of .npy mesh arrays per object (edge flags
+and generic attributes included), the materials with their node trees in a .blend library, and an objects.json index
+written last, so a half-written entry is never used. Imports the cache cannot rebuild exactly are not cached.
+:return: True when the entry was written.
+"""
+def save_import_cache(cache_path, objs):
+    reason = mesh_arrays_loss_reason(objs)
+    if reason:
+        print(f"⚠ Import not cached, {reason}: {cache_path}")
+        return False
+
+    staging_path = cache_path + ".tmp"
+    shutil.rmtree(staging_path, ignore_errors=True)
+    entries = []
+    materials = set()
+    for index, obj in enumerate(objs):
+        object_path = os.path.join(staging_path, str(index))
+        arrays = read_mesh_arrays(obj.data)
+        if obj.data.has_custom_normals:
+            arrays["loop_normal"] = read_loop_normals(obj.data)
+        save_mesh_arrays(object_path, arrays)
+        materials.update(material for material in obj.data.materials if material)
+        entries.append({
+            "name": obj.name,
+            "data_name": obj.data.name,
+            "materials": [material.name if material else None for material in obj.data.materials],
+            "matrix_world": [list(row) for row in obj.matrix_world],
+        })
+    bpy.data.libraries.write(os.path.join(staging_path, MATERIALS_LIBRARY), materials, path_remap="ABSOLUTE")
+    with open(os.path.join(staging_path, OBJECTS_INDEX), "w") as index_file:
+        json.dump(entries, index_file, indent=4)
+
+    shutil.rmtree(cache_path, ignore_errors=True)
+    os.replace(staging_path, cache_path)
+    return True
+
+
+"""
+Finds the cached materials by name: materials already in the file are reused, the others are appended
+(with their node trees) from the entry's materials.blend.
+:return: {name: material}.
+"""
+def load_cached_materials(cache_path, names):
+    materials = {name: bpy.data.materials[name] for name in names if name in bpy.data.materials}
+    missing = [name for name in names if name not in materials]
+    if missing:
+        with bpy.data.libraries.load(os.path.join(cache_path, MATERIALS_LIBRARY), link=False) as (data_from, data_to):
+            data_to.materials = [name for name in missing if name in data_from.materials]
+        for name, material in zip([name for name in missing if name in data_from.materials], data_to.materials):
+            materials[name] = material
+    return materials
+
+
+"""
+Rebuilds cached objects with the data API from memory-mapped mesh arrays (edge flags and attributes included)
+and links them to a collection.
+:return: The new objects, selected, as after an FBX import.
+"""
+def load_import_cache(cache_path, collection):
+    with open(os.path.join(cache_path, OBJECTS_INDEX)) as index_file:
+        entries = json.load(index_file)
+    materials = load_cached_materials(cache_path, sorted({name for entry in entries for name in entry["materials"] if name}))
+
+    objs = []
+    for index, entry in enumerate(entries):
+        object_path = os.path.join(cache_path, str(index))
+        slots = [materials.get(name) if name else None for name in entry["materials"]]
+        mesh_data = build_mesh(entry["data_name"], load_mesh_arrays(object_path), slots)
+        obj = bpy.data.objects.new(entry["name"], mesh_data)
+        obj.matrix_world = Matrix(entry["matrix_world"])
+        collection.objects.link(obj)
+        obj.select_set(True)
+        objs.append(obj)
+    return objs
+
+
+"""
+Imports an FBX, applies the config transform and links the objects to a collection.
+The transformed geometry is cached under sofa_import_cache/, keyed on the file hash, the transform, the geometry
+code version and the Blender version; a cache hit rebuilds the meshes without parsing the FBX.
+:param fbx_path: The FBX file.
+:param transform: The module's config transform (see apply_transforms).
+:param collection: The collection that receives the objects.
+:param directory: The project directory.
+:param use_cache: (Optional) Read and write the cache (default: True).
+:return: The imported objects.
+"""
+@profiled
+def import_fbx(fbx_path, transform, collection, directory, use_cache=True):
+    cache_path = import_cache_path(directory, import_cache_key(fbx_path, transform, directory))
+    if use_cache and os.path.exists(os.path.join(cache_path, OBJECTS_INDEX)):
+        bpy.ops.object.select_all(action="DESELECT")
+        objs = load_import_cache(cache_path, collection)
+        print(f"⏭ Import loaded from cache: {cache_path}")
+        return objs
+
+    bpy.ops.import_scene.fbx(filepath=fbx_path)
+    objs = list(bpy.context.selected_objects)
+    apply_transforms(objs, transform)
+    for obj in objs:
+        collection.objects.link(obj)
+        bpy.context.scene.collection.objects.unlink(obj)
+    if use_cache:
+        save_import_cache(cache_path, objs)
+    return objs
@@ -0,0 +1,88 @@
+# ✅ Standard Python Modules
+import argparse
+import json
+import os
+import runpy
+import sys
+
+# ✅ Custom Imports
+from atlas_allocator import planned_config
+from build_cache import code_version
+from build_cache import file_hash
+from build_cache import value_hash
+from config_compiler import validate_config
+
+JOB_PLAN_NAME = "job_plan.json"
+CONFIG_NAME = "sofa_modules_config.py"
+
+# ✅ Compiles and validates the module config into a frozen job plan that workers load instead of the config module:
+# python3 job_plan.py
+
+
+def plan_source(directory):
+    return value_hash([file_hash(os.path.join(directory, CONFIG_NAME)), code_version(directory), os.environ.get("SOFA_QUALITY")])
+
+
+"""
+Compiles the module config into a job plan: every module with its planned atlas rect and its resolved bake quality
+(SOFA_QUALITY applied), validated up front, plus the atlas settings. The config file is executed in a fresh namespace,
+so long-lived workers always see the file on disk; nothing downstream imports the config module.
+:param directory: The project directory.
+:param check_paths: (Optional) Also check that every input FBX exists (default: True).
+:return: (plan, errors); plan is {"source", "atlas_settings", "modules"}, errors is a list of messages.
+"""
+def compile_job_plan(directory, check_paths=True):
+    namespace = runpy.run_path(os.path.join(directory, CONFIG_NAME))
+    settings = namespace["atlas_settings"]
+    modules = planned_config(namespace["config"], settings)
+    for cfg in modules.values():
+        cfg["quality"] = namespace["module_quality"](cfg)
+    errors = validate_config(modules, settings["atlas_size"], directory if check_paths else None)
+    return {"source": plan_source(directory), "atlas_settings": settings, "modules": modules}, errors
+
+
+"""
+Compiles, validates and writes the job plan.
+:raises ValueError: With every validation error, when the config is invalid; nothing is written then.
+:return: The plan.
+"""
+def write_job_plan(directory, check_paths=True):
+    plan, errors = compile_job_plan(directory, check_paths)
+    if errors:
+        raise ValueError("Invalid module config:\n" + "\n".join(errors))
+    with open(os.path.join(directory, JOB_PLAN_NAME), "w") as plan_file:
+        json.dump(plan, plan_file, indent=4)
+    return plan
+
+
+"""
+Loads the job plan, recompiling it first when the config, the code or SOFA_QUALITY changed.
+:param directory: The project directory.
+:return: {"source", "atlas_settings", "modules"}; modules is {module: planned entry}, as atlas_allocator.planned_config returns it.
+"""
+def load_job_plan(directory):
+    plan_path = os.path.join(directory, JOB_PLAN_NAME)
+    if os.path.exists(plan_path):
+        with open(plan_path) as plan_file:
+            plan = json.load(plan_file)
+        if plan["source"] == plan_source(directory):
+            return plan
+    return write_job_plan(directory)
+
+
+def main():
+    directory = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description="Compile and validate the module config into job_plan.json.")
+    parser.add_argument("--no-check-paths", action="store_true", help="Skip checking that input FBX files exist.")
+    args = parser.parse_args()
+    try:
+        plan = write_job_plan(directory, not args.no_check_paths)
+    except ValueError as error:
+        print(f"❌ {error}")
+        sys.exit(1)
+    atlases = sorted({cfg["atlas_rect"]["atlas"] for cfg in plan["modules"].values()})
+    print(f"💾 Job plan with {len(plan['modules'])} modules on {len(atlases)} atlas(es) saved at: {os.path.join(directory, JOB_PLAN_NAME)}")
+
+
+if __name__ == "__main__":
+    main()
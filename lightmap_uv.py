@@ -0,0 +1,91 @@
+# ✅ Standard Python Modules
+import hashlib
+import math
+import os
+
+# ✅ Blender Modules
+import bpy  # type: ignore
+import numpy as np
+
+# ✅ Custom Imports
+from mesh_utils import read_mesh_arrays
+from mesh_utils import read_uvs
+from mesh_utils import select_none
+from mesh_utils import set_edit_mode
+from mesh_utils import set_object_mode
+from mesh_utils import write_uvs
+from core.mesh_arrays import mesh_arrays_hash
+from core.geometry_utils import fan_area
+
+LIGHTMAP_LAYER = "lightmap"
+LIGHTMAP_CACHE_DIR = "sofa_uv_cache"
+
+
+def lightmap_cache_path(directory, key):
+    return os.path.join(directory, LIGHTMAP_CACHE_DIR, key + ".npz")
+
+
+def lightmap_density(objs, tile_size):
+    # ✅ Texels per meter the packed lightmap actually gets: tile edge scaled by sqrt(UV area / surface area)
+    surface_area = uv_area = 0.0
+    for obj in objs:
+        arrays = read_mesh_arrays(obj.data)
+        loop_points = arrays["co"][arrays["loop_vertex"]]
+        surface_area += fan_area(loop_points, arrays["loop_start"], arrays["loop_total"])
+        uv_area += fan_area(arrays["uv"][LIGHTMAP_LAYER], arrays["loop_start"], arrays["loop_total"])
+    texel_density = tile_size * math.sqrt(uv_area / surface_area) if surface_area else 0.0
+    return {"surface_area": surface_area, "uv_area": uv_area, "texel_density": texel_density}
+
+
+"""
+Unwraps and packs the lightmap UVs of every part of a module in one edit-mode call.
+Island margin and pack padding come from the bake margin, so baked texels never bleed between islands.
+The result is cached per module under sofa_uv_cache/, keyed on the parts' geometry and the UV parameters,
+and a cache hit skips the unwrap entirely.
+:param objs: The module's objects, each with a "lightmap" UV layer (see add_ligthmap_channel).
+:param tile_size: The module's tile width/height in pixels.
+:param bake_cfg: The module's bake config ("margin" in pixels).
+:param directory: The project directory.
+:param texel_density: (Optional) Target texels per meter; a warning is printed when the packed lightmap falls short.
+:param angle_limit: (Optional) Smart UV Project angle limit in radians (default: 60°).
+:return: {"surface_area", "uv_area", "texel_density"} of the packed lightmap.
+"""
+def generate_lightmap_uvs(objs, tile_size, bake_cfg, directory, texel_density=None, angle_limit=math.radians(60)):
+    margin = bake_cfg["margin"] / tile_size
+    params = {"margin": margin, "angle_limit": angle_limit}
+    part_keys = [mesh_arrays_hash(read_mesh_arrays(obj.data), params) for obj in objs]
+    key = hashlib.sha256("".join(part_keys).encode("utf-8")).hexdigest()
+    cache_path = lightmap_cache_path(directory, key)
+
+    if os.path.exists(cache_path):
+        with np.load(cache_path) as cached:
+            for index, obj in enumerate(objs):
+                write_uvs(obj.data.uv_layers[LIGHTMAP_LAYER], cached[str(index)])
+                obj.data.update()
+        print(f"⏭ Lightmap UVs loaded from cache: {cache_path}")
+    else:
+        select_none()
+        for obj in objs:
+            obj.select_set(True)
+            obj.data.uv_layers.active = obj.data.uv_layers[LIGHTMAP_LAYER]
+        bpy.context.view_layer.objects.active = objs[0]
+
+        # ✅ One multi-object edit session unwraps and packs every part together
+        set_edit_mode()
+        bpy.ops.mesh.select_mode(type="FACE")
+        bpy.ops.mesh.select_all(action="SELECT")
+        bpy.ops.uv.smart_project(angle_limit=angle_limit, island_margin=margin, correct_aspect=True, scale_to_bounds=False)
+        bpy.ops.uv.select_all(action="SELECT")
+        bpy.ops.uv.pack_islands(rotate=True, margin=margin)
+        set_object_mode()
+
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        temp_path = cache_path + ".tmp.npz"
+        np.savez(temp_path, **{str(index): read_uvs(obj.data.uv_layers[LIGHTMAP_LAYER]) for index, obj in enumerate(objs)})
+        os.replace(temp_path, cache_path)
+        print(f"💾 Lightmap UVs cached: {cache_path}")
+
+    density = lightmap_density(objs, tile_size)
+    if texel_density and density["texel_density"] < texel_density:
+        print(f"⚠ Lightmap density {density['texel_density']:.0f} texels/m is below the target {texel_density} texels/m")
+    return density
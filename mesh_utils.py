@@ -1,17 +1,213 @@
 import bpy  # type: ignore
+import json
+import numpy as np
 from mathutils import Vector  # type: ignore
+from profiling import profiled
+from core.geometry_utils import compose_matrix
+from core.geometry_utils import compose_transform
+from core.geometry_utils import segment_bounds
+from core.geometry_utils import transform_points
+from core.loose_parts import label_loose_parts
+from core.loose_parts import polygon_labels
+from core.mesh_arrays import EDGE_FLAGS
+from core.mesh_arrays import concat_mesh_arrays
+from core.mesh_arrays import conflicting_attributes
+from core.mesh_arrays import loop_edges
+from core.mesh_arrays import part_table_matches
+from core.mesh_arrays import slice_mesh_arrays
+from core.mesh_arrays import subset_mesh_arrays
+from core.uv_utils import grid_rect
+from core.uv_utils import rect_transform
+from core.uv_utils import transform_uvs
+
+def read_vertex_coords(mesh_data):
+    coords = np.empty(len(mesh_data.vertices) * 3, dtype=np.float32)
+    mesh_data.vertices.foreach_get("co", coords)
+    return coords.reshape(-1, 3)
+
+@profiled
+def objects_bounds(objs):
+    counts = [len(obj.data.vertices) for obj in objs]
+    world_coords = np.empty((sum(counts), 3), dtype=np.float64)
+    start = 0
+    for obj, count in zip(objs, counts):
+        transform_points(read_vertex_coords(obj.data), np.array(obj.matrix_world), out=world_coords[start:start + count])
+        start += count
+    return segment_bounds(world_coords, counts)
+
+def collection_bounds(collection):
+    return objects_bounds([obj for obj in collection.objects if obj.type == "MESH"])
 
 def find_mesh_center(mesh):
-    vertices = mesh.data.vertices
-    total_position = Vector((0.0, 0.0, 0.0))
-    vertex_count = len(vertices)
-    
-    for v in vertices:
-        vertex_pos = mesh.matrix_world @ v.co
-        total_position += vertex_pos
-
-    center = total_position / vertex_count
-    return center
+    return Vector(objects_bounds([mesh])[0]["center"])
+
+# ✅ Generic mesh attributes the mesh arrays carry: data type → (foreach property, width, dtype)
+ATTRIBUTE_VALUES = {
+    "FLOAT": ("value", 1, np.float32),
+    "INT": ("value", 1, np.int32),
+    "INT8": ("value", 1, np.int32),
+    "BOOLEAN": ("value", 1, bool),
+    "FLOAT2": ("vector", 2, np.float32),
+    "INT32_2D": ("value", 2, np.int32),
+    "FLOAT_VECTOR": ("vector", 3, np.float32),
+    "FLOAT_COLOR": ("color", 4, np.float32),
+    "BYTE_COLOR": ("color", 4, np.float32),
+    "QUATERNION": ("value", 4, np.float32),
+}
+# ✅ Attributes the mesh arrays already carry as fields (use_smooth, edge flags, loop_normal); names starting with "." are Blender internals
+ARRAY_ATTRIBUTES = {"position", "material_index", "sharp_face", "sharp_edge", "uv_seam", "custom_normal"}
+
+"""
+Lists the generic mesh attributes (colors, custom attributes, ...), i.e. every attribute that is not
+a UV layer, a Blender internal or one of the mesh array fields.
+"""
+def extra_attributes(mesh_data):
+    uv_names = {uv_layer.name for uv_layer in mesh_data.uv_layers}
+    return [
+        attribute for attribute in mesh_data.attributes
+        if not attribute.name.startswith(".") and attribute.name not in ARRAY_ATTRIBUTES and attribute.name not in uv_names
+    ]
+
+def read_attribute(attribute):
+    prop, width, dtype = ATTRIBUTE_VALUES[attribute.data_type]
+    values = np.empty(len(attribute.data) * width, dtype=dtype)
+    attribute.data.foreach_get(prop, values)
+    return values.reshape(-1, width) if width > 1 else values
+
+"""
+Tells why objects cannot go through mesh arrays without losing data, or None when they can.
+"""
+def mesh_arrays_loss_reason(objs):
+    for obj in objs:
+        if obj.type != "MESH":
+            return f"{obj.name} is not a mesh"
+        if obj.vertex_groups:
+            return f"{obj.name} has vertex groups"
+        if obj.data.shape_keys:
+            return f"{obj.name} has shape keys"
+        if any(attribute.data_type not in ATTRIBUTE_VALUES for attribute in extra_attributes(obj.data)):
+            return f"{obj.name} has attributes of an unsupported type"
+    return None
+
+@profiled
+def read_mesh_arrays(mesh_data):
+    def read(collection, attribute, dtype, width=1):
+        values = np.empty(len(collection) * width, dtype=dtype)
+        collection.foreach_get(attribute, values)
+        return values.reshape(-1, width) if width > 1 else values
+
+    arrays = {
+        "co": read_vertex_coords(mesh_data),
+        "edges": read(mesh_data.edges, "vertices", np.int32, 2),
+        "loop_vertex": read(mesh_data.loops, "vertex_index", np.int32),
+        "loop_start": read(mesh_data.polygons, "loop_start", np.int32),
+        "loop_total": read(mesh_data.polygons, "loop_total", np.int32),
+        "material_index": read(mesh_data.polygons, "material_index", np.int32),
+        "use_smooth": read(mesh_data.polygons, "use_smooth", bool),
+        "uv": {uv_layer.name: read_uvs(uv_layer) for uv_layer in mesh_data.uv_layers},
+        "uv_active": mesh_data.uv_layers.active.name if mesh_data.uv_layers.active else None,
+        "uv_render": next((uv_layer.name for uv_layer in mesh_data.uv_layers if uv_layer.active_render), None),
+        "attributes": {
+            attribute.name: {"data_type": attribute.data_type, "domain": attribute.domain, "values": read_attribute(attribute)}
+            for attribute in extra_attributes(mesh_data) if attribute.data_type in ATTRIBUTE_VALUES
+        },
+    }
+    for flag in EDGE_FLAGS:
+        arrays[flag] = read(mesh_data.edges, flag, bool)
+    return arrays
+
+@profiled
+def build_mesh(name, arrays, materials=()):
+    # ✅ Corner→edge links are written explicitly: update() does not rebuild them when edges already exist
+    edges, loop_edge = loop_edges(arrays["edges"], arrays["loop_vertex"], arrays["loop_start"], arrays["loop_total"])
+    mesh_data = bpy.data.meshes.new(name)
+    mesh_data.vertices.add(len(arrays["co"]))
+    mesh_data.vertices.foreach_set("co", np.ascontiguousarray(arrays["co"], dtype=np.float32).ravel())
+    mesh_data.edges.add(len(edges))
+    mesh_data.edges.foreach_set("vertices", edges.ravel())
+    mesh_data.loops.add(len(arrays["loop_vertex"]))
+    mesh_data.loops.foreach_set("vertex_index", np.ascontiguousarray(arrays["loop_vertex"], dtype=np.int32))
+    mesh_data.loops.foreach_set("edge_index", loop_edge)
+    mesh_data.polygons.add(len(arrays["loop_start"]))
+    mesh_data.polygons.foreach_set("loop_start", np.ascontiguousarray(arrays["loop_start"], dtype=np.int32))
+    try:
+        mesh_data.polygons.foreach_set("loop_total", np.ascontiguousarray(arrays["loop_total"], dtype=np.int32))
+    except (AttributeError, TypeError):
+        pass  # read-only in newer Blender, derived from loop_start
+    mesh_data.polygons.foreach_set("material_index", np.ascontiguousarray(arrays["material_index"], dtype=np.int32))
+    mesh_data.polygons.foreach_set("use_smooth", np.ascontiguousarray(arrays["use_smooth"], dtype=bool))
+
+    for uv_name, uvs in arrays["uv"].items():
+        uv_layer = mesh_data.uv_layers.new(name=uv_name)
+        write_uvs(uv_layer, np.ascontiguousarray(uvs, dtype=np.float32))
+    if arrays.get("uv_active") in mesh_data.uv_layers:
+        mesh_data.uv_layers.active = mesh_data.uv_layers[arrays["uv_active"]]
+    for uv_layer in mesh_data.uv_layers:
+        uv_layer.active_render = (uv_layer.name == arrays.get("uv_render"))
+
+    # ✅ Edges appended by loop_edges come after the stored ones and get their flags unset
+    for flag in EDGE_FLAGS:
+        if arrays.get(flag) is not None:
+            values = np.zeros(len(edges), dtype=bool)
+            values[:len(arrays[flag])] = arrays[flag]
+            mesh_data.edges.foreach_set(flag, values)
+    for attribute_name, attribute_arrays in arrays.get("attributes", {}).items():
+        attribute = mesh_data.attributes.get(attribute_name) or mesh_data.attributes.new(attribute_name, attribute_arrays["data_type"], attribute_arrays["domain"])
+        attribute.data.foreach_set(ATTRIBUTE_VALUES[attribute_arrays["data_type"]][0], np.ascontiguousarray(attribute_arrays["values"]).ravel())
+
+    for material in materials:
+        mesh_data.materials.append(material)
+
+    mesh_data.update()
+    if arrays.get("loop_normal") is not None:
+        write_loop_normals(mesh_data, arrays["loop_normal"])
+    return mesh_data
+
+def read_loop_normals(mesh_data):
+    normals = np.empty(len(mesh_data.loops) * 3, dtype=np.float32)
+    if hasattr(mesh_data, "corner_normals"):
+        mesh_data.corner_normals.foreach_get("vector", normals)  # Blender 4.1+
+    else:
+        mesh_data.calc_normals_split()
+        mesh_data.loops.foreach_get("normal", normals)
+    return normals.reshape(-1, 3)
+
+def write_loop_normals(mesh_data, normals):
+    if hasattr(mesh_data, "use_auto_smooth"):
+        mesh_data.use_auto_smooth = True  # custom normals need auto smooth before Blender 4.1
+    mesh_data.normals_split_custom_set(np.asarray(normals, dtype=np.float32))
+
+@profiled
+def split_loose_parts(obj):
+    arrays = read_mesh_arrays(obj.data)
+    if obj.data.has_custom_normals:
+        arrays["loop_normal"] = read_loop_normals(obj.data)
+    labels, part_count = label_loose_parts(len(arrays["co"]), arrays["edges"])
+    poly_labels = polygon_labels(labels, arrays["loop_vertex"], arrays["loop_start"])
+    materials = list(obj.data.materials)
+
+    # ✅ Every vertex component becomes a part, including loose vertices and edges without polygons (as separate LOOSE does)
+    parts = []
+    for part in range(part_count):
+        part_name = f"{obj.name}.{len(parts):03d}"
+        part_arrays = subset_mesh_arrays(arrays, poly_labels == part, labels == part)
+        part_obj = bpy.data.objects.new(part_name, build_mesh(part_name, part_arrays, materials))
+        part_obj.matrix_world = obj.matrix_world.copy()
+        for collection in obj.users_collection:
+            collection.objects.link(part_obj)
+        parts.append(part_obj)
+
+    mesh_data = obj.data
+    bpy.data.objects.remove(obj, do_unlink=True)
+    if mesh_data.users == 0:
+        bpy.data.meshes.remove(mesh_data)
+    return parts
+
+def split_collection_loose_parts(collection):
+    parts = []
+    for obj in [obj for obj in collection.objects if obj.type == "MESH"]:
+        parts.extend(split_loose_parts(obj))
+    return parts
 
 def select_none():
     bpy.ops.object.select_all(action='DESELECT')
@@ -41,6 +237,7 @@ def set_object_mode():
 def set_edit_mode():
     bpy.ops.object.mode_set(mode="EDIT")
 
+@profiled
 def decimate_mesh(mesh, decimate):
     select_mesh(mesh)
 
@@ -86,35 +283,51 @@ def assign_material(obj, name="NewMaterial"):
     else:
         obj.data.materials.append(mat)
 
-def pack_uv_into_tile(obj, tile_index, atlas_size=4096, tile_size=512):
-    tiles_per_row = atlas_size // tile_size
-    uv_tile_scale = tile_size / atlas_size
+def read_uvs(uv_layer):
+    uvs = np.empty(len(uv_layer.data) * 2, dtype=np.float32)
+    uv_layer.data.foreach_get("uv", uvs)
+    return uvs.reshape(-1, 2)
 
-    row = tile_index // tiles_per_row
-    col = tile_index % tiles_per_row
-    offset_u = col * uv_tile_scale
-    offset_v = row * uv_tile_scale
+def write_uvs(uv_layer, uvs):
+    uv_layer.data.foreach_set("uv", uvs.ravel())
 
-    bpy.ops.mesh.select_mode(type="FACE")
-    bpy.ops.uv.select_all(action="SELECT")
-    bpy.ops.uv.pack_islands(rotate=True, margin=0.05)
+def transform_objects_uv(objs, scales, offsets):
+    uv_layers = [obj.data.uv_layers.active for obj in objs]
+    per_object_uvs = [read_uvs(uv_layer) for uv_layer in uv_layers]
+    loop_counts = [len(uvs) for uvs in per_object_uvs]
+
+    uvs = transform_uvs(np.concatenate(per_object_uvs), loop_counts, scales, offsets)
+
+    for uv_layer, object_uvs, obj in zip(uv_layers, np.split(uvs, np.cumsum(loop_counts)[:-1]), objs):
+        write_uvs(uv_layer, object_uvs)
+        obj.data.update()
+
+@profiled
+def pack_uv_into_rects(objs, rects, atlas_size=4096, pack_islands=True):
+    transforms = [rect_transform(rect, atlas_size) for rect in rects]
+
+    if pack_islands:
+        bpy.ops.mesh.select_mode(type="FACE")
+        bpy.ops.uv.select_all(action="SELECT")
+        bpy.ops.uv.pack_islands(rotate=True, margin=0.05)
 
     bpy.ops.object.mode_set(mode='OBJECT')
 
-    mesh = obj.data
-    uv_layer = mesh.uv_layers.active.data
-    for loop in uv_layer:
-        loop.uv[0] = loop.uv[0] * uv_tile_scale + offset_u
-        loop.uv[1] = loop.uv[1] * uv_tile_scale + offset_v
+    scales = [transform[0] for transform in transforms]
+    offsets = [(transform[1], transform[2]) for transform in transforms]
+    transform_objects_uv(objs, scales, offsets)
 
-    print(f"✅ Packed '{obj.name}' into atlas tile ({col}, {row})")
+    for obj, rect in zip(objs, rects):
+        print(f"✅ Packed '{obj.name}' into atlas {rect['atlas']} rect ({rect['x']}, {rect['y']}, {rect['size']}px)")
+
+def pack_uv_into_tiles(objs, tile_indices, atlas_size=4096, tile_size=512):
+    pack_uv_into_rects(objs, [grid_rect(tile_index, atlas_size, tile_size) for tile_index in tile_indices], atlas_size)
+
+def pack_uv_into_tile(obj, tile_index, atlas_size=4096, tile_size=512):
+    pack_uv_into_tiles([obj], [tile_index], atlas_size, tile_size)
 
 def scale_and_translate_uv(obj, uv_tile_scale, offset_u, offset_v):
-    mesh = obj.data
-    uv_layer = mesh.uv_layers.active.data
-    for loop in uv_layer:
-        loop.uv[0] = loop.uv[0] * uv_tile_scale + offset_u
-        loop.uv[1] = loop.uv[1] * uv_tile_scale + offset_v
+    transform_objects_uv([obj], [uv_tile_scale], [(offset_u, offset_v)])
 
 def set_bake_result_material(mesh, img):
     mesh.data.materials.clear()
@@ -131,18 +344,50 @@ def set_bake_result_material(mesh, img):
     img_tex_node.select = True
     material.node_tree.nodes.active = img_tex_node
 
+@profiled
 def transform_mesh(mesh, transform):
-    mesh.scale.x += transform["scale"]["x"]
-    mesh.scale.y += transform["scale"]["y"]
-    mesh.scale.z += transform["scale"]["z"]
-    mesh.rotation_euler.x += transform["rotation"]["x"]
-    mesh.rotation_euler.y += transform["rotation"]["y"]
-    mesh.rotation_euler.z += transform["rotation"]["z"]
-    mesh.location.x += transform["position"]["x"]
-    mesh.location.y += transform["position"]["y"]
-    mesh.location.z += transform["position"]["z"]
+    location, rotation, scale = compose_transform(mesh.location, mesh.rotation_euler, mesh.scale, transform)
+    mesh.location, mesh.rotation_euler, mesh.scale = location, rotation, scale
     bpy.ops.object.transform_apply(location=True, rotation=True, scale=True)
 
+"""
+Adds the config transform to every object and bakes each object's location, rotation and scale into its mesh,
+like transform_apply but without an operator call per object: one matmul over the vertex (and custom normal)
+arrays per mesh, then the object transform is reset. Objects the fast path cannot handle exactly
+(shared or shape-keyed meshes, children, negative scale, non-XYZ rotation) fall back to transform_mesh.
+:param objs: The objects to transform.
+:param transform: The module's config transform ({"position", "rotation", "scale"} deltas).
+"""
+@profiled
+def apply_transforms(objs, transform):
+    fallback = []
+    for obj in objs:
+        location, rotation, scale = compose_transform(obj.location, obj.rotation_euler, obj.scale, transform)
+        matrix = compose_matrix(location, rotation, scale)
+        mesh_data = obj.data
+        if (obj.type != "MESH" or mesh_data.users > 1 or mesh_data.shape_keys or obj.children
+                or obj.rotation_mode != "XYZ" or np.linalg.det(matrix[:3, :3]) <= 0):
+            fallback.append(obj)
+            continue
+
+        coords = transform_points(read_vertex_coords(mesh_data), matrix).astype(np.float32)
+        normals = read_loop_normals(mesh_data) if mesh_data.has_custom_normals else None
+        mesh_data.vertices.foreach_set("co", coords.ravel())
+        # ✅ foreach_set runs no RNA update: refresh the normal spaces of the moved geometry before encoding custom normals (as build_mesh does)
+        mesh_data.update()
+        if normals is not None:
+            normals = normals @ np.linalg.inv(matrix[:3, :3])  # inverse transpose, row vectors
+            write_loop_normals(mesh_data, normals / np.maximum(np.linalg.norm(normals, axis=1, keepdims=True), 1e-12))
+        obj.location, obj.rotation_euler, obj.scale = (0, 0, 0), (0, 0, 0), (1, 1, 1)
+
+    for obj in fallback:
+        select_none()
+        obj.select_set(True)
+        transform_mesh(obj, transform)
+    if fallback:
+        for obj in objs:
+            obj.select_set(True)
+
 def create_collection(name):
     collection = bpy.data.collections.new(name=name)
     bpy.context.scene.collection.children.link(collection)
@@ -161,12 +406,115 @@ def duplicate_collection(source, name):
         output_collection.objects.link(duplicate)
     return output_collection
 
+MERGE_PARTS_PROPERTY = "merge_parts"
+
+"""
+Merges every mesh of a collection into its first object with the data API (no bpy.ops.object.join):
+mesh arrays are concatenated with NumPy and built into one mesh. Material slots are merged by material,
+UV layers and attributes by name, edge flags are kept, and parts are moved into the first object's space, as join does.
+Parts with data the mesh arrays cannot carry (vertex groups, shape keys, conflicting attributes) are merged with join.
+The per-part vertex/edge/loop/polygon ranges are stored on the merged object (see split_merged_parts);
+they only hold until the topology changes.
+:return: The merged object, selected and active.
+"""
+@profiled
 def merge_collection(collection):
+    objs = [obj for obj in collection.objects if obj.type == "MESH"]
+    reason = mesh_arrays_loss_reason(objs)
+    if reason:
+        return join_objects(objs, reason)
+
+    target = objs[0]
+    part_arrays = [read_mesh_arrays(obj.data) for obj in objs]
+    conflicts = conflicting_attributes(part_arrays)
+    if conflicts:
+        return join_objects(objs, f"attributes {', '.join(conflicts)} differ in type between parts")
+
+    to_target = np.linalg.inv(np.array(target.matrix_world))
+    # ✅ As join does, custom normals of some parts keep the others' shading: their computed corner normals are stored too
+    keep_normals = any(obj.data.has_custom_normals for obj in objs)
+    materials = []
+    parts = []
+    for obj, arrays in zip(objs, part_arrays):
+        matrix = to_target @ np.array(obj.matrix_world)
+        arrays["co"] = transform_points(arrays["co"], matrix)
+        if keep_normals:
+            normals = read_loop_normals(obj.data) @ np.linalg.inv(matrix[:3, :3])  # inverse transpose, row vectors
+            arrays["loop_normal"] = normals / np.maximum(np.linalg.norm(normals, axis=1, keepdims=True), 1e-12)
+
+        slot_map = []
+        for material in obj.data.materials:
+            if material not in materials:
+                materials.append(material)
+            slot_map.append(materials.index(material))
+        if slot_map:
+            arrays["material_index"] = np.asarray(slot_map, dtype=np.int32)[arrays["material_index"]]
+        parts.append(arrays)
+
+    merged_arrays, part_table = concat_mesh_arrays(parts)
+    old_data = target.data
+    mesh_name = old_data.name
+    target.data = build_mesh(mesh_name, merged_arrays, materials)
+    target[MERGE_PARTS_PROPERTY] = json.dumps(dict(part_table, names=[obj.name for obj in objs]))
+
+    removed_data = [obj.data for obj in objs[1:]] + [old_data]
+    for obj in objs[1:]:
+        bpy.data.objects.remove(obj, do_unlink=True)
+    bpy.data.batch_remove([mesh_data for mesh_data in set(removed_data) if mesh_data.users == 0])
+    target.data.name = mesh_name
+
     bpy.ops.object.select_all(action="DESELECT")
-    for obj in collection.objects:
+    target.select_set(True)
+    bpy.context.view_layer.objects.active = target
+    return target
+
+"""
+Merges objects into the first one with bpy.ops.object.join, for parts merge_collection cannot merge without loss.
+No part table is stored, so the result cannot be split with split_merged_parts.
+"""
+def join_objects(objs, reason):
+    print(f"⚠ Merging with join, {reason}")
+    target = objs[0]
+    bpy.ops.object.select_all(action="DESELECT")
+    for obj in objs:
         obj.select_set(True)
-    bpy.context.view_layer.objects.active = bpy.context.selected_objects[0]
+    bpy.context.view_layer.objects.active = target
     bpy.ops.object.join()
+    if MERGE_PARTS_PROPERTY in target:
+        del target[MERGE_PARTS_PROPERTY]
+    return target
+
+"""
+Splits an object merged by merge_collection back into its original parts by slicing its mesh arrays
+with the stored part table; no connectivity analysis is needed.
+Raises ValueError when the topology changed since the merge (the table no longer matches the mesh).
+:return: The part objects, named after the original objects.
+"""
+@profiled
+def split_merged_parts(obj):
+    if MERGE_PARTS_PROPERTY not in obj:
+        raise ValueError(f"{obj.name} has no part table, it was not merged by merge_collection or was joined")
+    part_table = json.loads(obj[MERGE_PARTS_PROPERTY])
+    arrays = read_mesh_arrays(obj.data)
+    if not part_table_matches(arrays, part_table):
+        raise ValueError(f"Topology of {obj.name} changed since it was merged, its part table no longer applies")
+    if obj.data.has_custom_normals:
+        arrays["loop_normal"] = read_loop_normals(obj.data)
+    materials = list(obj.data.materials)
+
+    parts = []
+    for index, name in enumerate(part_table["names"]):
+        part_obj = bpy.data.objects.new(name, build_mesh(name, slice_mesh_arrays(arrays, part_table, index), materials))
+        part_obj.matrix_world = obj.matrix_world.copy()
+        for collection in obj.users_collection:
+            collection.objects.link(part_obj)
+        parts.append(part_obj)
+
+    mesh_data = obj.data
+    bpy.data.objects.remove(obj, do_unlink=True)
+    if mesh_data.users == 0:
+        bpy.data.meshes.remove(mesh_data)
+    return parts
 
 def create_image_for_baking(name, size):
     ao_image = bpy.data.images.new(name=name, width=size, height=size, alpha=False, float_buffer=True)
@@ -0,0 +1,184 @@
+# ✅ Standard Python Modules
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from queue import Queue
+
+# ✅ Custom Imports
+from bake_tiles import BAKE_TILES
+from bake_tiles import compose_atlases
+from bake_tiles import write_atlas_layout
+from build_cache import code_version
+from build_cache import find_stale_outputs
+from build_cache import is_up_to_date
+from build_cache import load_manifest
+from build_cache import module_key
+from build_cache import record_composed
+from build_cache import record_module
+from build_cache import save_manifest
+from job_plan import load_job_plan
+from worker_client import run_remote_module
+
+directory = os.path.dirname(os.path.abspath(__file__))
+worker_script = os.path.join(directory, "pipeline_worker.py")
+# ✅ Compiles and validates the job plan up front; workers load the same plan, so cache keys match
+plan = load_job_plan(directory)
+config = plan["modules"]
+
+# ✅ Runs every module in its own headless Blender process, N at a time:
+# python3 parallel_main.py --workers 6 --blender /Applications/Blender.app/Contents/MacOS/Blender
+# ✅ Or sends them to long-lived worker servers (see worker_server.py):
+# python3 parallel_main.py --servers 47800 47801
+
+
+"""
+Runs a single module in an isolated `blender --background` process.
+:param blender: Path to the Blender executable.
+:param module: The module name (config key).
+:param parts_dir: Directory where the worker writes its partial JSON result.
+:param logs_dir: Directory for the worker's combined stdout/stderr log.
+:param timeout: (Optional) Seconds before the worker is killed (default: no limit).
+:return: A dict with the module name, status, duration and parts (None on failure).
+"""
+def run_module(blender, module, parts_dir, logs_dir, timeout=None):
+    parts_path = os.path.join(parts_dir, module + ".json")
+    log_path = os.path.join(logs_dir, module + ".log")
+    command = [blender, "--background", "--factory-startup", "--python", worker_script, "--", "--module", module, "--output", parts_path]
+
+    start = time.perf_counter()
+    with open(log_path, "w") as log_file:
+        try:
+            returncode = subprocess.run(command, stdout=log_file, stderr=subprocess.STDOUT, timeout=timeout).returncode
+        except subprocess.TimeoutExpired:
+            returncode = "timeout"
+    duration = time.perf_counter() - start
+
+    parts = None
+    outputs = []
+    if returncode == 0 and os.path.exists(parts_path):
+        with open(parts_path) as parts_file:
+            worker_result = json.load(parts_file)
+        parts = worker_result["parts"]
+        outputs = worker_result["outputs"]
+    status = "ok" if parts is not None else "failed"
+    print(f"{'✅' if parts is not None else '❌'} {module} {status} in {duration:.1f}s (log: {log_path})")
+    return {"module": module, "status": status, "returncode": returncode, "duration": duration, "parts": parts, "outputs": outputs}
+
+
+"""
+Runs a single module on a long-lived worker server (see worker_server.py).
+:param port: The server port.
+:param module: The module name (config key).
+:param version: The pipeline code version; a server started from other code refuses the job.
+:param timeout: (Optional) Seconds to wait for the job (default: no limit).
+:return: The same result dict as run_module.
+"""
+def run_module_on_server(port, module, version, timeout=None):
+    start = time.perf_counter()
+    try:
+        reply = run_remote_module(module, port, version, timeout)
+    except OSError as error:
+        reply = {"status": "failed", "parts": None, "outputs": [], "error": str(error)}
+    duration = time.perf_counter() - start
+
+    status = reply["status"]
+    print(f"{'✅' if status == 'ok' else '❌'} {module} {status} in {duration:.1f}s (server: {port})")
+    if reply.get("error"):
+        print(reply["error"])
+    return {"module": module, "status": status, "returncode": None, "duration": duration, "parts": reply["parts"], "outputs": reply["outputs"]}
+
+
+"""
+Shards the module config across a pool of Blender worker processes and merges their results.
+:param modules: Module names to run, in output order.
+:param blender: Path to the Blender executable.
+:param workers: Number of concurrent Blender processes.
+:param json_output_path: Where the merged sofa_parts JSON is written.
+:param timeout: (Optional) Per-module timeout in seconds.
+:param force_rebuild: (Optional) Rebuild every module even when the build manifest says it is up to date.
+:param servers: (Optional) Ports of worker servers to send jobs to instead of starting a Blender process per module.
+:return: The list of per-module results for the modules that were rebuilt.
+"""
+def run_parallel(modules, blender, workers, json_output_path, timeout=None, force_rebuild=False, servers=None):
+    logs_dir = os.path.join(directory, "logs")
+    os.makedirs(logs_dir, exist_ok=True)
+    write_atlas_layout(plan, directory)
+
+    # ✅ Only modules whose inputs, config or outputs changed go to the worker pool
+    manifest = load_manifest(directory)
+    version = code_version(directory)
+    keys = {module: module_key(config[module], directory, version) for module in modules}
+    skipped = [module for module in modules if not force_rebuild and is_up_to_date(manifest, module, keys[module], directory)]
+    pending = [module for module in modules if module not in skipped]
+    for module in skipped:
+        print(f"⏭ {module} is up to date, skipped.")
+
+    if servers:
+        # ✅ Each server runs one job at a time; a job borrows a free port and hands it back when done
+        free_ports = Queue()
+        for port in servers:
+            free_ports.put(port)
+
+        def run_on_free_server(module):
+            port = free_ports.get()
+            try:
+                return run_module_on_server(port, module, version, timeout)
+            finally:
+                free_ports.put(port)
+
+        with ThreadPoolExecutor(max_workers=len(servers)) as pool:
+            results = list(pool.map(run_on_free_server, pending))
+    else:
+        with tempfile.TemporaryDirectory(prefix="sofa_parts_") as parts_dir:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(lambda module: run_module(blender, module, parts_dir, logs_dir, timeout), pending))
+
+    for result in results:
+        if result["status"] == "ok":
+            record_module(manifest, result["module"], keys[result["module"]], result["outputs"], result["parts"], directory)
+    # ✅ Compose Baked Atlases From Every Module's Tile Checkpoints
+    if BAKE_TILES:
+        record_composed(manifest, compose_atlases(plan, directory), directory)
+    save_manifest(manifest, directory)
+    for stale_output in find_stale_outputs(manifest, config.keys(), directory):
+        print(f"⚠ Stale output not produced by the current build: {stale_output}")
+
+    parts_by_module = {module: manifest[module]["parts"] for module in skipped}
+    parts_by_module.update({result["module"]: result["parts"] for result in results if result["parts"] is not None})
+    sofa_parts = {module: parts_by_module[module] for module in modules if module in parts_by_module}
+    with open(json_output_path, "w") as json_file:
+        json.dump(sofa_parts, json_file, indent=4)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the sofa pipeline across a pool of headless Blender processes.")
+    parser.add_argument("--blender", default=os.environ.get("BLENDER", "blender"))
+    parser.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 2) // 2))
+    parser.add_argument("--timeout", type=float, default=None)
+    parser.add_argument("--output", default=os.path.join(directory, "sofa_parts.json"))
+    parser.add_argument("--force", action="store_true", help="Rebuild modules even when they are up to date.")
+    parser.add_argument("--servers", type=int, nargs="+", metavar="PORT", help="Send jobs to running worker servers instead of starting Blender per module.")
+    parser.add_argument("modules", nargs="*", help="Module names to run (default: every module in the config).")
+    args = parser.parse_args()
+
+    modules = args.modules or list(config.keys())
+    unknown = [module for module in modules if module not in config]
+    if unknown:
+        parser.error(f"unknown modules: {', '.join(unknown)}")
+
+    results = run_parallel(modules, args.blender, args.workers, args.output, args.timeout, args.force, args.servers)
+    failed = [result["module"] for result in results if result["status"] != "ok"]
+    print(f"💾 Merged {len(results) - len(failed)}/{len(results)} modules into {args.output}")
+    if failed:
+        print(f"⚠ Failed modules: {', '.join(failed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+# ✅ Standard Python Modules
+import os
+
+# ✅ Blender Modules
+import bpy  # type: ignore
+
+# ✅ Custom Imports
+from mesh_utils import assign_material
+from mesh_utils import select_mesh
+from mesh_utils import select_none
+from mesh_utils import split_selected_mesh
+from mesh_utils import split_collection_loose_parts
+from mesh_utils import set_object_mode
+from mesh_utils import set_edit_mode
+from mesh_utils import decimate_mesh
+from mesh_utils import transform_mesh
+from mesh_utils import flush_collection
+from mesh_utils import create_collection
+from mesh_utils import pack_uv_into_rects
+from mesh_utils import merge_collection
+from mesh_utils import add_ligthmap_channel
+from mesh_utils import unwrap_uv
+from mesh_utils import pack_uv
+from mesh_utils import set_bake_result_material
+from sofa_utils import categorize_meshes_in_collection, combine_images_to_rgb
+from sofa_utils import export_meshes_from_collection
+from sofa_utils import setup_bake
+from sofa_utils import bake
+from common import save_scene
+from bake_scheduler import bake_module_tiles
+from bake_tiles import BAKE_TILES
+from bake_tiles import BAKE_TYPES
+from lightmap_uv import generate_lightmap_uvs
+from import_cache import import_fbx
+from decimation import build_lod_collection
+from core.export_names import is_exported
+from profiling import stage
+from sofa_utils import apply_quality
+
+# ✅ "fbx" and/or "glb", written in the same pass; "separate" file per part or one batched file per "module"
+EXPORT_FORMATS = ["fbx"]
+EXPORT_MODE = "separate"
+# ✅ Unwrap lightmap UVs with Smart UV Project instead of packing the copied base UVs
+LIGHTMAP_UNWRAP = False
+BAKE_THREADS = 0  # 0 = let Cycles use every core
+# ✅ Rebuild imported meshes from sofa_import_cache/ instead of re-parsing unchanged FBX files
+IMPORT_CACHE = True
+# ✅ Besides the data-blocks each module created, purge every orphan in the file after each module
+PURGE_ORPHANS = False
+
+
+"""
+Runs one module through import → lightmap → merge → UV pack → split → categorize → export → LODs.
+Expects the scene and studio to be set up already; leaves the scene clean for the next module.
+:param module: The module name (config key), used for naming exported parts.
+:param cfg: The module's planned config entry, with its "atlas_rect" (see atlas_allocator.planned_config).
+:param directory: The project directory that input and output paths are relative to.
+:param atlas_settings: The job plan's atlas settings ("atlas_size", "texels_per_meter", ...).
+:param ao_image: (Optional) Shared AO bake target.
+:param combined_image: (Optional) Shared combined bake target.
+:param outputs: (Optional) A list that receives the path of every file the module writes.
+:return: The module's categorized parts with their centers.
+"""
+def process_module(module, cfg, directory, atlas_settings, ao_image=None, combined_image=None, outputs=None):
+    image_size = atlas_settings["atlas_size"]
+    # ✅ Import Input Models
+    # input_collection = create_collection("INPUT")
+    # fbx_file_path = os.path.join(directory, cfg["highpoly_filepath"])
+    # bpy.ops.import_scene.fbx(filepath=fbx_file_path)
+    # for obj in bpy.context.selected_objects:
+    #     transform_mesh(obj, cfg["transform"])
+    #     input_collection.objects.link(obj)
+    #     bpy.context.scene.collection.objects.unlink(obj)
+
+    output_collection = create_collection("OUTPUT")
+    with stage("import", module, output_collection.objects):
+        fbx_file_path = os.path.join(directory, cfg["lowpoly_filepath"])
+        import_fbx(fbx_file_path, cfg["transform"], output_collection, directory, IMPORT_CACHE)
+
+    print("✅ Models imported!")
+
+
+    # ✅ Apply Decimate Modifiers
+    # if (cfg["decimate"]["apply"]):
+    #     for obj in output_collection.objects:
+    #         decimate_mesh(obj, cfg["decimate"])
+    # print("✅ Decimate applied!")
+
+
+    # ✅ Add Lightmap UV Channel
+    with stage("lightmap", module, output_collection.objects):
+        for obj in output_collection.objects:
+            add_ligthmap_channel(obj)
+    print("✅ UV Lightmap added!")
+
+    # ✅ Unwrap and Pack Lightmap UVs of All Parts at Once (cached per input mesh)
+    if LIGHTMAP_UNWRAP:
+        with stage("lightmap_unwrap", module, output_collection.objects):
+            generate_lightmap_uvs(list(output_collection.objects), cfg["atlas_rect"]["size"], cfg["bake"], directory, atlas_settings["texels_per_meter"])
+        print("✅ UV Lightmap unwrapped!")
+
+
+
+    # ✅ Merge Models
+    # merge_collection(input_collection)
+    with stage("merge", module, output_collection.objects):
+        merge_collection(output_collection)
+    print("✅ Collection merged!")
+
+    # for obj in input_collection.objects:
+    #     assign_material(obj, "input")
+
+    # # ✅ Create 4K AO Image for Baking
+    # ao_image = create_image_for_baking("Baked_AO_4K", 4096)
+    # ao_output_path = os.path.join(directory, "sofa_ao/" + module + "_AO.hdr")
+    # # ✅ Create 4K Combined Image for Baking
+    # combined_image = create_image_for_baking("Baked_Combined_4K", 4096)
+    # combined_output_path = os.path.join(directory, "sofa_combined/" + module + "_Combined.hdr")
+
+
+    # ✅ Prepare UVs
+    set_edit_mode()
+    # ✅ Unwrapping UV
+    # unwrap_uv()
+    # ✅ Packing UV
+    # pack_uv()
+
+    output_objects = list(output_collection.objects)
+    with stage("uv_pack", module, output_objects):
+        pack_uv_into_rects(output_objects, [cfg["atlas_rect"]] * len(output_objects), image_size, pack_islands=not LIGHTMAP_UNWRAP)
+
+    # ✅ Tiled Baking (own tile-sized image per module and bake type, checkpointed for resume)
+    if BAKE_TILES and cfg["bake"]["apply"]:
+        with stage("bake", module, output_objects):
+            apply_quality(cfg["quality"], BAKE_THREADS)
+            checkpoint_paths = bake_module_tiles(output_objects, module, cfg, BAKE_TYPES, image_size, directory)
+        if (outputs != None): outputs.extend(checkpoint_paths)
+        print("✅ Bake tiles ready!")
+
+    # ✅ Prepare Material for AO Baking
+    # for obj in output_collection.objects:
+    #     set_bake_result_material(obj, ao_image)
+    # print("✅ Materials ready for AO baking!")
+
+    # ✅ AO Baking
+    # set_object_mode()
+    # select_none()
+    # # for obj in input_collection.objects:
+    # #     obj.select_set(True)
+    # for obj in output_collection.objects:
+    #     obj.select_set(True)
+    #     bpy.context.view_layer.objects.active = obj
+    # setup_bake(cfg["bake"])
+    # if (cfg["bake"]["apply"]):
+    #     bake(ao_image, cfg["bake"], "AO")
+
+    # # ✅ Prepare Material for Combined Baking
+    # for obj in output_collection.objects:
+    #     set_bake_result_material(obj, combined_image)
+    # print("✅ Materials ready for Combined baking!")
+
+    # # ✅ Combined Baking
+    # set_object_mode()
+    # select_none()
+    # # for obj in input_collection.objects:
+    # #     obj.select_set(True)
+    # for obj in output_collection.objects:
+    #     obj.select_set(True)
+    #     bpy.context.view_layer.objects.active = obj
+    # setup_bake(cfg["bake"])
+    # if (cfg["bake"]["apply"]):
+    #     bake(combined_image, cfg["bake"], "COMBINED")
+
+
+    # fin_output_path = os.path.join(directory, "sofa_final/" + module + "_FIN.hdr")
+    # fin_image = combine_images_to_rgb(ao_image, combined_image)
+    # fin_image.filepath_raw = fin_output_path
+    # fin_image.file_format = "HDR"
+    # fin_image.save()
+    # print(f"💾 Baked texture resized and saved as HDR: {fin_image}")
+
+
+
+    # ✅ Separate Output Meshes
+    with stage("split", module, output_collection.objects):
+        split_collection_loose_parts(output_collection)
+    # select_none()
+    # for obj in input_collection.objects:
+    #     select_mesh(obj)
+    # split_selected_mesh()
+    print("✅ Meshes in collections separated!")
+
+
+    # ✅ Categorize and Export Meshes in Collections
+    module_parts = {
+        "legs": [],
+        "seat": [],
+        "backrest": [],
+        "headrest": [],
+    }
+    with stage("categorize", module, output_collection.objects):
+        categorize_meshes_in_collection(output_collection, module, module_parts)
+    # categorize_meshes_in_collection(input_collection, module, module_parts)
+    # export_meshes_from_collection(output_collection, directory, "glb")
+    with stage("export", module, output_collection.objects):
+        exported_paths = export_meshes_from_collection(output_collection, directory, EXPORT_FORMATS, EXPORT_MODE, module)
+    if (outputs != None): outputs.extend(exported_paths)
+    print("✅ Exports done!")
+
+    # ✅ Decimated LODs of the Exported Parts (triangle budgets per module in cfg["lods"], cached per part)
+    lod_parts = [obj for obj in output_collection.objects if is_exported(obj.name)]
+    for level, budget in cfg["lods"].items():
+        if budget is None:
+            continue
+        with stage("lod", module, lod_parts):
+            lod_collection = build_lod_collection(lod_parts, budget, level, directory)
+            lod_paths = export_meshes_from_collection(lod_collection, directory, EXPORT_FORMATS, EXPORT_MODE, module + "_" + level)
+            flush_collection(lod_collection)
+        if (outputs != None): outputs.extend(lod_paths)
+        print(f"✅ {level} exported!")
+
+
+    # ✅ Save Blend File
+    # blend_file_path = os.path.join(directory, "sofa_blend/" + module + ".blend")
+    # save_scene(blend_file_path)
+
+
+
+    # ✅ Clean the scene
+    # flush_collection(input_collection)
+    with stage("flush", module):
+        flush_collection(output_collection)
+    print("✅ Scene is clean!")
+
+    return module_parts
@@ -0,0 +1,51 @@
+# ✅ Standard Python Modules
+import argparse
+import os
+import sys
+import traceback
+
+# ✅ Ensure Blender Can Find the Config Module
+script_dir = os.path.dirname(os.path.abspath(__file__))
+if script_dir not in sys.path:
+    sys.path.append(script_dir)
+
+# ✅ Custom Imports
+from job_plan import load_job_plan
+from common import save_in_json
+from sofa_utils import setup_scene
+from sofa_utils import setup_studio
+from pipeline import process_module
+from profiling import settings as profiling_settings
+from profiling import write_report
+
+# ✅ Headless worker for one module, started by parallel_main.py:
+# blender --background --python pipeline_worker.py -- --module S01_FR_D05_W06 --output parts/S01_FR_D05_W06.json
+
+def parse_args():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(description="Run one sofa module through the pipeline.")
+    parser.add_argument("--module", required=True)
+    parser.add_argument("--output", required=True)
+    return parser.parse_args(argv)
+
+
+def main():
+    args = parse_args()
+    plan = load_job_plan(script_dir)
+    setup_scene()
+    setup_studio()
+    try:
+        outputs = []
+        module_parts = process_module(args.module, plan["modules"][args.module], script_dir, plan["atlas_settings"], outputs=outputs)
+    except Exception:
+        traceback.print_exc()
+        sys.exit(1)
+    save_in_json({"module": args.module, "parts": module_parts, "outputs": outputs}, args.output)
+    if profiling_settings["enabled"]:
+        profiles_dir = os.path.join(script_dir, "profiles")
+        os.makedirs(profiles_dir, exist_ok=True)
+        write_report(os.path.join(profiles_dir, args.module + ".json"), os.path.join(profiles_dir, args.module + ".csv"))
+    print(f"✅ Worker finished module: {args.module}")
+
+
+main()
@@ -0,0 +1,164 @@
+import cProfile
+import csv
+import json
+import os
+import resource
+import sys
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+
+# ✅ SOFA_PROFILE=1 records stages, SOFA_PROFILE_DIR=<dir> also dumps a cProfile file per top-level stage
+settings = {
+    "enabled": os.environ.get("SOFA_PROFILE") == "1",
+    "profile_dir": os.environ.get("SOFA_PROFILE_DIR"),
+}
+records = []
+_state = {"module": None, "depth": 0, "peaks": [], "process_peak": 0}
+
+# ✅ peak_rss is the stage's own resident high-water mark (Linux; None elsewhere), process_peak_rss the process-lifetime peak
+REPORT_FIELDS = ["module", "stage", "depth", "wall_time", "cpu_time", "peak_rss", "process_peak_rss", "rss_delta", "objects", "vertices"]
+
+
+"""
+Returns the peak resident set size of this process in bytes, including peaks from before stage resets
+(clearing VmHWM also clears ru_maxrss on Linux).
+"""
+def peak_rss():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max(peak if sys.platform == "darwin" else peak * 1024, _state["process_peak"])
+
+
+"""
+Returns the current resident set size of this process in bytes (the peak where /proc is not available).
+"""
+def current_rss():
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return peak_rss()
+
+
+"""
+Reads the resident high-water mark (VmHWM) in bytes, or None where /proc is not available.
+"""
+def high_water_rss():
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+"""
+Starts a new high-water mark window: the running peak of every open stage is updated first, then
+VmHWM is reset to the current RSS through /proc/self/clear_refs (Linux).
+:return: True when the mark was reset.
+"""
+def reset_high_water_rss():
+    peak = high_water_rss()
+    if peak is None:
+        return False
+    _state["peaks"] = [max(open_peak, peak) for open_peak in _state["peaks"]]
+    _state["process_peak"] = max(_state["process_peak"], peak)
+    try:
+        with open("/proc/self/clear_refs", "w") as clear_refs:
+            clear_refs.write("5")
+    except OSError:
+        return False
+    return True
+
+
+def count_geometry(objects):
+    object_count = vertex_count = 0
+    for obj in objects:
+        object_count += 1
+        data = getattr(obj, "data", None)
+        vertex_count += len(data.vertices) if hasattr(data, "vertices") else 0
+    return object_count, vertex_count
+
+
+"""
+Records wall time, CPU time, peak RSS and object/vertex counts of a pipeline stage.
+The peak is the stage's own: the high-water mark is reset when a stage starts, and nested stages fold their peaks into
+the enclosing ones. Nested stages are recorded too, under the module of the enclosing stage.
+:param name: The stage name.
+:param module: (Optional) The module the stage runs for (default: the enclosing stage's module).
+:param objects: (Optional) Objects to count when the stage ends, e.g. a live collection.objects.
+"""
+@contextmanager
+def stage(name, module=None, objects=None):
+    if not settings["enabled"]:
+        yield
+        return
+
+    outer_module = _state["module"]
+    _state["module"] = module or outer_module
+    _state["depth"] += 1
+    profiler = cProfile.Profile() if settings["profile_dir"] and _state["depth"] == 1 else None
+
+    rss_before = current_rss()
+    tracks_peak = reset_high_water_rss()
+    _state["peaks"].append(0)
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    if profiler:
+        profiler.enable()
+    try:
+        yield
+    finally:
+        if profiler:
+            profiler.disable()
+        object_count, vertex_count = count_geometry(objects) if objects is not None else (None, None)
+        stage_peak = max(_state["peaks"].pop(), high_water_rss() or 0) if tracks_peak else None
+        if stage_peak is not None:
+            _state["peaks"] = [max(open_peak, stage_peak) for open_peak in _state["peaks"]]
+        records.append({
+            "module": _state["module"],
+            "stage": name,
+            "depth": _state["depth"],
+            "wall_time": time.perf_counter() - wall_start,
+            "cpu_time": time.process_time() - cpu_start,
+            "peak_rss": stage_peak,
+            "process_peak_rss": peak_rss(),
+            "rss_delta": current_rss() - rss_before,
+            "objects": object_count,
+            "vertices": vertex_count,
+        })
+        if profiler:
+            os.makedirs(settings["profile_dir"], exist_ok=True)
+            profiler.dump_stats(os.path.join(settings["profile_dir"], f"{_state['module'] or 'pipeline'}_{name}.prof"))
+        _state["depth"] -= 1
+        _state["module"] = outer_module
+
+
+"""
+Decorator that records every call of a function as a stage named after it.
+"""
+def profiled(function):
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        with stage(function.__name__):
+            return function(*args, **kwargs)
+
+    return wrapper
+
+
+"""
+Writes the recorded stages as JSON and, optionally, CSV.
+:param json_path: Output path of the JSON report.
+:param csv_path: (Optional) Output path of the CSV report.
+"""
+def write_report(json_path, csv_path=None):
+    with open(json_path, "w") as json_file:
+        json.dump(records, json_file, indent=4)
+    if csv_path:
+        with open(csv_path, "w", newline="") as csv_file:
+            writer = csv.DictWriter(csv_file, fieldnames=REPORT_FIELDS)
+            writer.writeheader()
+            writer.writerows(records)
+    print(f"💾 Profiling report saved at: {json_path}")
@@ -0,0 +1,58 @@
+import bpy  # type: ignore
+from contextlib import contextmanager
+from profiling import current_rss
+from profiling import stage
+
+# ✅ bpy.data collections whose data-blocks a module can create
+TRACKED_DATA = ["objects", "meshes", "materials", "images", "textures", "node_groups", "collections", "lights", "cameras", "actions"]
+
+reports = []
+
+
+"""
+Records the session id of every tracked data-block, keyed by bpy.data collection name.
+"""
+def snapshot_data_blocks():
+    return {name: {block.session_uid for block in getattr(bpy.data, name)} for name in TRACKED_DATA}
+
+
+"""
+Lists the data-blocks created since a snapshot, keyed by bpy.data collection name.
+"""
+def new_data_blocks(snapshot):
+    return {name: [block for block in getattr(bpy.data, name) if block.session_uid not in snapshot[name]] for name in TRACKED_DATA}
+
+
+def purge_orphans():
+    if hasattr(bpy.data, "orphans_purge"):
+        bpy.data.orphans_purge(do_recursive=True)
+    else:
+        bpy.ops.outliner.orphans_purge(do_recursive=True)
+
+
+"""
+Removes every data-block a module creates (meshes, materials, images, ...) when the module finishes,
+so a long run keeps a flat memory profile. Data-blocks that existed before, like the studio and shared
+bake images, are kept. The purge is reported and appended to `reports`; with profiling enabled
+it is also recorded as a "purge" stage.
+:param module: The module name, for the report.
+:param full_purge: (Optional) Also purge every orphan data-block left in the file (default: False).
+"""
+@contextmanager
+def tracked_resources(module, full_purge=False):
+    snapshot = snapshot_data_blocks()
+    try:
+        yield
+    finally:
+        with stage("purge", module):
+            created = new_data_blocks(snapshot)
+            rss_before = current_rss()
+            bpy.data.batch_remove([block for blocks in created.values() for block in blocks])
+            if full_purge:
+                purge_orphans()
+            rss_after = current_rss()
+
+        counts = {name: len(blocks) for name, blocks in created.items() if blocks}
+        reports.append({"module": module, "removed": counts, "reclaimed": rss_before - rss_after, "rss": rss_after})
+        summary = ", ".join(f"{count} {name}" for name, count in counts.items()) or "nothing"
+        print(f"🧹 {module}: purged {summary}; reclaimed {(rss_before - rss_after) / 2**20:.1f} MiB, RSS {rss_after / 2**20:.1f} MiB")
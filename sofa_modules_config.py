@@ -1,4 +1,6 @@
 import math
+import os
+from config_compiler import compile_config
 
 default_transform = {
     "position": { "x": 0, "y": 0, "z": 0 },
@@ -36,6 +38,18 @@ no_decimate = {
     "dissolve": math.radians(0),
 }
 
+# ✅ Triangle budget per module for each LOD level: LOD0 is the exported mesh (None keeps it whole),
+# further levels are quadric-decimated copies exported as <part>_<level> (see decimation.py)
+default_lods = {
+    "LOD0": None,
+    "LOD1": 8000,
+    "LOD2": 2500,
+}
+
+no_lods = {
+    "LOD0": None,
+}
+
 default_bake = {
     "apply": True,
     "resolution": 1024,
@@ -44,6 +58,53 @@ default_bake = {
     "margin": 16,
 }
 
+# ✅ Lightmap atlas: "grid" places modules by their "index", "shelf" sizes tiles from the envelope and packs them
+atlas_settings = {
+    "layout": "grid",
+    "atlas_size": 4096*2,
+    "tile_size": 800*2,
+    "texels_per_meter": 1600,
+    "padding": 16,
+}
+
+# ✅ Bake quality profiles: draft/preview for fast iteration, final for shipped atlases
+draft_quality = {
+    "samples": 16,
+    "adaptive_threshold": 0.1,
+    "time_limit": 30,
+    "denoise": True,
+    "device": "GPU",
+}
+
+preview_quality = {
+    "samples": 64,
+    "adaptive_threshold": 0.05,
+    "time_limit": 120,
+    "denoise": True,
+    "device": "GPU",
+}
+
+final_quality = {
+    "samples": 128,
+    "adaptive_threshold": 0.01,
+    "time_limit": 0,
+    "denoise": False,
+    "device": "GPU",
+}
+
+quality_profiles = {
+    "draft": draft_quality,
+    "preview": preview_quality,
+    "final": final_quality,
+}
+
+# ✅ SOFA_QUALITY=draft|preview|final overrides the quality of every module
+def module_quality(cfg):
+    override = os.environ.get("SOFA_QUALITY")
+    if override:
+        return quality_profiles[override]
+    return cfg["quality"]
+
 no_bake = {
     "apply": False,
     "resolution": 1024,
@@ -53,366 +114,61 @@ no_bake = {
 }
 
 
-config = {
-    # "S01_CN_D08_W08": {
-    #     "index": 0,
-    #     "highpoly_filepath": "SOFA_HP/HP_Corner_100x100.fbx",
-    #     "lowpoly_filepath": "SOFA_LP/LP_Corner_100x100.fbx",
-    #     "envelope": { "width": 1, "depth": 1 },
-    #     "transform": default_transform,
-    #     "decimate": no_decimate,
-    #     "bake": default_bake,
-    # },
-    # "S01_CN_D08_W08_N": {
-    #     "index": 1,
-    #     "highpoly_filepath": "SOFA_HP/HP_Corner_100x100_siedzisko.fbx",
-    #     "lowpoly_filepath": "SOFA_LP/LP_Corner_100x100_siedzisko.fbx",
-    #     "envelope": { "width": 1, "depth": 1 },
-    #     "transform": default_transform,
-    #     "decimate": no_decimate,
-    #     "bake": default_bake,
-    # },
-    # "S01_CN_D09_W09": {
-    #     "index": 2,
-    #     "highpoly_filepath": "SOFA_HP/HP_Corner_112_5x112_5.fbx",
-    #     "lowpoly_filepath": "SOFA_LP/LP_Corner_112_5x112_5.fbx",
-    #     "envelope": { "width": 1.125, "depth": 1.125 },
-    #     "transform": default_transform,
-    #     "decimate": no_decimate,
-    #     "bake": default_bake,
-    # },
-    # "S01_CN_D09_W09_N": {
-    #     "index": 3,
-    #     "highpoly_filepath": "SOFA_HP/HP_Corner_112_5x112_5_siedzisko.fbx",
-    #     "lowpoly_filepath": "SOFA_LP/LP_Corner_112_5x112_5_siedzisko.fbx",
-    #     "envelope": { "width": 1.125, "depth": 1.125 },
-    #     "transform": default_transform,
-    #     "decimate": no_decimate,
-    #     "bake": default_bake,
-    # },
-    # "S01_ST_D08_W06": {
-    #     "index": 4,
-    #     "highpoly_filepath": "SOFA_HP/HP_Modul_75x100.fbx",
-    #     "lowpoly_filepath": "SOFA_LP/LP_Modul_75x100.fbx",
-    #     "envelope": { "width": 0.75, "depth": 1 },
-    #     "transform": default_transform,
-    #     "decimate": no_decimate,
-    #     "bake": default_bake,
-    # },
-    # "S01_ST_D08_W07": {
-    #     "index": 5,
-    #     "highpoly_filepath": "SOFA_HP/HP_Modul_87_5x100.fbx",
-    #     "lowpoly_filepath": "SOFA_LP/LP_Modul_87_5x100.fbx",
-    #     "envelope": { "width": 0.875, "depth": 1 },
-    #     "transform": default_transform,
-    #     "decimate": no_decimate,
-    #     "bake": default_bake,
-    # },
-    # "S01_ST_D08_W08": {
-    #     "index": 6,
-    #     "highpoly_filepath": "SOFA_HP/HP_Modul_100x100.fbx",
-    #     "lowpoly_filepath": "SOFA_LP/LP_Modul_100x100.fbx",
-    #     "envelope": { "width": 1, "depth": 1 },
-    #     "transform": default_transform,
-    #     "decimate": no_decimate,
-    #     "bake": default_bake,
-    # },
-    # "S01_ST_D08_W09": {
-    #     "index": 7,
-    #     "highpoly_filepath": "SOFA_HP/HP_Modul_112_5x100.fbx",
-    #     "lowpoly_filepath": "SOFA_LP/LP_Modul_112_5x100.fbx",
-    #     "envelope": { "width": 1.125, "depth": 1 },
-    #     "transform": default_transform,
-    #     "decimate": no_decimate,
-    #     "bake": default_bake,
-    # },
-    # "S01_ST_D09_W06": {
-    #     "index": 8,
-    #     "highpoly_filepath": "SOFA_HP/HP_Modul_75x112_5.fbx",
-    #     "lowpoly_filepath": "SOFA_LP/LP_Modul_75x112_5.fbx",
-    #     "envelope": { "width": 0.75, "depth": 1.125 },
-    #     "transform": default_transform,
-    #     "decimate": no_decimate,
-    #     "bake": default_bake,
-    # },
-    # "S01_ST_D09_W07": {
-    #     "index": 9,
-    #     "highpoly_filepath": "SOFA_HP/HP_Modul_87_5x112_5.fbx",
-    #     "lowpoly_filepath": "SOFA_LP/LP_Modul_87_5x112_5.fbx",
-    #     "envelope": { "width": 0.875, "depth": 1.125 },
-    #     "transform": default_transform,
-    #     "decimate": no_decimate,
-    #     "bake": default_bake,
-    # },
-    # "S01_ST_D09_W08": {
-    #     "index": 10,
-    #     "highpoly_filepath": "SOFA_HP/HP_Modul_100x112_5.fbx",
-    #     "lowpoly_filepath": "SOFA_LP/LP_Modul_100x112_5.fbx",
-    #     "envelope": { "width": 1, "depth": 1.125 },
-    #     "transform": default_transform,
-    #     "decimate": no_decimate,
-    #     "bake": default_bake,
-    # },
-    # "S01_ST_D09_W09": {
-    #     "index": 11,
-    #     "highpoly_filepath": "SOFA_HP/HP_Modul_112_5x112_5.fbx",
-    #     "lowpoly_filepath": "SOFA_LP/LP_Modul_112_5x112_5.fbx",
-    #     "envelope": { "width": 1.125, "depth": 1.125 },
-    #     "transform": default_transform,
-    #     "decimate": no_decimate,
-    #     "bake": default_bake,
-    # },
-    # "S01_CL_D13_W07": {
-    #     "index": 12,
-    #     "highpoly_filepath": "SOFA_HP/HP_Modul_87_5x162_5.fbx",
-    #     "lowpoly_filepath": "SOFA_LP/LP_Modul_87_5x162_5.fbx",
-    #     "envelope": { "width": 0.875, "depth": 1.625 },
-    #     "transform": move_transform,
-    #     "decimate": no_decimate,
-    #     "bake": default_bake,
-    # },
-    # "S01_CL_D13_W08": {
-    #     "index": 13,
-    #     "highpoly_filepath": "SOFA_HP/HP_Modul_100x162_5.fbx",
-    #     "lowpoly_filepath": "SOFA_LP/LP_Modul_100x162_5.fbx",
-    #     "envelope": { "width": 1, "depth": 1.625 },
-    #     "transform": move_transform,
-    #     "decimate": no_decimate,
-    #     "bake": default_bake,
-    # },
-    # "S01_CL_D13_W09": {
-    #     "index": 14,
-    #     "highpoly_filepath": "SOFA_HP/HP_Modul_112_5x162_5.fbx",
-    #     "lowpoly_filepath": "SOFA_LP/LP_Modul_112_5x162_5.fbx",
-    #     "envelope": { "width": 1.125, "depth": 1.625 },
-    #     "transform": move_transform,
-    #     "decimate": no_decimate,
-    #     "bake": default_bake,
-    # },
+# ✅ Module families: every (depth, width) of a size table becomes one module, e.g. FR {5: [6]} → S01_FR_D05_W06
+# "model" is the FBX base name in SOFA_HP/HP_<model>.fbx and SOFA_LP/LP_<model>.fbx; atlas indexes follow this order
+module_series = "S01"
 
-    "S01_FR_D05_W06": {
-        "index": 0,
-        "highpoly_filepath": "SOFA_HP/HP_Ottoman_75x62_5.fbx",
-        "lowpoly_filepath": "SOFA_LP/LP_Ottoman_75x62_5.fbx",
-        "envelope": { "width": 0.75, "depth": 0.625 },
-        "transform": default_transform,
-        "decimate": no_decimate,
-        "bake": default_bake,
-    },
-    "S01_FR_D05_W07": {
-        "index": 1,
-        "highpoly_filepath": "SOFA_HP/HP_Ottoman_87_5x62_5.fbx",
-        "lowpoly_filepath": "SOFA_LP/LP_Ottoman_87_5x62_5.fbx",
-        "envelope": { "width": 0.875, "depth": 0.625 },
-        "transform": default_transform,
-        "decimate": no_decimate,
-        "bake": default_bake,
-    },
-    "S01_FR_D05_W08": {
-        "index": 2,
-        "highpoly_filepath": "SOFA_HP/HP_Ottoman_100x62_5.fbx",
-        "lowpoly_filepath": "SOFA_LP/LP_Ottoman_100x62_5.fbx",
-        "envelope": { "width": 1, "depth": 0.625 },
-        "transform": default_transform,
-        "decimate": no_decimate,
-        "bake": default_bake,
-    },
-    "S01_FR_D05_W09": {
-        "index": 3,
-        "highpoly_filepath": "SOFA_HP/HP_Ottoman_112_5x62_5.fbx",
-        "lowpoly_filepath": "SOFA_LP/LP_Ottoman_112_5x62_5.fbx",
-        "envelope": { "width": 1.125, "depth": 0.625 },
-        "transform": default_transform,
-        "decimate": no_decimate,
-        "bake": default_bake,
-    },
-    "S01_FR_D06_W06": {
-        "index": 4,
-        "highpoly_filepath": "SOFA_HP/HP_Ottoman_75x75.fbx",
-        "lowpoly_filepath": "SOFA_LP/LP_Ottoman_75x75.fbx",
-        "envelope": { "width": 0.75, "depth": 0.75 },
-        "transform": default_transform,
-        "decimate": no_decimate,
-        "bake": default_bake,
-    },
-    "S01_FR_D06_W07": {
-        "index": 5,
-        "highpoly_filepath": "SOFA_HP/HP_Ottoman_87_5x75.fbx",
-        "lowpoly_filepath": "SOFA_LP/LP_Ottoman_87_5x75.fbx",
-        "envelope": { "width": 0.875, "depth": 0.75 },
-        "transform": default_transform,
-        "decimate": no_decimate,
-        "bake": default_bake,
-    },
-    "S01_FR_D06_W08": {
-        "index": 6,
-        "highpoly_filepath": "SOFA_HP/HP_Ottoman_100x75.fbx",
-        "lowpoly_filepath": "SOFA_LP/LP_Ottoman_100x75.fbx",
-        "envelope": { "width": 1, "depth": 0.75 },
-        "transform": default_transform,
-        "decimate": no_decimate,
-        "bake": default_bake,
-    },
-    "S01_FR_D06_W09": {
-        "index": 7,
-        "highpoly_filepath": "SOFA_HP/HP_Ottoman_112_5x75.fbx",
-        "lowpoly_filepath": "SOFA_LP/LP_Ottoman_112_5x75.fbx",
-        "envelope": { "width": 1.125, "depth": 0.75 },
-        "transform": default_transform,
-        "decimate": no_decimate,
-        "bake": default_bake,
-    },
-    "S01_FR_D07_W07": {
-        "index": 8,
-        "highpoly_filepath": "SOFA_HP/HP_Ottoman_87_5x87_5.fbx",
-        "lowpoly_filepath": "SOFA_LP/LP_Ottoman_87_5x87_5.fbx",
-        "envelope": { "width": 0.875, "depth": 0.875 },
-        "transform": default_transform,
-        "decimate": no_decimate,
-        "bake": default_bake,
-    },
-    "S01_FR_D07_W08": {
-        "index": 9,
-        "highpoly_filepath": "SOFA_HP/HP_Ottoman_100x87_5.fbx",
-        "lowpoly_filepath": "SOFA_LP/LP_Ottoman_100x87_5.fbx",
-        "envelope": { "width": 1, "depth": 0.875 },
-        "transform": default_transform,
-        "decimate": no_decimate,
-        "bake": default_bake,
-    },
-    "S01_FR_D07_W09": {
-        "index": 10,
-        "highpoly_filepath": "SOFA_HP/HP_Ottoman_112_5x87_5.fbx",
-        "lowpoly_filepath": "SOFA_LP/LP_Ottoman_112_5x87_5.fbx",
-        "envelope": { "width": 1.125, "depth": 0.875 },
-        "transform": default_transform,
-        "decimate": no_decimate,
-        "bake": default_bake,
-    },
-    "S01_FR_D08_W08": {
-        "index": 11,
-        "highpoly_filepath": "SOFA_HP/HP_Ottoman_100x100.fbx",
-        "lowpoly_filepath": "SOFA_LP/LP_Ottoman_100x100.fbx",
-        "envelope": { "width": 1, "depth": 1 },
-        "transform": default_transform,
-        "decimate": no_decimate,
-        "bake": default_bake,
-    },
-    "S01_FR_D08_W09": {
-        "index": 12,
-        "highpoly_filepath": "SOFA_HP/HP_Ottoman_112_5x100.fbx",
-        "lowpoly_filepath": "SOFA_LP/LP_Ottoman_112_5x100.fbx",
-        "envelope": { "width": 1.125, "depth": 1 },
-        "transform": default_transform,
-        "decimate": no_decimate,
-        "bake": default_bake,
-    },
-    "S01_FR_D09_W09": {
-        "index": 13,
-        "highpoly_filepath": "SOFA_HP/HP_Ottoman_112_5x112_5.fbx",
-        "lowpoly_filepath": "SOFA_LP/LP_Ottoman_112_5x112_5.fbx",
-        "envelope": { "width": 1.125, "depth": 1.125 },
-        "transform": default_transform,
-        "decimate": no_decimate,
-        "bake": default_bake,
-    },
-    "S01_FR_D07_W09_N": {
-        "index": 14,
-        "highpoly_filepath": "SOFA_HP/HP_Ottoman_112_5x87_5_siedzisko.fbx",
-        "lowpoly_filepath": "SOFA_LP/LP_Ottoman_112_5x87_5_siedzisko.fbx",
-        "envelope": { "width": 1.125, "depth": 0.875 },
-        "transform": default_transform,
-        "decimate": no_decimate,
-        "bake": default_bake,
-    },
-    "S01_FR_D06_W09_N": {
-        "index": 15,
-        "highpoly_filepath": "SOFA_HP/HP_Ottoman_112_5x75_siedzisko.fbx",
-        "lowpoly_filepath": "SOFA_LP/LP_Ottoman_112_5x75_siedzisko.fbx",
-        "envelope": { "width": 1.125, "depth": 0.75 },
-        "transform": default_transform,
-        "decimate": no_decimate,
-        "bake": default_bake,
-    },
-    "S01_FR_D05_W09_N": {
-        "index": 16,
-        "highpoly_filepath": "SOFA_HP/HP_Ottoman_112_5x62_5_siedzisko.fbx",
-        "lowpoly_filepath": "SOFA_LP/LP_Ottoman_112_5x62_5_siedzisko.fbx",
-        "envelope": { "width": 1.125, "depth": 0.625 },
-        "transform": default_transform,
-        "decimate": no_decimate,
-        "bake": default_bake,
-    },
-    "S01_FR_D07_W08_N": {
-        "index": 17,
-        "highpoly_filepath": "SOFA_HP/HP_Ottoman_100x87_5_siedzisko.fbx",
-        "lowpoly_filepath": "SOFA_LP/LP_Ottoman_100x87_5_siedzisko.fbx",
-        "envelope": { "width": 1, "depth": 0.875 },
-        "transform": default_transform,
-        "decimate": no_decimate,
-        "bake": default_bake,
-    },
-    "S01_FR_D06_W08_N": {
-        "index": 18,
-        "highpoly_filepath": "SOFA_HP/HP_Ottoman_100x75_siedzisko.fbx",
-        "lowpoly_filepath": "SOFA_LP/LP_Ottoman_100x75_siedzisko.fbx",
-        "envelope": { "width": 1, "depth": 0.75 },
-        "transform": default_transform,
-        "decimate": no_decimate,
-        "bake": default_bake,
-    },
-    "S01_FR_D05_W08_N": {
-        "index": 19,
-        "highpoly_filepath": "SOFA_HP/HP_Ottoman_100x62_5_siedzisko.fbx",
-        "lowpoly_filepath": "SOFA_LP/LP_Ottoman_100x62_5_siedzisko.fbx",
-        "envelope": { "width": 1, "depth": 0.625 },
-        "transform": default_transform,
-        "decimate": no_decimate,
-        "bake": default_bake,
-    },
-    "S01_AR_D07_W02": {
-        "index": 20,
-        "highpoly_filepath": "SOFA_HP/HP_Armrest.fbx",
-        "lowpoly_filepath": "SOFA_LP/LP_Armrest.fbx",
-        "envelope": { "width": 0.25, "depth": 0.875 },
-        "transform": default_transform,
-        "decimate": no_decimate,
-        "bake": default_bake,
-    },
-    "S01_FR_D08_W09_N": {
-        "index": 21,
-        "highpoly_filepath": "SOFA_HP/HP_Ottoman_112_5x100_siedzisko.fbx",
-        "lowpoly_filepath": "SOFA_LP/LP_Ottoman_112_5x100_siedzisko.fbx",
-        "envelope": { "width": 1.125, "depth": 1 },
-        "transform": default_transform,
-        "decimate": no_decimate,
-        "bake": default_bake,
-    },
-    "S01_FR_D05_W06_N": {
-        "index": 22,
-        "highpoly_filepath": "SOFA_HP/HP_Ottoman_75x62_5_siedzisko.fbx",
-        "lowpoly_filepath": "SOFA_LP/LP_Ottoman_75x62_5_siedzisko.fbx",
-        "envelope": { "width": 0.75, "depth": 0.625 },
-        "transform": default_transform,
-        "decimate": no_decimate,
-        "bake": default_bake,
-    },
-    "S01_FR_D05_W07_N": {
-        "index": 23,
-        "highpoly_filepath": "SOFA_HP/HP_Ottoman_87_5x62_5_siedzisko.fbx",
-        "lowpoly_filepath": "SOFA_LP/LP_Ottoman_87_5x62_5_siedzisko.fbx",
-        "envelope": { "width": 0.875, "depth": 0.625 },
-        "transform": default_transform,
-        "decimate": no_decimate,
-        "bake": default_bake,
-    },
-    "S01_FR_D06_W07_N": {
-        "index": 24,
-        "highpoly_filepath": "SOFA_HP/HP_Ottoman_87_5x75_siedzisko.fbx",
-        "lowpoly_filepath": "SOFA_LP/LP_Ottoman_87_5x75_siedzisko.fbx",
-        "envelope": { "width": 0.875, "depth": 0.75 },
-        "transform": default_transform,
-        "decimate": no_decimate,
-        "bake": default_bake,
-    },
+module_defaults = {
+    "transform": default_transform,
+    "decimate": no_decimate,
+    "lods": no_lods,
+    "bake": default_bake,
+    "quality": final_quality,
 }
+
+module_families = [
+    {
+        "code": "CN",
+        "model": "Corner_{width}x{depth}",
+        "sizes": {8: [8], 9: [9]},
+        "enabled": False,
+    },
+    {
+        "code": "CN",
+        "suffix": "_N",
+        "model": "Corner_{width}x{depth}_siedzisko",
+        "sizes": {8: [8], 9: [9]},
+        "enabled": False,
+    },
+    {
+        "code": "ST",
+        "model": "Modul_{width}x{depth}",
+        "sizes": {8: [6, 7, 8, 9], 9: [6, 7, 8, 9]},
+        "enabled": False,
+    },
+    {
+        "code": "CL",
+        "model": "Modul_{width}x{depth}",
+        "sizes": {13: [7, 8, 9]},
+        "transform": move_transform,
+        "enabled": False,
+    },
+    {
+        "code": "FR",
+        "model": "Ottoman_{width}x{depth}",
+        "sizes": {5: [6, 7, 8, 9], 6: [6, 7, 8, 9], 7: [7, 8, 9], 8: [8, 9], 9: [9]},
+    },
+    {
+        "code": "FR",
+        "suffix": "_N",
+        "model": "Ottoman_{width}x{depth}_siedzisko",
+        "sizes": {5: [6, 7, 8, 9], 6: [7, 8, 9], 7: [8, 9], 8: [9]},
+    },
+    {
+        "code": "AR",
+        "model": "Armrest",
+        "sizes": {7: [2]},
+    },
+]
+
+config = compile_config(module_families, module_series, module_defaults)
@@ -1,19 +1,71 @@
 import math
 import os
 import bpy  # type: ignore
-from mesh_utils import assign_material, find_mesh_center
+import numpy as np
+from mathutils import Vector  # type: ignore
+from mesh_utils import assign_material, objects_bounds
 from mesh_utils import select_mesh
 from mesh_utils import select_none
 from mesh_utils import rename_mesh
+from core.loose_parts import PART_KEYS
+from core.loose_parts import classify_height
+from core.export_names import module_index
+from core.export_names import plan_exports
+from profiling import profiled
 from common import export_selected_fbx
 from common import export_selected_glb
+from common import save_in_json
+from core.pixel_utils import DEFAULT_MEMORY_BUDGET
+from core.pixel_utils import channel_op
+from core.pixel_utils import grayscale_op
+from core.pixel_utils import stream_bands
+from hdr_writer import stream_image
 
-def setup_scene():
-    # ✅ Initialize Blend File
+def setup_scene(quality=None):
+    # ✅ Initialize Blend File; bake quality comes per module from the job plan (see process_module)
     bpy.ops.wm.read_factory_settings(use_empty=True)
     bpy.context.scene.render.engine = "CYCLES"
-    bpy.context.scene.cycles.device = "GPU"
-    bpy.context.scene.cycles.samples = 128
+    if quality:
+        apply_quality(quality)
+
+
+GPU_DEVICE_TYPES = ["OPTIX", "CUDA", "HIP", "METAL", "ONEAPI"]
+
+def enable_gpu():
+    # ✅ Picks the first compute backend that has a device; False when the machine has no usable GPU
+    cycles_preferences = bpy.context.preferences.addons["cycles"].preferences
+    for device_type in GPU_DEVICE_TYPES:
+        try:
+            cycles_preferences.compute_device_type = device_type
+        except TypeError:
+            continue
+        cycles_preferences.get_devices()
+        gpu_devices = [device for device in cycles_preferences.devices if device.type == device_type]
+        if gpu_devices:
+            for device in gpu_devices:
+                device.use = True
+            return True
+    cycles_preferences.compute_device_type = "NONE"
+    return False
+
+
+def apply_quality(quality, threads=0):
+    cycles = bpy.context.scene.cycles
+    device = quality["device"]
+    if device == "GPU" and not enable_gpu():
+        print("⚠ No GPU available, falling back to CPU.")
+        device = "CPU"
+    cycles.device = device
+    cycles.samples = quality["samples"]
+    cycles.use_adaptive_sampling = quality["adaptive_threshold"] > 0
+    cycles.adaptive_threshold = quality["adaptive_threshold"]
+    cycles.time_limit = quality["time_limit"]
+    cycles.use_denoising = quality["denoise"]
+    if threads:
+        bpy.context.scene.render.threads_mode = "FIXED"
+        bpy.context.scene.render.threads = threads
+    else:
+        bpy.context.scene.render.threads_mode = "AUTO"
 
 
 def setup_studio():
@@ -64,107 +116,178 @@ def bake(image, bake_cfg, bake_type, output_path="None"):
     print("✅ Baking Completed!")
 
     if output_path != "None":
-        image.scale(bake_cfg["resolution"], bake_cfg["resolution"])
-        image.filepath_raw = output_path
-        image.file_format = "HDR"
-        image.save()
-        print(f"💾 Baked texture resized and saved as HDR: {output_path}")
-
-def save_hdr_image(image, resolution, output_path):
-    image.scale(resolution, resolution)
-    image.filepath_raw = output_path
-    image.file_format = "HDR"
-    image.save()
+        save_hdr_image(image, bake_cfg["resolution"], output_path)
+
+@profiled
+def save_hdr_image(image, resolution, output_path, mip_levels=0, memory_budget=DEFAULT_MEMORY_BUDGET):
+    # ✅ Streams row bands of one foreach_get buffer straight to .hdr/.exr, box-filtered to the target resolution (no image.scale copy)
+    width, height = image.size
+    stream_image(image_band_reader([image]), width, height, resolution, output_path, mip_levels, memory_budget)
     print(f"💾 Baked texture resized and saved as HDR: {output_path}")
 
+@profiled
 def categorize_meshes_in_collection(collection, module, module_parts = None):
-    for mesh in collection.objects:
-        center = find_mesh_center(mesh)
+    meshes = list(collection.objects)
+    for mesh, bounds in zip(meshes, objects_bounds(meshes)):
+        center = Vector(bounds["center"])
         select_none()
         select_mesh(mesh)
-        if (center.z < 0.01):
-            rename_mesh(mesh, module + "_LEG")
-            if (module_parts != None): module_parts["legs"].append({ mesh.name: [center.x, center.y, center.z] })
-        elif (center.z > 0.1 and center.z < 0.4):
-            rename_mesh(mesh, module + "_SEAT")
-            if (module_parts != None): module_parts["seat"].append({ mesh.name: [center.x, center.y, center.z] })
-        elif (center.z > 0.4 and center.z < 0.6):
-            rename_mesh(mesh, module + "_BACKREST")
-            if (module_parts != None): module_parts["backrest"].append({ mesh.name: [center.x, center.y, center.z] })
-        else:
-            rename_mesh(mesh, module + "_HEADREST")
-            if (module_parts != None): module_parts["headrest"].append({ mesh.name: [center.x, center.y, center.z] })
-
-
-def export_meshes_from_collection(collection, directory, format):
-    for mesh in collection.objects:
-        select_none()
-        if "." in mesh.name:
-            clean_name = mesh.name.rsplit(".", 1)[0]
-        else:
-            clean_name = mesh.name
-        if not clean_name.endswith("_LEG"):
-            file_path = os.path.join(directory, "sofa_" + format + "/" + clean_name + "." + format)
-            select_mesh(mesh)
-            if format == "glb": export_selected_glb(file_path)
-            if format == "fbx": export_selected_fbx(file_path)
-
-
-def convert_image_to_grayscale(image):
-    print(f"🎨 Converting image '{image.name}' to grayscale...")
+        category = classify_height(center.z)
+        rename_mesh(mesh, module + "_" + category)
+        if (module_parts != None): module_parts[PART_KEYS[category]].append({ mesh.name: [center.x, center.y, center.z] })
 
-    pixels = list(image.pixels)  # Flat list: [R, G, B, A, R, G, B, A, ...]
-    for i in range(0, len(pixels), 4):
-        r, g, b = pixels[i], pixels[i + 1], pixels[i + 2]
-        gray = 0.2126 * r + 0.7152 * g + 0.0722 * b
-        pixels[i] = gray       # R
-        pixels[i + 1] = gray   # G
-        pixels[i + 2] = gray   # B
 
-    image.pixels[:] = pixels
-    image.update()
-    print("✅ Grayscale conversion done.")
+def export_selected(file_path, format):
+    if format == "glb": export_selected_glb(file_path)
+    if format == "fbx": export_selected_fbx(file_path)
 
 
-def write_grayscale_to_channel(image, target_channel="R"):
-    print(f"🎯 Writing grayscale to {target_channel} channel of '{image.name}'...")
-    channel_indices = {"R": 0, "G": 1, "B": 2}
-    target_index = channel_indices[target_channel]
+"""
+Exports the parts of a collection (legs are skipped) as FBX and/or GLB.
+:param collection: The collection with categorized parts.
+:param directory: The project directory; files go to sofa_<format>/.
+:param format: "fbx", "glb" or a list of both to write them in the same pass.
+:param mode: (Optional) "separate" writes one file per part; "module" writes one file per module with every
+             part as its own node, plus a <module>.json index of part names (default: "separate").
+:param module: (Optional) The module name, required for the "module" mode.
+:return: The paths of every file written.
+"""
+@profiled
+def export_meshes_from_collection(collection, directory, format, mode="separate", module=None):
+    formats = [format] if isinstance(format, str) else list(format)
+    meshes = {mesh.name: mesh for mesh in collection.objects}
+    exported_paths = []
+    selected_names = None
 
-    pixels = list(image.pixels)
-    for i in range(0, len(pixels), 4):
-        r, g, b = pixels[i], pixels[i + 1], pixels[i + 2]
-        gray = 0.2126 * r + 0.7152 * g + 0.0722 * b
+    for names, fmt, file_path, index_path in plan_exports(list(meshes), directory, formats, mode, module):
+        # ✅ Jobs come grouped by part (or module), so each selection is made once for all its formats;
+        # one exporter session per file, and a module file holds every part as its own node
+        if names != selected_names:
+            select_none()
+            for name in names:
+                meshes[name].select_set(True)
+            if names:
+                bpy.context.view_layer.objects.active = meshes[names[0]]
+            selected_names = names
+        export_selected(file_path, fmt)
+        exported_paths.append(file_path)
+        if index_path:
+            save_in_json(module_index(module, file_path, names), index_path)
+            exported_paths.append(index_path)
+    return exported_paths
 
-        for j in range(3):  # R, G, B
-            pixels[i + j] = gray if j == target_index else 0.0
 
-    image.pixels[:] = pixels
-    image.update()
-    print(f"✅ Grayscale written to {target_channel} channel.")
+def read_image_pixels(image, out=None):
+    width, height = image.size
+    if out is None:
+        out = np.empty(width * height * image.channels, dtype=np.float32)
+    image.pixels.foreach_get(out)
+    return out
 
 
-def combine_images_to_rgb(r_image, g_image, b_image=None):
-    width, height = r_image.size
-    result_image = bpy.data.images.new("CombinedRGB", width=width, height=height, alpha=True, float_buffer=True)
+"""
+Reads every image once with foreach_get into a float32 buffer (an image listed twice shares one buffer).
+Blender copies the whole pixel buffer into Python floats for every image.pixels slice, so bands are cut
+from these buffers in NumPy instead: the memory budget bounds the band working copies, not the image buffers.
+:return: {image name: flat float32 RGBA buffer}.
+"""
+def read_image_buffers(images):
+    buffers = {}
+    for image in images:
+        if image.name not in buffers:
+            buffers[image.name] = read_image_pixels(image)
+    return buffers
+
+
+def image_band_reader(images, buffers=None):
+    buffers = buffers if buffers is not None else read_image_buffers(images)
+
+    def read_band(index, first_row, end_row):
+        width = images[index].size[0]
+        return buffers[images[index].name][first_row * width * 4:end_row * width * 4]
 
-    r_pixels = list(r_image.pixels)
-    g_pixels = list(g_image.pixels)
-    b_pixels = list(b_image.pixels) if b_image else [0.0] * (width * height * 4)
+    return read_band
 
-    combined_pixels = [0.0] * (width * height * 4)
 
-    for i in range(0, len(combined_pixels), 4):
-        # Compute grayscale from each image
-        r_gray = 0.2126 * r_pixels[i] + 0.7152 * r_pixels[i + 1] + 0.0722 * r_pixels[i + 2]
-        g_gray = 0.2126 * g_pixels[i] + 0.7152 * g_pixels[i + 1] + 0.0722 * g_pixels[i + 2]
-        b_gray = 0.2126 * b_pixels[i] + 0.7152 * b_pixels[i + 1] + 0.0722 * b_pixels[i + 2] if b_image else 0.0
+def image_band_writer(buffer, width):
+    def write_band(first_row, end_row, band):
+        target = buffer[first_row * width * 4:end_row * width * 4]
+        if not np.shares_memory(target, band):
+            target[...] = band
 
-        combined_pixels[i] = r_gray     # R
-        combined_pixels[i + 1] = g_gray # G
-        combined_pixels[i + 2] = b_gray # B
-        combined_pixels[i + 3] = 1.0    # Alpha
+    return write_band
 
-    result_image.pixels[:] = combined_pixels
+
+def image_channel_writer(buffer, width, channel):
+    def write_band(first_row, end_row, band):
+        buffer[first_row * width * 4:end_row * width * 4].reshape(-1, 4)[:, channel] = band.reshape(-1, 4)[:, channel]
+
+    return write_band
+
+
+"""
+Runs a band operation over source images into a target image: one foreach_get per source, bands processed
+in NumPy, one foreach_set for the target. A target that is also a source is updated in its own buffer.
+The whole images are held as buffers (Blender only reads and writes whole pixel buffers); memory_budget
+only bounds the band working copies of the core band engine (see core.pixel_utils.stream_bands).
+"""
+def process_image(target_image, source_images, op, memory_budget=DEFAULT_MEMORY_BUDGET):
+    width, height = target_image.size
+    buffers = read_image_buffers(source_images)
+    target = buffers.get(target_image.name)
+    if target is None:
+        target = np.empty(width * height * 4, dtype=np.float32)
+    stream_bands(
+        image_band_reader(source_images, buffers),
+        image_band_writer(target, width),
+        width,
+        height,
+        op,
+        source_count=len(source_images),
+        memory_budget=memory_budget,
+    )
+    target_image.pixels.foreach_set(target)
+    target_image.update()
+
+
+"""
+Converts an image to grayscale (Rec. 709 luminance) in place. Holds one full image buffer;
+memory_budget only bounds the band working copies (see process_image).
+"""
+@profiled
+def convert_image_to_grayscale(image, memory_budget=DEFAULT_MEMORY_BUDGET):
+    print(f"🎨 Converting image '{image.name}' to grayscale...")
+    process_image(image, [image], grayscale_op, memory_budget)
+    print("✅ Grayscale conversion done.")
+
+
+"""
+Writes an image's luminance into one channel and clears the other two, in place. Holds one full image buffer;
+memory_budget only bounds the band working copies (see process_image).
+"""
+@profiled
+def write_grayscale_to_channel(image, target_channel="R", memory_budget=DEFAULT_MEMORY_BUDGET):
+    print(f"🎯 Writing grayscale to {target_channel} channel of '{image.name}'...")
+    process_image(image, [image], channel_op(target_channel), memory_budget)
+    print(f"✅ Grayscale written to {target_channel} channel.")
+
+
+"""
+Packs the luminance of up to three images into the R, G and B channels of a new image (B is 0 without b_image).
+Sources are read one at a time: each is read, streamed into its channel of the target buffer and released,
+so at most two full image buffers are held whatever the image count. memory_budget only bounds the band
+working copies (see process_image).
+:return: The new "CombinedRGB" image.
+"""
+@profiled
+def combine_images_to_rgb(r_image, g_image, b_image=None, memory_budget=DEFAULT_MEMORY_BUDGET):
+    width, height = r_image.size
+    result_image = bpy.data.images.new("CombinedRGB", width=width, height=height, alpha=True, float_buffer=True)
+    target = np.zeros(width * height * 4, dtype=np.float32)
+    target[3::4] = 1.0
+    for channel, image in enumerate((r_image, g_image, b_image)):
+        if image:
+            stream_bands(image_band_reader([image]), image_channel_writer(target, width, channel), width, height, grayscale_op, memory_budget=memory_budget)
+    result_image.pixels.foreach_set(target)
     result_image.update()
     return result_image
@@ -0,0 +1,136 @@
+import numpy as np
+
+from core.decimate import decimate_arrays
+from core.decimate import part_budgets
+from core.decimate import triangle_count
+from core.decimate import triangulate
+
+
+def polygons_to_arrays(co, polygons, material_index=None, uv=None):
+    loop_total = np.array([len(polygon) for polygon in polygons], dtype=np.int32)
+    loop_vertex = np.concatenate(polygons).astype(np.int32)
+    return {
+        "co": np.asarray(co, dtype=np.float32),
+        "edges": np.zeros((0, 2), dtype=np.int32),
+        "loop_vertex": loop_vertex,
+        "loop_start": (np.cumsum(loop_total) - loop_total).astype(np.int32),
+        "loop_total": loop_total,
+        "material_index": np.zeros(len(polygons), dtype=np.int32) if material_index is None else np.asarray(material_index, dtype=np.int32),
+        "use_smooth": np.ones(len(polygons), dtype=bool),
+        "uv": {} if uv is None else {"UVMap": np.asarray(uv, dtype=np.float32)},
+        "uv_active": None,
+        "uv_render": None,
+    }
+
+
+def sphere_arrays(rings=20, segments=40):
+    # ✅ Closed UV sphere, outward-facing: a triangle fan at each pole, quads in between
+    theta = np.pi * np.arange(1, rings + 1) / (rings + 1)
+    phi = 2 * np.pi * np.arange(segments) / segments
+    ring_co = np.stack([
+        np.outer(np.sin(theta), np.cos(phi)), np.outer(np.sin(theta), np.sin(phi)), np.repeat(np.cos(theta)[:, None], segments, axis=1),
+    ], axis=2).reshape(-1, 3)
+    co = np.concatenate([[[0, 0, 1]], ring_co, [[0, 0, -1]]])
+    south = len(co) - 1
+
+    def ring(i, j):
+        return 1 + i * segments + j % segments
+
+    polygons = [[0, ring(0, j), ring(0, j + 1)] for j in range(segments)]
+    polygons += [[ring(i, j), ring(i + 1, j), ring(i + 1, j + 1), ring(i, j + 1)] for i in range(rings - 1) for j in range(segments)]
+    polygons += [[south, ring(rings - 1, j + 1), ring(rings - 1, j)] for j in range(segments)]
+    return polygons_to_arrays(co, polygons)
+
+
+def grid_polygons(size):
+    # ✅ (size + 1)² vertices on the unit square, size² quads facing +z
+    def vertex(x, y):
+        return y * (size + 1) + x
+
+    xs, ys = np.meshgrid(np.arange(size + 1) / size, np.arange(size + 1) / size)
+    co = np.stack([xs.ravel(), ys.ravel(), np.zeros(xs.size)], axis=1)
+    polygons = [[vertex(x, y), vertex(x + 1, y), vertex(x + 1, y + 1), vertex(x, y + 1)] for y in range(size) for x in range(size)]
+    return co, polygons
+
+
+def triangle_vertices(arrays):
+    return np.asarray(arrays["loop_vertex"]).reshape(-1, 3)
+
+
+def triangle_normals(arrays):
+    points = np.asarray(arrays["co"], dtype=np.float64)[triangle_vertices(arrays)]
+    return np.cross(points[:, 1] - points[:, 0], points[:, 2] - points[:, 0]), points.mean(axis=1)
+
+
+def assert_closed_manifold(arrays):
+    # ✅ Every directed edge appears once and its reverse once: closed, manifold and consistently oriented
+    triangles = triangle_vertices(arrays)
+    assert np.all(triangles[:, 0] != triangles[:, 1]) and np.all(triangles[:, 1] != triangles[:, 2]) and np.all(triangles[:, 0] != triangles[:, 2])
+    directed = {(int(a), int(b)) for a, b in triangles[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2)}
+    assert len(directed) == 3 * len(triangles)
+    assert all((b, a) in directed for a, b in directed)
+
+
+def test_sphere_input_is_a_valid_closed_mesh():
+    arrays = sphere_arrays()
+    triangles, _ = triangulate(arrays["loop_start"], arrays["loop_total"])
+    triangulated = dict(arrays, loop_vertex=arrays["loop_vertex"][triangles].ravel())
+    assert_closed_manifold(triangulated)
+    normals, centers = triangle_normals(triangulated)
+    assert np.all(np.einsum("ij,ij->i", normals, centers) > 0)
+
+
+def test_decimate_sphere_reaches_budget_without_flips():
+    arrays = sphere_arrays()
+    target = triangle_count(arrays) // 4
+    result = decimate_arrays(arrays, target)
+
+    assert 0 < triangle_count(result) <= target
+    assert_closed_manifold(result)
+    normals, centers = triangle_normals(result)
+    assert np.all(np.einsum("ij,ij->i", normals, centers) > 0)
+    # ✅ Half-edge collapses keep surviving vertices where they were
+    source = {tuple(point) for point in np.asarray(arrays["co"]).tolist()}
+    assert all(tuple(point) in source for point in np.asarray(result["co"]).tolist())
+
+
+def test_decimate_keeps_material_borders():
+    size = 16
+    co, polygons = grid_polygons(size)
+    # ✅ Left half material 0, right half material 1, meeting at x = 0.5
+    material_index = [0 if index % size < size // 2 else 1 for index in range(len(polygons))]
+    arrays = polygons_to_arrays(co, polygons, material_index)
+    result = decimate_arrays(arrays, triangle_count(arrays) // 4)
+
+    assert triangle_count(result) < triangle_count(arrays)
+    normals, centers = triangle_normals(result)
+    assert np.all(normals[:, 2] > 0)
+    assert np.all(centers[result["material_index"] == 0, 0] < 0.5)
+    assert np.all(centers[result["material_index"] == 1, 0] > 0.5)
+    kept = {tuple(point) for point in np.asarray(result["co"]).tolist()}
+    border = [tuple(point) for point in np.asarray(arrays["co"]).tolist() if point[0] == 0.5]
+    assert all(point in kept for point in border)
+
+
+def test_decimate_keeps_uv_seams():
+    size = 16
+    co, polygons = grid_polygons(size)
+    # ✅ Two UV charts: the right half is shifted by 2 in U, so the x = 0.5 column is a seam
+    right = [index % size >= size // 2 for index in range(len(polygons))]
+    uv = np.concatenate([co[polygon, :2] + (2 * is_right, 0) for polygon, is_right in zip(polygons, right)])
+    arrays = polygons_to_arrays(co, polygons, uv=uv)
+    result = decimate_arrays(arrays, triangle_count(arrays) // 4)
+
+    assert triangle_count(result) < triangle_count(arrays)
+    corners = np.asarray(result["co"])[result["loop_vertex"]]
+    _, centers = triangle_normals(result)
+    corner_right = np.repeat(centers[:, 0] > 0.5, 3)
+    # ✅ Every corner still carries its own chart's UV: u = x (+ 2 on the right), v = y
+    expected = corners[:, :2] + np.stack([2 * corner_right, np.zeros(len(corners))], axis=1)
+    assert np.allclose(result["uv"]["UVMap"], expected)
+
+
+def test_part_budgets_follow_triangle_counts():
+    assert part_budgets([100, 300], 200) == [50, 150]
+    assert part_budgets([100, 300], None) == [100, 300]
+    assert part_budgets([100, 1], 10) == [9, 1]
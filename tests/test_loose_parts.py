@@ -0,0 +1,86 @@
+import numpy as np
+
+from core.loose_parts import classify_heights
+from core.loose_parts import label_loose_parts
+from core.loose_parts import polygon_labels
+from core.mesh_arrays import loop_edges
+from core.mesh_arrays import subset_mesh_arrays
+
+
+def test_label_loose_parts_numbers_parts_by_lowest_vertex():
+    # ✅ Two triangles (0-1-2, 4-5-6), vertex 3 on its own, a chain 7-8 linked out of order
+    edges = np.array([[5, 4], [6, 5], [0, 1], [1, 2], [2, 0], [4, 6], [8, 7]])
+    labels, part_count = label_loose_parts(9, edges)
+    assert part_count == 4
+    assert labels.tolist() == [0, 0, 0, 1, 2, 2, 2, 3, 3]
+
+
+def test_label_loose_parts_joins_long_chains():
+    # ✅ A reversed chain needs several hook rounds to reach a single root
+    vertex_count = 1000
+    edges = np.stack([np.arange(vertex_count - 1, 0, -1), np.arange(vertex_count - 2, -1, -1)], axis=1)
+    labels, part_count = label_loose_parts(vertex_count, edges)
+    assert part_count == 1
+    assert not labels.any()
+
+
+def test_label_loose_parts_without_edges():
+    labels, part_count = label_loose_parts(3, np.zeros((0, 2), dtype=np.int32))
+    assert part_count == 3
+    assert labels.tolist() == [0, 1, 2]
+
+
+def test_polygon_labels_follow_first_vertex():
+    labels = np.array([0, 0, 0, 0, 1, 1, 1], dtype=np.int32)
+    loop_vertex = np.array([0, 1, 2, 3, 4, 5, 6])
+    loop_start = np.array([0, 4])
+    assert polygon_labels(labels, loop_vertex, loop_start).tolist() == [0, 1]
+
+
+def test_classify_heights_bands():
+    heights = [0.0, 0.2, 0.5, 0.7, 0.05, 0.4]
+    assert classify_heights(heights).tolist() == ["LEG", "SEAT", "BACKREST", "HEADREST", "HEADREST", "HEADREST"]
+
+
+def test_loop_edges_links_corners_and_adds_missing_edges():
+    # ✅ A quad 0-1-2-3 whose edge list misses 3-0
+    edges = np.array([[1, 2], [0, 1], [2, 3]])
+    edges, loop_edge = loop_edges(edges, np.array([0, 1, 2, 3]), np.array([0]), np.array([4]))
+    assert len(edges) == 4
+    corners = [sorted(edges[edge].tolist()) for edge in loop_edge]
+    assert corners == [[0, 1], [1, 2], [2, 3], [0, 3]]
+
+
+def test_subset_keeps_normals_edge_flags_and_attributes():
+    # ✅ Two separate triangles (0-1-2, 3-4-5), split as split_loose_parts does
+    arrays = {
+        "co": np.arange(18, dtype=np.float32).reshape(6, 3),
+        "edges": np.array([[0, 1], [1, 2], [2, 0], [3, 4], [4, 5], [5, 3]], dtype=np.int32),
+        "loop_vertex": np.arange(6, dtype=np.int32),
+        "loop_start": np.array([0, 3], dtype=np.int32),
+        "loop_total": np.array([3, 3], dtype=np.int32),
+        "material_index": np.array([0, 1], dtype=np.int32),
+        "use_smooth": np.array([True, False]),
+        "uv": {},
+        "loop_normal": np.repeat(np.eye(3, dtype=np.float32)[[2, 1]], 3, axis=0),
+        "use_seam": np.array([False, False, False, True, False, False]),
+        "use_edge_sharp": np.array([False, True, False, False, False, True]),
+        "attributes": {
+            "weight": {"data_type": "FLOAT", "domain": "POINT", "values": np.arange(6, dtype=np.float32)},
+            "crease": {"data_type": "FLOAT", "domain": "EDGE", "values": np.arange(6, dtype=np.float32) / 10},
+            "Col": {"data_type": "FLOAT_COLOR", "domain": "CORNER", "values": np.repeat(np.arange(6, dtype=np.float32)[:, None], 4, axis=1)},
+            "tag": {"data_type": "INT", "domain": "FACE", "values": np.array([7, 8], dtype=np.int32)},
+        },
+    }
+    labels, part_count = label_loose_parts(len(arrays["co"]), arrays["edges"])
+    poly_labels = polygon_labels(labels, arrays["loop_vertex"], arrays["loop_start"])
+    part = subset_mesh_arrays(arrays, poly_labels == 1, labels == 1)
+
+    assert part_count == 2
+    assert part["loop_normal"].tolist() == [[0, 1, 0]] * 3
+    assert part["use_seam"].tolist() == [True, False, False]
+    assert part["use_edge_sharp"].tolist() == [False, False, True]
+    assert part["attributes"]["weight"]["values"].tolist() == [3, 4, 5]
+    assert np.allclose(part["attributes"]["crease"]["values"], [0.3, 0.4, 0.5])
+    assert part["attributes"]["Col"]["values"][:, 0].tolist() == [3, 4, 5]
+    assert part["attributes"]["tag"]["values"].tolist() == [8]
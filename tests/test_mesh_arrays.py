@@ -0,0 +1,88 @@
+import numpy as np
+
+from core.mesh_arrays import concat_mesh_arrays
+from core.mesh_arrays import conflicting_attributes
+from core.mesh_arrays import load_mesh_arrays
+from core.mesh_arrays import part_table_matches
+from core.mesh_arrays import save_mesh_arrays
+from core.mesh_arrays import slice_mesh_arrays
+
+
+def triangle(offset, loop_normal=None):
+    arrays = {
+        "co": np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0]], dtype=np.float32) + offset,
+        "edges": np.array([[0, 1], [1, 2], [2, 0]], dtype=np.int32),
+        "loop_vertex": np.array([0, 1, 2], dtype=np.int32),
+        "loop_start": np.array([0], dtype=np.int32),
+        "loop_total": np.array([3], dtype=np.int32),
+        "material_index": np.array([0], dtype=np.int32),
+        "use_smooth": np.array([True]),
+        "uv": {},
+        "uv_active": None,
+        "uv_render": None,
+    }
+    if loop_normal is not None:
+        arrays["loop_normal"] = np.tile(np.asarray(loop_normal, dtype=np.float32), (3, 1))
+    return arrays
+
+
+def test_concat_and_slice_round_trip():
+    parts = [triangle(0, [0, 0, 1]), triangle(5, [0, 1, 0])]
+    merged, table = concat_mesh_arrays(parts)
+    assert part_table_matches(merged, table)
+    assert merged["loop_vertex"].tolist() == [0, 1, 2, 3, 4, 5]
+    part = slice_mesh_arrays(merged, table, 1)
+    assert part["loop_vertex"].tolist() == [0, 1, 2]
+    assert np.allclose(part["co"], parts[1]["co"])
+    assert np.allclose(part["loop_normal"], parts[1]["loop_normal"])
+
+
+def test_concat_drops_normals_missing_on_a_part():
+    merged, _ = concat_mesh_arrays([triangle(0, [0, 0, 1]), triangle(5)])
+    assert "loop_normal" not in merged
+
+
+def test_part_table_rejects_changed_topology():
+    merged, table = concat_mesh_arrays([triangle(0), triangle(5)])
+    merged["co"] = np.concatenate([merged["co"], [[9, 9, 9]]])
+    assert not part_table_matches(merged, table)
+
+
+def test_concat_and_slice_keep_edge_flags_and_attributes():
+    first, second = triangle(0), triangle(5)
+    first["use_edge_sharp"] = np.array([True, False, False])
+    first["use_seam"] = np.array([False, False, True])
+    second["use_edge_sharp"] = np.array([False, True, False])
+    first["attributes"] = {"Col": {"data_type": "FLOAT_COLOR", "domain": "CORNER", "values": np.full((3, 4), 0.5, dtype=np.float32)}}
+    second["attributes"] = {"weight": {"data_type": "FLOAT", "domain": "POINT", "values": np.array([1, 2, 3], dtype=np.float32)}}
+
+    merged, table = concat_mesh_arrays([first, second])
+    assert merged["use_edge_sharp"].tolist() == [True, False, False, False, True, False]
+    assert merged["use_seam"].tolist() == [False, False, True, False, False, False]
+    assert merged["attributes"]["Col"]["values"].shape == (6, 4)
+    assert not merged["attributes"]["Col"]["values"][3:].any()
+    assert merged["attributes"]["weight"]["values"].tolist() == [0, 0, 0, 1, 2, 3]
+
+    part = slice_mesh_arrays(merged, table, 1)
+    assert part["use_edge_sharp"].tolist() == [False, True, False]
+    assert part["attributes"]["weight"]["values"].tolist() == [1, 2, 3]
+    assert part["attributes"]["weight"]["domain"] == "POINT"
+
+
+def test_conflicting_attributes():
+    first, second = triangle(0), triangle(5)
+    first["attributes"] = {"weight": {"data_type": "FLOAT", "domain": "POINT", "values": np.zeros(3, dtype=np.float32)}}
+    second["attributes"] = {"weight": {"data_type": "FLOAT", "domain": "FACE", "values": np.zeros(1, dtype=np.float32)}}
+    assert conflicting_attributes([first, second]) == ["weight"]
+    assert conflicting_attributes([first, first]) == []
+
+
+def test_save_and_load_keep_edge_flags_and_attributes(tmp_path):
+    arrays = triangle(0)
+    arrays["use_seam"] = np.array([True, False, True])
+    arrays["attributes"] = {"Col": {"data_type": "BYTE_COLOR", "domain": "CORNER", "values": np.ones((3, 4), dtype=np.float32)}}
+    save_mesh_arrays(str(tmp_path), arrays)
+    loaded = load_mesh_arrays(str(tmp_path))
+    assert loaded["use_seam"].tolist() == [True, False, True]
+    assert loaded["attributes"]["Col"]["data_type"] == "BYTE_COLOR"
+    assert np.array_equal(loaded["attributes"]["Col"]["values"], arrays["attributes"]["Col"]["values"])
@@ -0,0 +1,139 @@
+# ✅ Standard Python Modules
+import argparse
+import glob
+import json
+import os
+import shutil
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  # Windows: plain copies only
+
+# ✅ Custom Imports
+from build_cache import file_hash
+
+directory = os.path.dirname(os.path.abspath(__file__))
+
+MANIFEST_NAME = "manifest.json"
+HASH_LENGTH = 12
+FICLONE = 0x40049409  # Linux ioctl cloning a whole file (btrfs, XFS, ...)
+
+# ✅ Asset kind → (source directory, file extension, versioned subdirectory)
+ASSET_KINDS = {
+    "glb": ("sofa_glb", ".glb", "glb"),
+    "ktx": ("sofa_ktx", ".ktx2", "ktx"),
+}
+
+
+"""
+Copies a file, as a copy-on-write clone (reflink) where the filesystem supports it and a plain copy otherwise.
+"""
+def clone_file(source, target):
+    with open(source, "rb") as source_file, open(target, "wb") as target_file:
+        try:
+            fcntl.ioctl(target_file.fileno(), FICLONE, source_file.fileno())
+        except (AttributeError, OSError):
+            shutil.copyfileobj(source_file, target_file)
+    shutil.copystat(source, target)
+
+
+"""
+Places a file under its content-derived name. The file is copied, never hardlinked: the exporters and the
+texture encoder rewrite their outputs in place, which would change a linked versioned file under its name.
+Files whose content is already versioned are not written again; hardlinks left by older runs are replaced by copies.
+:param source: The file to version.
+:param target: The content-addressed target path.
+:return: True when a new file was written, False when it already existed.
+"""
+def place_file(source, target):
+    if os.path.exists(target) and not os.path.samefile(source, target):
+        return False
+    staging_path = target + ".tmp"
+    clone_file(source, staging_path)
+    os.replace(staging_path, target)
+    return True
+
+
+"""
+Versions every asset of one kind under content-derived names and updates the manifest entries.
+:param kind: "glb" or "ktx" (see ASSET_KINDS).
+:param versioned_dir: The root of the versioned tree.
+:param base_url: URL prefix of the versioned tree on the CDN.
+:param manifest: The manifest dict (updated in place): logical name → versioned file and URL.
+:return: (written, reused) counts.
+"""
+def version_kind(kind, versioned_dir, base_url, manifest):
+    source_dir, extension, target_subdir = ASSET_KINDS[kind]
+    target_dir = os.path.join(versioned_dir, target_subdir)
+    os.makedirs(target_dir, exist_ok=True)
+
+    written = reused = 0
+    for source in sorted(glob.glob(os.path.join(directory, source_dir, "*" + extension))):
+        logical_name = os.path.basename(source)[:-len(extension)]
+        digest = file_hash(source)
+        versioned_file = target_subdir + "/" + logical_name + "." + digest[:HASH_LENGTH] + extension
+
+        if place_file(source, os.path.join(versioned_dir, versioned_file)):
+            written += 1
+            print(f"💾 Versioned: {source} → {versioned_file}")
+        else:
+            reused += 1
+
+        manifest[logical_name] = {
+            "kind": kind,
+            "file": versioned_file,
+            "url": base_url.rstrip("/") + "/" + versioned_file,
+            "sha256": digest,
+            "size": os.path.getsize(source),
+        }
+    return written, reused
+
+
+"""
+Lists versioned files that the manifest no longer references.
+"""
+def unreferenced_files(versioned_dir, manifest):
+    referenced = {entry["file"] for entry in manifest.values()}
+    unreferenced = []
+    for _, extension, target_subdir in ASSET_KINDS.values():
+        for filepath in glob.glob(os.path.join(versioned_dir, target_subdir, "*" + extension)):
+            if target_subdir + "/" + os.path.basename(filepath) not in referenced:
+                unreferenced.append(filepath)
+    return sorted(unreferenced)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Version sofa assets under content-derived names.")
+    parser.add_argument("kinds", nargs="*", help="Asset kinds to version: glb, ktx (default: all).")
+    parser.add_argument("--versioned", default=os.path.join(directory, "versioned"))
+    parser.add_argument("--base-url", default="/versioned")
+    parser.add_argument("--prune", action="store_true", help="Delete versioned files the manifest no longer references.")
+    args = parser.parse_args()
+    unknown = [kind for kind in args.kinds if kind not in ASSET_KINDS]
+    if unknown:
+        parser.error(f"unknown asset kinds: {', '.join(unknown)}")
+
+    manifest_path = os.path.join(args.versioned, MANIFEST_NAME)
+    manifest = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as manifest_file:
+            manifest = json.load(manifest_file)
+
+    for kind in args.kinds or sorted(ASSET_KINDS):
+        written, reused = version_kind(kind, args.versioned, args.base_url, manifest)
+        print(f"✅ {kind}: {written} new, {reused} unchanged")
+
+    with open(manifest_path, "w") as manifest_file:
+        json.dump(manifest, manifest_file, indent=4, sort_keys=True)
+    print(f"💾 Manifest saved at: {manifest_path}")
+
+    for filepath in unreferenced_files(args.versioned, manifest):
+        if args.prune:
+            os.remove(filepath)
+            print(f"🗑 Removed unreferenced: {filepath}")
+        else:
+            print(f"⚠ Unreferenced versioned file: {filepath}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,4 @@
 #!/bin/bash
 
-version="v3"
-source_dir="./sofa_glb"
-target_dir="./versioned/glb"
-
-mkdir -p "$target_dir"
-
-for file in "$source_dir"/*.glb; do
-  base=$(basename "$file" .glb)
-  cp "$file" "$target_dir/${base}_${version}.glb"
-  echo "Copied: $file → $target_dir/${base}_${version}.glb"
-done
\ No newline at end of file
+# Content-addressed versioning with a manifest lives in version_assets.py
+python3 "$(dirname "$0")/version_assets.py" glb "$@"
@@ -0,0 +1,52 @@
+# ✅ Standard Python Modules
+import argparse
+import json
+import socket
+
+DEFAULT_PORT = 47800
+
+# ✅ Talks to worker_server.py without Blender:
+# python3 worker_client.py --port 47800 ping
+# python3 worker_client.py --port 47800 shutdown
+
+
+"""
+Sends one request to a worker server and waits for its reply.
+:param request: {"module": ..., "code_version": ...} for a job, or {"command": "ping" | "shutdown"}.
+:param port: The server port.
+:param host: (Optional) The server host (default: 127.0.0.1).
+:param timeout: (Optional) Seconds to wait for the reply (default: no limit).
+:return: The decoded JSON reply.
+"""
+def send_request(request, port=DEFAULT_PORT, host="127.0.0.1", timeout=None):
+    with socket.create_connection((host, port), timeout=timeout) as connection:
+        connection.sendall((json.dumps(request) + "\n").encode("utf-8"))
+        with connection.makefile("r", encoding="utf-8") as replies:
+            reply = replies.readline()
+    if not reply:
+        raise ConnectionError(f"worker server on port {port} closed the connection without a reply")
+    return json.loads(reply)
+
+
+"""
+Runs one module on a worker server.
+:param module: The module name (config key).
+:param port: The server port.
+:param version: (Optional) The client's code version (see build_cache.code_version); a server running other code refuses the job.
+:param timeout: (Optional) Seconds to wait for the job (default: no limit).
+:return: {"module", "status", "duration", "parts", "outputs", "error"}.
+"""
+def run_remote_module(module, port=DEFAULT_PORT, version=None, timeout=None):
+    return send_request({"module": module, "code_version": version}, port, timeout=timeout)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ping or stop a sofa worker server.")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("command", choices=["ping", "shutdown"])
+    args = parser.parse_args()
+    print(send_request({"command": args.command}, args.port))
+
+
+if __name__ == "__main__":
+    main()
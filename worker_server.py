@@ -0,0 +1,134 @@
+# ✅ Standard Python Modules
+import argparse
+import json
+import os
+import socketserver
+import sys
+import time
+import traceback
+
+# ✅ Blender Modules
+import bpy  # type: ignore
+
+# ✅ Ensure Blender Can Find the Config Module
+script_dir = os.path.dirname(os.path.abspath(__file__))
+if script_dir not in sys.path:
+    sys.path.append(script_dir)
+
+# ✅ Custom Imports
+from build_cache import code_version
+from job_plan import load_job_plan
+from mesh_utils import flush_collection
+from sofa_utils import setup_scene
+from sofa_utils import setup_studio
+from pipeline import PURGE_ORPHANS
+from pipeline import process_module
+from profiling import records as profiling_records
+from profiling import settings as profiling_settings
+from profiling import write_report
+from resource_tracker import tracked_resources
+
+DEFAULT_PORT = 47800
+
+# ✅ Long-lived worker: Blender and the studio scene are set up once, then module jobs arrive over a local socket:
+# blender --background --factory-startup --python worker_server.py -- --port 47800
+# python3 parallel_main.py --servers 47800 47801
+
+
+def parse_args():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(description="Serve sofa module jobs from one long-lived Blender process.")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    return parser.parse_args(argv)
+
+
+"""
+Removes whatever a job left in the OUTPUT collection, so the next job starts from the studio scene.
+process_module flushes OUTPUT itself; this catches jobs that failed half-way. The data-blocks the job
+created are purged afterwards by tracked_resources.
+"""
+def reset_output():
+    if bpy.context.object and bpy.context.object.mode != "OBJECT":
+        bpy.ops.object.mode_set(mode="OBJECT")
+    for collection in [collection for collection in bpy.data.collections if collection.name.startswith("OUTPUT")]:
+        flush_collection(collection)
+
+
+"""
+Runs one module job. The job plan is recompiled when the config file changed, and the atlas size and bake quality
+come from the plan rather than from imports, so config edits need no restart; code edits do, and are caught by
+comparing the client's code version with the one the server started with.
+:param job: {"module": <name>, "code_version": <client code version>}.
+:param version: The code version the server was started with.
+:return: {"module", "status", "duration", "parts", "outputs", "error"}.
+"""
+def run_job(job, version):
+    module = job["module"]
+    if job.get("code_version") not in (None, version):
+        return {"module": module, "status": "stale", "duration": 0.0, "parts": None, "outputs": [],
+                "error": "the pipeline code changed since the server started, restart it"}
+
+    plan = load_job_plan(script_dir)
+    del profiling_records[:]
+    outputs = []
+    parts, error = None, None
+
+    start = time.perf_counter()
+    with tracked_resources(module, PURGE_ORPHANS):
+        try:
+            parts = process_module(module, plan["modules"][module], script_dir, plan["atlas_settings"], outputs=outputs)
+        except Exception:
+            error = traceback.format_exc()
+            print(error)
+        finally:
+            reset_output()
+    duration = time.perf_counter() - start
+
+    if profiling_settings["enabled"]:
+        profiles_dir = os.path.join(script_dir, "profiles")
+        os.makedirs(profiles_dir, exist_ok=True)
+        write_report(os.path.join(profiles_dir, module + ".json"), os.path.join(profiles_dir, module + ".csv"))
+    print(f"{'✅' if error is None else '❌'} Job {module} finished in {duration:.1f}s")
+    return {"module": module, "status": "ok" if error is None else "failed", "duration": duration,
+            "parts": parts, "outputs": outputs, "error": error}
+
+
+"""
+Serves newline-delimited JSON requests one at a time (bpy is single-threaded):
+{"module": ...} runs a job, {"command": "ping"} answers with the code version, {"command": "shutdown"} stops the server.
+"""
+def serve(port):
+    version = code_version(script_dir)
+    state = {"running": True}
+
+    class JobHandler(socketserver.StreamRequestHandler):
+        def handle(self):
+            for line in self.rfile:
+                request = json.loads(line)
+                command = request.get("command", "run")
+                if command == "ping":
+                    response = {"status": "ok", "code_version": version}
+                elif command == "shutdown":
+                    state["running"] = False
+                    response = {"status": "ok"}
+                else:
+                    response = run_job(request, version)
+                self.wfile.write((json.dumps(response) + "\n").encode("utf-8"))
+                self.wfile.flush()
+
+    socketserver.TCPServer.allow_reuse_address = True
+    with socketserver.TCPServer(("127.0.0.1", port), JobHandler) as server:
+        print(f"🛋 Worker server ready on 127.0.0.1:{port}")
+        while state["running"]:
+            server.handle_request()
+    print("👋 Worker server stopped.")
+
+
+def main():
+    args = parse_args()
+    setup_scene()
+    setup_studio()
+    serve(args.port)
+
+
+main()